@@ -6,10 +6,7 @@
 import adsk, adsk.core, adsk.fusion, traceback
 import os
 import sys
-import tkinter as tk
-from tkinter import messagebox as mb
 from .utils import utils
-from .core import Link, Joint, Write
 
 """
 # length unit is 'cm' and inertial unit is 'kg/cm^2'
@@ -24,12 +21,87 @@ from .core import Link, Joint, Write
 
 # I'm not sure how prismatic joint acts if there is no limit in fusion model
 
+# Write links and joints in a stable order (tree order, then by name) and with
+# fixed precision, so identical designs give byte identical packages. Off by
+# default, it changes the order and the numbers of existing packages.
+CANONICAL_OUTPUT = False
+
+# Recompute mass properties from the exported meshes and report the links
+# where they disagree with Fusion's getPhysicalProperties.
+CHECK_MESH_INERTIA = False
+
+# Write one xacro:macro per repeated sub-assembly (e.g. identical legs or
+# wheels) and a call per instance instead of a full copy of every link.
+XACRO_MACROS = False
+
+# Fold the child links of fixed joints into their parents (masses, inertias
+# and meshes are combined). Links listed in KEEP_FRAMES are never folded.
+MERGE_FIXED_JOINTS = False
+KEEP_FRAMES = []
+
+# Write a MoveIt SRDF with the link pairs which never need a self collision
+# check, found by sampling SRDF_SAMPLES configurations within the limits.
+WRITE_SRDF = False
+SRDF_SAMPLES = 1000
+
+# Round the material colors to multiples of COLOR_STEP and write one material
+# per distinct color, so near identical appearances share an entry in
+# materials.xacro. 0 keeps the exact colors.
+COLOR_STEP = 0
+
+# Also write a MuJoCo model (mjcf/<robot>.xml) using the same meshes. With
+# MJCF_COLLISION = 'mesh' MuJoCo collides the convex hulls of the meshes,
+# with 'box' their bounding boxes. base_link is welded to the world unless
+# MJCF_FREEJOINT gives it a freejoint (e.g. for a mobile robot).
+WRITE_MJCF = False
+MJCF_COLLISION = 'mesh'
+MJCF_FREEJOINT = False
+
+# Physics profile of the Gazebo package (ROS 1): 'accurate', 'balanced' or
+# 'fast', see core/Physics.py. It writes a world with the step size, solver
+# iterations and contact limits of the profile, runs the controllers at the
+# physics rate and enables selfCollide only for links which can touch
+# another link (sampled with SRDF_SAMPLES configurations). None keeps the
+# Gazebo defaults and selfCollide on every link.
+GAZEBO_PROFILE = None
+
+# Keep the script running after the export and update the package whenever
+# the design changes. Only the links which changed are extracted and
+# exported again, WATCH_DELAY seconds after the last change.
+WATCH = False
+WATCH_DELAY = 1.0
+
+# Move every mesh into the frame of its link and into m after the export, so
+# the urdf needs no mesh offsets and scales and the vertices of links far
+# from the origin keep their float precision.
+LOCAL_MESHES = False
+
+# Keep one copy of every mesh geometry in this directory and hardlink the
+# meshes of the packages to it, so parts shared by several robots are stored
+# once. MESH_STORE_MAX_MB evicts the least recently used meshes (0: no limit).
+# python -m URDF_Exporter.utils.mesh_store <dir> stats prints the hit rate.
+MESH_STORE = None
+MESH_STORE_MAX_MB = 0
+
+# Time every Fusion API access of the extraction and the STL export. The
+# slowest members and call sites are printed and all accesses are written to
+# fusion_api.trace.json in the package (open it in ui.perfetto.dev).
+TRACE_API = False
+
+# event source of the watch mode, stopped in stop()
+_watch = None
+
 def run(context):
     ui = None
     success_msg = 'Successfully create URDF file'
     msg = success_msg
 
     try:
+        # the exporter is only loaded when it runs, so loading the add-in
+        # stays cheap (see tests/test_import_time.py)
+        from .utils import mesh, trace, mesh_store
+        from .core import Link, Joint, Pipeline, Kinematics, Merge, Names, Render, Model, Watch, Journal
+
         # --------------------
         # initialize
         app = adsk.core.Application.get()
@@ -51,11 +123,13 @@ def run(context):
         if save_dir == False:
             ui.messageBox('Fusion2URDF was canceled', title)
             return 0
-        
+
+        # tkinter is only needed for this dialog, so keep it out of the add-in load
+        import tkinter as tk
         appWin=tk.Tk()
         appWin.title("Choose your ROS Version")
         appWin.attributes('-toolwindow', True)
-        appWin.geometry('300x150')
+        appWin.geometry('300x225')
 
         ros_selection = tk.IntVar()
         def sel():
@@ -69,6 +143,9 @@ def run(context):
         tk.Radiobutton(appWin, text="ROS 2",font=('Aerial', 14), indicatoron = 0, width = 150, height = 3, variable=ros_selection, value=2,
                   command=sel).pack()
 
+        tk.Radiobutton(appWin, text="ROS 1 + ROS 2",font=('Aerial', 14), indicatoron = 0, width = 150, height = 3, variable=ros_selection, value=3,
+                  command=sel).pack()
+
         appWin.mainloop()
 
         
@@ -76,65 +153,210 @@ def run(context):
         
         
    
-        save_dir= save_dir + '/' + package_name
-        try: os.mkdir(save_dir)
-        except: pass  
+        # both versions are extracted and exported once and written into
+        # save_dir/ros1/package_name and save_dir/ros2/package_name
+        versions = {2: [2], 3: [1, 2]}.get(ros_selection.get(), [1])
+        if len(versions) == 1:
+            save_dirs = {versions[0]: save_dir + '/' + package_name}
+        else:
+            save_dirs = {version: save_dir + '/ros{}/'.format(version) + package_name for version in versions}
+        for save_dir in save_dirs.values():
+            try: os.makedirs(save_dir)
+            except: pass
+        # the stl files and the model are written into the first package
+        save_dir = save_dirs[versions[0]]
 
 
-        package_dir_ros1 = os.path.abspath(os.path.dirname(__file__)) + '/package_ros1/'
-        package_dir_ros2 = os.path.abspath(os.path.dirname(__file__)) + '/package_ros2/'        
         # --------------------
         # set dictionaries
-        
-        # Generate joints_dict. All joints are related to root. 
-        joints_dict, msg = Joint.make_joints_dict(root, msg)
-        if msg != success_msg:
-            ui.messageBox(msg, title)
-            return 0   
-        print(joints_dict)
-        # Generate inertial_dict
-        inertial_dict, msg = Link.make_inertial_dict(root, msg)
-        if msg != success_msg:
-            ui.messageBox(msg, title)
-            return 0
-        elif not 'base_link' in inertial_dict:
-            msg = 'There is no base_link. Please set base_link and run again.'
-            ui.messageBox(msg, title)
+        # The export is a graph of stages. Extraction and the STL export
+        # call the Fusion API and run on this thread, everything that only
+        # renders and writes files runs in the background meanwhile.
+        # Finished links and meshes are journaled, so an export which was
+        # cancelled or failed continues where it stopped when run again.
+        journal = Journal.Journal(save_dir + '/.fusion2urdf.journal')
+        dialog = utils.ProgressDialog(ui, title)
+        def on_progress(progress, stage):
+            if progress.stages[stage]['end'] is not None:
+                journal.record('stage', stage)
+            dialog(progress, stage)
+        progress = Pipeline.Progress(on_progress)
+        pipeline = Pipeline.Pipeline(progress=progress)
+
+        # the stages use the API through these
+        tracer = trace.Tracer() if TRACE_API else None
+        api = tracer.wrap(app) if tracer else app
+        if tracer:
+            root = tracer.wrap(root)
+
+        def register_names():
+            # every module looks the link names up here instead of deriving them
+            names = Names.NameRegistry(root)
+            if names.base_link is None:
+                raise Pipeline.ExportError('There is no base_link. Please set base_link and run again.')
+            return names
+
+        def extract_joints(names):
+            # Generate joints_dict. All joints are related to root. 
+            joints_dict, msg = Joint.make_joints_dict(root, success_msg, names)
+            if msg != success_msg:
+                raise Pipeline.ExportError(msg)
+            print(joints_dict)
+            return journal.record('joints', 'root', joints_dict)
+
+        def resumer(stage, fingerprints):
+            # take the links from the journal unless they changed since
+            done = []
+            def resume(kind, link, extract):
+                data = journal.resume(kind, link, fingerprints[link], extract)
+                done.append(link)
+                progress.step(stage, len(done), len(fingerprints))
+                return data
+            return resume
+
+        def extract_inertials(names, fingerprints):
+            inertial_dict, msg = Link.make_inertial_dict(root, success_msg, names,
+                                                         resumer('fusion_inertials', fingerprints))
+            if msg != success_msg:
+                raise Pipeline.ExportError(msg)
+            return inertial_dict
+
+        def extract_materials(names, fingerprints):
+            material_dict, color_dict, msg = Link.make_material_dict(root, success_msg, COLOR_STEP, names,
+                                                                     resumer('fusion_materials', fingerprints))
+            if msg != success_msg:
+                raise Pipeline.ExportError(msg)
+            return material_dict, color_dict
+
+        def export_meshes(names, fingerprints, model):
+            # The mesh files are merged and moved into their link frames
+            # after the export, so a mesh also depends on the links merged
+            # into it and on the origin of its frame (None unless the meshes
+            # are local). Meshes of the journal are kept if none of that
+            # changed and the file is still the one which was exported.
+            origins = Kinematics.link_origins(model[0]) if LOCAL_MESHES else {}
+            mesh_fingerprints = {link: [fingerprints[link], {_: fingerprints.get(_) for _ in model[3].get(link, [])},
+                                        origins.get(link)] for link in fingerprints}
+            kept = []
+            for link in fingerprints:
+                file_name = save_dir + '/meshes/' + link + '.stl'
+                size = journal.lookup('mesh', link, mesh_fingerprints[link])
+                if size is not None and os.path.exists(file_name) and os.path.getsize(file_name) == size:
+                    kept.append(link)
+            links = [link for link in fingerprints if link not in kept] + ['root']
+            exported = []
+            def on_export(name, file_name):
+                journal.record('mesh', name, os.path.getsize(file_name), mesh_fingerprints.get(name))
+                exported.append(name)
+                progress.step('stl', len(exported), len(links))
+            memory = utils.export_stl(api, save_dir, names, links, on_export)
+            memory.update({link: None for link in kept})
+            return memory
+
+        def make_model(joints_dict, inertial_dict, materials):
+            material_dict, color_dict = materials
+            merged = {}
+            if MERGE_FIXED_JOINTS:
+                joints_dict, inertial_dict, material_dict, merged = \
+                    Merge.merge_fixed_joints(joints_dict, inertial_dict, material_dict, KEEP_FRAMES)
+            return joints_dict, inertial_dict, (material_dict, color_dict), merged
+
+        def save_model(model, names, exported, _):
+            # everything the writers need, so the package can be rendered
+            # again without Fusion (python -m URDF_Exporter.core.Model)
+            folded = set(link for links in model[3].values() for link in links)
+            meshes = {name: save_dir + '/meshes/' + name + '.stl' for name in exported if name not in folded}
+            Model.save_model(save_dir + '/' + robot_name + '.model.json', robot_name, package_name, model, names, meshes,
+                             LOCAL_MESHES)
+
+        pipeline.add('names', register_names, main_thread=True)
+        pipeline.add('fingerprints', lambda names: Watch.fingerprint(root, names), ['names'], main_thread=True)
+        pipeline.add('fusion_joints', extract_joints, ['names'], main_thread=True)
+        pipeline.add('fusion_inertials', extract_inertials, ['names', 'fingerprints'], main_thread=True)
+        pipeline.add('fusion_materials', extract_materials, ['names', 'fingerprints'], main_thread=True)
+        pipeline.add('frames', Kinematics.validate_frames, ['fusion_joints'])
+        pipeline.add('model', make_model, ['fusion_joints', 'fusion_inertials', 'fusion_materials'])
+        options = {'canonical': CANONICAL_OUTPUT, 'macros': XACRO_MACROS, 'srdf': WRITE_SRDF,
+                   'srdf_samples': SRDF_SAMPLES, 'mesh_inertia': CHECK_MESH_INERTIA,
+                   'mjcf': WRITE_MJCF, 'mjcf_collision': MJCF_COLLISION, 'mjcf_freejoint': MJCF_FREEJOINT,
+                   'local_meshes': LOCAL_MESHES, 'gazebo_profile': GAZEBO_PROFILE}
+        Render.add_stages(pipeline, package_name, robot_name, save_dirs, **options)
+        # Generate STl files. It only needs the design and the model, so it overlaps with the writers.
+        pipeline.add('stl', export_meshes, ['names', 'fingerprints', 'model'], main_thread=True)
+        def process_meshes(model, _):
+            mesh.merge_meshes(save_dir + '/meshes', model[3])
+            if LOCAL_MESHES:
+                mesh.localize_meshes(save_dir + '/meshes', Kinematics.link_origins(model[0]))
+            if MESH_STORE:
+                store = mesh_store.MeshStore(os.path.expanduser(MESH_STORE), int(MESH_STORE_MAX_MB * 2**20))
+                store.add_dir(save_dir + '/meshes')
+
+        pipeline.add('meshes', process_meshes, ['model', 'stl'])
+        pipeline.add('save_model', save_model, ['model', 'names', 'stl', 'meshes'])
+
+        try:
+            pipeline.run()
+        except Pipeline.ExportError as e:
+            # the journal is kept for the next run
+            ui.messageBox(str(e), title)
             return 0
-        
-        material_dict, color_dict, msg = Link.make_material_dict(root, msg)
-        if msg != success_msg:
-            ui.messageBox(msg, title)
-            return 0  
-        
-        links_xyz_dict = {} 
-        # --------------------
-        # Generate URDF
-        Write.write_urdf(joints_dict, links_xyz_dict, inertial_dict, material_dict, package_name, robot_name, save_dir, ros_selection.get() != 2)
-        Write.write_materials_xacro(color_dict, robot_name, save_dir)
-        Write.write_transmissions_xacro(joints_dict, links_xyz_dict, robot_name, save_dir)
-        if (ros_selection.get() == 2):
-
-            utils.copy_package(save_dir, package_dir_ros2)
-            utils.update_cmakelists(save_dir, package_name)
-            utils.update_package_xml(save_dir, package_name)
-            utils.update_ros2_launchfile(save_dir, robot_name)
-        else:
-            Write.write_gazebo_xacro(joints_dict, links_xyz_dict, inertial_dict, package_name, robot_name, save_dir)
-            Write.write_display_launch(package_name, robot_name, save_dir)
-            Write.write_gazebo_launch(package_name, robot_name, save_dir)
-            Write.write_control_launch(package_name, robot_name, save_dir, joints_dict)
-            Write.write_yaml(package_name, robot_name, save_dir, joints_dict)
- 
-            utils.copy_package(save_dir, package_dir_ros1)
-            utils.update_cmakelists(save_dir, package_name)
-            utils.update_package_xml(save_dir, package_name)
-
-        # Generate STl files        
-        utils.export_stl(app, save_dir)   
+        finally:
+            dialog.close()
+            if tracer:
+                tracer.stop()
+                tracer.write_chrome_trace(save_dir + '/fusion_api.trace.json')
+                print(tracer.report())
+        resumed = set(link for kind, link in journal.resumed)
+        journal.remove()
+        print(pipeline.report())
+        memory = [(grown, name) for name, grown in pipeline.results['stl'].items() if grown is not None]
+        if memory:
+            print('memory used by the export of: ' + ', '.join(['{} {:.1f} MB'.format(name, grown / 2**20)
+                                                                 for grown, name in sorted(memory, reverse=True)[:5]]))
+
+        if resumed:
+            msg += '\n\nContinued the last export, {} links were taken from its journal.'.format(len(resumed))
+        collisions = pipeline.results['names'].collisions
+        if collisions:
+            msg += '\n\nThese components were renamed because their names are not unique in the urdf:\n'
+            msg += '\n'.join(['{} -> {}'.format(*_) for _ in collisions])
+        discrepancies = pipeline.results['frames']
+        if discrepancies:
+            msg += '\n\nThe frames of these links differ from their joint frames in Fusion:\n'
+            msg += '\n'.join(['{}: exported {}, Fusion {} ({} m, {} rad)'.format(*_) for _ in discrepancies])
+        differences = pipeline.results.get('mesh_inertia')
+        if differences:
+            msg += '\n\nThe meshes of these links do not match the mass properties from Fusion:\n'
+            msg += '\n'.join(['{}: {}'.format(name, ', '.join(_)) for name, _ in differences.items()])
+
+        found = [problem for problems in Render.problems(pipeline).values() for problem in problems]
+        if found:
+            msg += '\n\nThe written package has these problems:\n' + '\n'.join(found)
+
+        if WATCH:
+            global _watch
+            if _watch:
+                _watch.stop()
+            watcher = Watch.Watcher(app, pipeline.results['names'], pipeline.results['fusion_joints'],
+                                    pipeline.results['fusion_inertials'], pipeline.results['fusion_materials'],
+                                    package_name, robot_name, save_dirs, make_model, options, COLOR_STEP,
+                                    WATCH_DELAY)
+            _watch = Watch.FusionEventSource(app, watcher)
+            _watch.start()
+            adsk.autoTerminate(False)
+            msg += '\n\nThe package is updated while you edit the design until the script is stopped.'
 
         ui.messageBox(msg, title)
         
     except:
         if ui:
             ui.messageBox('Failed:\n{}'.format(traceback.format_exc()))
+
+
+def stop(context):
+    global _watch
+    if _watch:
+        _watch.stop()
+        _watch = None
+    # close the hidden document export_stl keeps between runs
+    utils.release_export_document()
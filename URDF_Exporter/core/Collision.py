@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 2026
+
+@author: JatinPatil2003
+"""
+
+import math, os, random
+from concurrent.futures import ThreadPoolExecutor
+from . import Tree, Kinematics
+from ..utils import utils, mesh
+
+
+def link_boxes(mesh_dir, links_xyz_dict, scale=0.001):
+    """
+    axis aligned bounding box of every link mesh in its link frame
+
+
+    Parameters
+    ----------
+    mesh_dir: str
+        directory with the "name.stl" files
+    links_xyz_dict: {link: [x, y, z]}
+        offset of the mesh in the link frame, see write_link_urdf
+    scale: float
+        factor from the mesh unit to m. The meshes moved by
+        mesh.localize_meshes are already in the link frame in m.
+
+    Returns
+    ----------
+    {link: ([min x, min y, min z], [max x, max y, max z])}
+    """
+    boxes = {}
+    for link, xyz in links_xyz_dict.items():
+        file_name = os.path.join(mesh_dir, link + '.stl')
+        if not os.path.exists(file_name):
+            continue
+        triangles = mesh.read_stl(file_name)
+        if len(triangles) == 0:
+            continue
+        points = [p for triangle in triangles for p in triangle]
+        factor, offset = (1.0, [0.0] * 3) if mesh.is_local(file_name) else (scale, xyz)
+        lower = [min(p[i] for p in points) * factor + offset[i] for i in range(3)]
+        upper = [max(p[i] for p in points) * factor + offset[i] for i in range(3)]
+        boxes[link] = (lower, upper)
+    return boxes
+
+
+def sample_configurations(joints_dict, count, tree=None, seed=0):
+    """
+    random configurations within the joint limits, continuous joints are
+    sampled over one turn
+
+
+    Returns
+    ----------
+    [[value of each joint in Kinematics.movable_joints]]
+    """
+    rng = random.Random(seed)
+    names = Kinematics.movable_joints(joints_dict, tree)
+    limits = []
+    for name in names:
+        joint = joints_dict[name]
+        if joint['type'] == 'continuous':
+            limits.append((-math.pi, math.pi))
+        else:
+            limits.append((joint['lower_limit'], joint['upper_limit']))
+    configurations = [[0.0] * len(names)]  # the design as it is
+    configurations += [[rng.uniform(lower, upper) for lower, upper in limits] for _ in range(count - 1)]
+    return configurations
+
+
+def _world_boxes(box, poses):
+    # world AABBs of the transformed local box for every configuration
+    lower, upper = box
+    corners = [(x, y, z) for x in (lower[0], upper[0]) for y in (lower[1], upper[1]) for z in (lower[2], upper[2])]
+    result = []
+    for pose in poses:
+        points = [[pose[r][0]*x + pose[r][1]*y + pose[r][2]*z + pose[r][3] for r in range(3)] for x, y, z in corners]
+        result.append(([min(p[i] for p in points) for i in range(3)], [max(p[i] for p in points) for i in range(3)]))
+    return result
+
+
+def _count_overlaps(pair, world_boxes, padding):
+    a, b = world_boxes[pair[0]], world_boxes[pair[1]]
+    count = 0
+    for (lower_a, upper_a), (lower_b, upper_b) in zip(a, b):
+        if all(lower_a[i] - padding <= upper_b[i] and lower_b[i] - padding <= upper_a[i] for i in range(3)):
+            count += 1
+    return pair, count
+
+
+def disable_collisions(joints_dict, boxes, samples=1000, tree=None, padding=0.0, max_workers=4):
+    """
+    Find the link pairs which never have to be checked for self collision,
+    like the MoveIt setup assistant does: adjacent links and pairs which
+    never collide in the sampled configurations. Links are tested with
+    their bounding boxes, so a pair is only reported as "Never" when even
+    the boxes do not touch. Boxes which overlap in every sample don't mean
+    that the meshes touch, so unlike the setup assistant no pair is
+    reported as "Always" and such pairs stay enabled.
+
+
+    Parameters
+    ----------
+    joints_dict: dict
+        information of the each joint
+    boxes: {link: (lower, upper)}
+        bounding boxes from link_boxes
+    samples: int
+        number of random configurations
+    tree: Tree.KinematicTree
+        index of joints_dict, built here if not given
+    padding: float
+        safety margin in m
+    max_workers: int
+        threads used for the pair tests
+
+    Returns
+    ----------
+    [(link1, link2, reason)] with reason "Adjacent" or "Never"
+    """
+    tree = tree or Tree.KinematicTree(joints_dict)
+    links = [_ for _ in tree.links(sort=True) if _ in boxes]
+    configurations = sample_configurations(joints_dict, samples, tree)
+    poses = Kinematics.forward_kinematics(joints_dict, configurations, tree)
+
+    np = utils.optional_import('numpy')
+    world_boxes = {}
+    for link in links:
+        if np is None:
+            world_boxes[link] = _world_boxes(boxes[link], poses[link])
+            continue
+        lower, upper = boxes[link]
+        corners = np.array([(x, y, z, 1.0) for x in (lower[0], upper[0])
+                            for y in (lower[1], upper[1]) for z in (lower[2], upper[2])])
+        points = np.einsum('nij,kj->nki', poses[link], corners)[:, :, :3]
+        world_boxes[link] = (points.min(axis=1), points.max(axis=1))
+
+    result = []
+    pairs = []
+    for i, a in enumerate(links):
+        for b in links[i + 1:]:
+            if tree.parent(a) == b or tree.parent(b) == a:
+                result.append((a, b, 'Adjacent'))
+            else:
+                pairs.append((a, b))
+
+    def count_overlaps(pair):
+        if np is None:
+            return _count_overlaps(pair, world_boxes, padding)
+        (lower_a, upper_a), (lower_b, upper_b) = world_boxes[pair[0]], world_boxes[pair[1]]
+        overlap = np.all((lower_a - padding <= upper_b) & (lower_b - padding <= upper_a), axis=1)
+        return pair, int(overlap.sum())
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for (a, b), count in executor.map(count_overlaps, pairs):
+            if count == 0:
+                result.append((a, b, 'Never'))
+    return result
@@ -7,12 +7,13 @@ Modified on Sun Jan 17 2021
 @author: spacemaster85
 """
 
-import adsk, re, traceback
+import traceback
 from xml.etree.ElementTree import Element, SubElement
 from ..utils import utils
+from . import Names
 
 class Joint:
-    def __init__(self, name, xyz, axis, parent, child, joint_type, upper_limit, lower_limit):
+    def __init__(self, name, xyz, axis, parent, child, joint_type, upper_limit, lower_limit, canonical=False):
         """
         Attributes
         ----------
@@ -32,6 +33,8 @@ class Joint:
             generated xml describing about the joint
         tran_xml: str
             generated xml describing about the transmission
+        canonical: bool
+            write numbers with fixed precision
         """
         self.name = name
         self.type = joint_type
@@ -43,6 +46,7 @@ class Joint:
         self.axis = axis  # for 'revolute' and 'continuous'
         self.upper_limit = upper_limit  # for 'revolute' and 'prismatic'
         self.lower_limit = lower_limit  # for 'revolute' and 'prismatic'
+        self.canonical = canonical
 
     def make_joint_xml(self):
         """
@@ -52,17 +56,18 @@ class Joint:
         joint.attrib = {'name':self.name, 'type':self.type}
 
         origin = SubElement(joint, 'origin')
-        origin.attrib = {'xyz':' '.join([str(_) for _ in self.xyz]), 'rpy':'0 0 0'}
+        origin.attrib = {'xyz':utils.format_vector(self.xyz, self.canonical), 'rpy':'0 0 0'}
         parent = SubElement(joint, 'parent')
         parent.attrib = {'link':self.parent}
         child = SubElement(joint, 'child')
         child.attrib = {'link':self.child}
         if self.type == 'revolute' or self.type == 'continuous' or self.type == 'prismatic':
             axis = SubElement(joint, 'axis')
-            axis.attrib = {'xyz':' '.join([str(_) for _ in self.axis])}
+            axis.attrib = {'xyz':utils.format_vector(self.axis, self.canonical)}
         if self.type == 'revolute' or self.type == 'prismatic':
             limit = SubElement(joint, 'limit')
-            limit.attrib = {'upper': str(self.upper_limit), 'lower': str(self.lower_limit),
+            limit.attrib = {'upper': utils.format_number(self.upper_limit, self.canonical),
+                            'lower': utils.format_number(self.lower_limit, self.canonical),
                             'effort': '100', 'velocity': '100'}
 
         self.joint_xml = "\n".join(utils.prettify(joint).split("\n")[1:])
@@ -100,7 +105,66 @@ class Joint:
         self.tran_xml = "\n".join(utils.prettify(tran).split("\n")[1:])
 
 
-def make_joints_dict(root, msg):
+def occurrence_transform(occ):
+    """
+    transform2 (transform in older versions) of occ as a 4x4 list with the
+    translation converted to meter, the identity for None (root component)
+    """
+    if occ is None:
+        return [[float(r == c) for c in range(4)] for r in range(4)]
+    try:
+        data = occ.transform2.asArray()
+    except:
+        data = occ.transform.asArray()
+    return [[round(data[4*r + c] / (100.0 if c == 3 and r < 3 else 1.0), 6) for c in range(4)] for r in range(4)]
+
+
+def child_frame(joint, occ, joint_type):
+    """
+    pose of the child occurrence of a joint and the joint origin and axis
+    read from its side of the joint, in the coordinates of the occurrence.
+    A JointOrigin of the child component is given in the coordinates of the
+    component, the geometry picked on the occurrence in the world.
+
+
+    Parameters
+    ----------
+    joint: adsk.fusion.Joint
+    occ: adsk.fusion.Occurrence
+        top level occurrence of the child link
+    joint_type: str
+        type in joints_dict
+
+    Returns
+    ----------
+    {transform: 4x4 list, see occurrence_transform, origin: [x, y, z] in m,
+    axis: [x, y, z] or None for fixed joints and custom axes}
+    """
+    import adsk.fusion
+    transform = occurrence_transform(occ)
+    side = joint.geometryOrOriginOne
+    geometry = side.geometry if isinstance(side, adsk.fusion.JointOrigin) else side
+    origin = [_ / 100.0 for _ in geometry.origin.asArray()]  # converted to meter
+    # x, y and z axis of the joint geometry (JointDirections)
+    axes = [geometry.primaryAxisVector, geometry.secondaryAxisVector, geometry.thirdAxisVector]
+    if joint_type in ('revolute', 'continuous'):
+        direction = joint.jointMotion.rotationAxis
+    elif joint_type == 'prismatic':
+        direction = joint.jointMotion.slideDirection
+    else:
+        direction = None
+    axis = list(axes[direction].asArray()) if direction in (0, 1, 2) else None
+    if not isinstance(side, adsk.fusion.JointOrigin):
+        # from the world into the occurrence: the transposed rotation
+        offset = [o - transform[r][3] for r, o in enumerate(origin)]
+        origin = [sum(transform[r][c] * offset[r] for r in range(3)) for c in range(3)]
+        if axis is not None:
+            axis = [sum(transform[r][c] * axis[r] for r in range(3)) for c in range(3)]
+    return {'transform': transform, 'origin': [round(_, 6) for _ in origin],
+            'axis': [round(_, 6) for _ in axis] if axis is not None else None}
+
+
+def make_joints_dict(root, msg, names=None):
     """
     joints_dict holds parent, axis and xyz informatino of the joints
 
@@ -111,11 +175,13 @@ def make_joints_dict(root, msg):
         Root component
     msg: str
         Tell the status
+    names: Names.NameRegistry
+        link names of the occurrences, a new one is made if None
 
     Returns
     ----------
     joints_dict:
-        {name: {type, axis, upper_limit, lower_limit, parent, child, xyz}}
+        {name: {type, axis, upper_limit, lower_limit, parent, child, xyz, child_frame}}
     msg: str
         Tell the status
     """
@@ -124,7 +190,9 @@ def make_joints_dict(root, msg):
     'fixed', 'revolute', 'prismatic', 'Cylinderical',
     'PinSlot', 'Planner', 'Ball']  # these are the names in urdf
 
+    import adsk.core, adsk.fusion
     joints_dict = {}
+    names = names or Names.NameRegistry(root)
     
     for joint in root.joints:
         if joint.isLightBulbOn :
@@ -183,15 +251,11 @@ def make_joints_dict(root, msg):
             if joint.occurrenceTwo != None and joint.occurrenceOne != None and joint.occurrenceOne.isLightBulbOn:
                 parent_occ = get_parent(joint.occurrenceTwo)
                 # print("Joint 1 Parent: " +parent_occ.name)
-                if "base_link" in parent_occ.name:
-                    joint_dict['parent'] = 'base_link'
-                    base_link = parent_occ
-                else:
-                    joint_dict['parent'] = re.sub('[ :()]', '_', parent_occ.name)
+                joint_dict['parent'] = names.name(parent_occ)
                 # print("Joint 2: " +joint.occurrenceOne.name)
                 parent_occ = get_parent(joint.occurrenceOne)
                 # print("Joint 2 Parent: " +parent_occ.name)
-                joint_dict['child'] = re.sub('[ :()]', '_', parent_occ.name)
+                joint_dict['child'] = names.name(parent_occ)
             else:
                 break
             
@@ -242,7 +306,7 @@ def make_joints_dict(root, msg):
             except:
                 print('Failed:\n{}'.format(traceback.format_exc()))
                 try:
-                    if type(joint.geometryOrOriginTwo)==adsk.fusion.JointOrigin:
+                    if isinstance(joint.geometryOrOriginTwo, adsk.fusion.JointOrigin):
                         data = joint.geometryOrOriginTwo.geometry.origin.asArray()
                     else:
                         data = joint.geometryOrOriginTwo.origin.asArray()
@@ -250,6 +314,13 @@ def make_joints_dict(root, msg):
                 except:
                     msg = joint.name + " doesn't have joint origin. Please set it and run again."
                     break
+
+            # The child occurrence and the joint seen from it, an independent
+            # measurement of the exported frame (Kinematics.validate_frames)
+            try:
+                joint_dict['child_frame'] = child_frame(joint, get_parent(joint.occurrenceOne), joint_dict['type'])
+            except:
+                joint_dict['child_frame'] = None
     
             joints_dict[joint.name] = joint_dict
     return joints_dict, msg
\ No newline at end of file
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 2026
+
+@author: JatinPatil2003
+"""
+
+import json, os, threading
+
+
+class Journal:
+
+    def __init__(self, file_name):
+        """
+        Checkpoint journal of an export. Every piece of finished work is
+        appended as one json line, so an export which fails or hangs
+        halfway leaves the work done so far behind. The next export reads
+        it and only redoes what is missing or has changed since, which is
+        told by the fingerprint of the link (see Watch.fingerprint). It
+        holds the volume and area of the bodies, so geometry edits which
+        keep the bounding box are extracted again.
+
+        Parameters
+        ----------
+        file_name: str
+            journal file, e.g. "save_dir/.fusion2urdf.journal"
+
+        Attributes
+        ----------
+        entries: {(kind, key): {kind, key, fingerprint, data}}
+            the entries of the last export, the newest one per key
+        resumed: [(kind, key)]
+            entries which were used again
+        """
+        self.file_name = file_name
+        self.entries = {}
+        self.resumed = []
+        self._lock = threading.Lock()
+        try:
+            with open(file_name) as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # the line which was written when the export stopped,
+                        # write the journal again without it
+                        self._rewrite()
+                        break
+                    self.entries[(entry['kind'], entry['key'])] = entry
+        except OSError:
+            pass
+
+    def _rewrite(self):
+        with open(self.file_name, mode='w') as f:
+            for entry in self.entries.values():
+                f.write(json.dumps(entry) + '\n')
+
+    def record(self, kind, key, data=None, fingerprint=None):
+        """
+        append a finished piece of work and return its data
+
+        Parameters
+        ----------
+        kind: str
+            e.g. 'inertial', 'material', 'mesh' or 'stage'
+        key: str
+            e.g. the link name
+        data:
+            json serializable result
+        fingerprint:
+            state of the design the data was made from
+        """
+        entry = {'kind': kind, 'key': key, 'fingerprint': _plain(fingerprint), 'data': data}
+        with self._lock:
+            self.entries[(kind, key)] = entry
+            with open(self.file_name, mode='a') as f:
+                f.write(json.dumps(entry) + '\n')
+        return data
+
+    def lookup(self, kind, key, fingerprint=None):
+        """
+        Returns
+        ----------
+        data of the entry or None if there is none for this fingerprint
+        """
+        entry = self.entries.get((kind, key))
+        if entry is None or entry['fingerprint'] != _plain(fingerprint):
+            return None
+        self.resumed.append((kind, key))
+        return entry['data']
+
+    def resume(self, kind, key, fingerprint, func):
+        """
+        data of the entry if there is one for this fingerprint, otherwise
+        func() which is recorded
+        """
+        data = self.lookup(kind, key, fingerprint)
+        if data is None:
+            data = self.record(kind, key, func(), fingerprint)
+        return data
+
+    def remove(self):
+        """
+        delete the journal once the export is complete
+        """
+        with self._lock:
+            self.entries = {}
+            try: os.remove(self.file_name)
+            except OSError: pass
+
+
+def _plain(value):
+    # tuples become lists in json, compare the stored and the new value alike
+    return json.loads(json.dumps(value))
@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 2026
+
+@author: JatinPatil2003
+"""
+
+import math
+from . import Tree
+from ..utils import utils
+
+
+def movable_joints(joints_dict, tree=None):
+    """
+    Returns
+    ----------
+    names of the joints which take a value in a configuration, in tree
+    order with the children sorted by name, so that the order (and the
+    sampled configurations) don't depend on the order of joints_dict
+    """
+    tree = tree or Tree.KinematicTree(joints_dict)
+    return [j for j in tree.joints(sort=True) if joints_dict[j]['type'] in ('revolute', 'continuous', 'prismatic')
+            and j not in tree.unreachable]
+
+
+def link_origins(joints_dict, tree=None):
+    """
+    Origin of every link in the base_link frame at the zero configuration,
+    the same way write_link_urdf places the link frames
+
+
+    Returns
+    ----------
+    {link: [x, y, z]}
+    """
+    tree = tree or Tree.KinematicTree(joints_dict)
+    origins = {tree.root: [0.0, 0.0, 0.0]}
+    for link in tree.links()[1:]:
+        origins[link] = list(joints_dict[tree.joint(link)]['xyz'])
+    return origins
+
+
+def _rotation(axis, angle):
+    # Rodrigues' formula
+    x, y, z = axis
+    c, s = math.cos(angle), math.sin(angle)
+    t = 1 - c
+    return [[t*x*x + c,   t*x*y - s*z, t*x*z + s*y],
+            [t*x*y + s*z, t*y*y + c,   t*y*z - s*x],
+            [t*x*z - s*y, t*y*z + s*x, t*z*z + c]]
+
+
+def _joint_transform(joint, origin, value):
+    # origin of the joint, then the motion about/along its axis
+    if joint['type'] in ('revolute', 'continuous'):
+        rotation = _rotation(joint['axis'], value)
+    else:
+        rotation = [[1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]]
+    if joint['type'] == 'prismatic':
+        origin = [o + a*value for o, a in zip(origin, joint['axis'])]
+    return [rotation[0] + [origin[0]], rotation[1] + [origin[1]],
+            rotation[2] + [origin[2]], [0.0, 0.0, 0.0, 1.0]]
+
+
+def _matmul(a, b):
+    return [[sum(a[r][k]*b[k][c] for k in range(4)) for c in range(4)] for r in range(4)]
+
+
+def forward_kinematics(joints_dict, configurations=None, tree=None):
+    """
+    Pose of every link in the base_link frame for a batch of configurations.
+    Uses numpy if it is available, otherwise plain python.
+
+
+    Parameters
+    ----------
+    joints_dict: dict
+        information of the each joint
+    configurations: [[value of each joint in movable_joints]]
+        N configurations, None for the zero configuration only
+    tree: Tree.KinematicTree
+        index of joints_dict, built here if not given
+
+    Returns
+    ----------
+    {link: N homogeneous 4x4 transforms}
+        numpy array of shape (N, 4, 4) or nested lists
+    """
+    tree = tree or Tree.KinematicTree(joints_dict)
+    names = movable_joints(joints_dict, tree)
+    if configurations is None:
+        configurations = [[0.0] * len(names)]
+    column = {name: i for i, name in enumerate(names)}
+    origins = link_origins(joints_dict, tree)
+    np = utils.optional_import('numpy')
+
+    if np is None:
+        poses = {tree.root: [[[float(r == c) for c in range(4)] for r in range(4)] for _ in configurations]}
+        for link in tree.links()[1:]:
+            name = tree.joint(link)
+            origin = [c - p for c, p in zip(origins[link], origins[tree.parent(link)])]
+            poses[link] = [_matmul(parent, _joint_transform(joints_dict[name], origin,
+                                                            config[column[name]] if name in column else 0.0))
+                           for parent, config in zip(poses[tree.parent(link)], configurations)]
+        return poses
+
+    configurations = np.asarray(configurations, dtype=float).reshape(-1, len(names))
+    n = len(configurations)
+    poses = {tree.root: np.tile(np.eye(4), (n, 1, 1))}
+    for link in tree.links()[1:]:
+        name = tree.joint(link)
+        joint = joints_dict[name]
+        value = configurations[:, column[name]] if name in column else np.zeros(n)
+        transform = np.tile(np.eye(4), (n, 1, 1))
+        transform[:, :3, 3] = np.subtract(origins[link], origins[tree.parent(link)])
+        axis = np.asarray(joint['axis'], dtype=float)
+        if joint['type'] in ('revolute', 'continuous'):
+            k = np.array([[0, -axis[2], axis[1]], [axis[2], 0, -axis[0]], [-axis[1], axis[0], 0]])
+            s, c = np.sin(value)[:, None, None], np.cos(value)[:, None, None]
+            transform[:, :3, :3] = np.eye(3) + s * k + (1 - c) * (k @ k)
+        elif joint['type'] == 'prismatic':
+            transform[:, :3, 3] += value[:, None] * axis
+        poses[link] = poses[tree.parent(link)] @ transform
+    return poses
+
+
+def validate_frames(joints_dict, samples=100, tree=None, tolerance=1e-4, angle_tolerance=1e-4):
+    """
+    Compare the link frames of the exported model with the child occurrences
+    in Fusion. The occurrence of a link moves with the link frame, so in
+    every sampled configuration the joint origin and axis seen from the
+    occurrence (child_frame, captured at extraction) have to stay on the
+    origin and the axis of the link frame. A difference means the origin
+    or the axis was taken in the wrong (component local) context and the
+    link will show up at the wrong place in RViz. The direction along the
+    axis is not compared.
+
+
+    Parameters
+    ----------
+    joints_dict: dict
+        information of the each joint, with child_frame from make_joints_dict
+    samples: int
+        configurations, see Collision.sample_configurations. The first one
+        is the zero configuration.
+    tree: Tree.KinematicTree
+        index of joints_dict, built here if not given
+    tolerance: float
+        allowed distance in m
+    angle_tolerance: float
+        allowed angle between the axes in rad
+
+    Returns
+    ----------
+    discrepancies: [(link, exported xyz, Fusion xyz, distance, angle)]
+        xyz in the zero configuration, the distance and the angle are the
+        largest ones over the configurations
+    """
+    from . import Collision
+    tree = tree or Tree.KinematicTree(joints_dict)
+    configurations = Collision.sample_configurations(joints_dict, max(samples, 1), tree)
+    poses = forward_kinematics(joints_dict, configurations, tree)
+    discrepancies = []
+    for link in tree.links()[1:]:
+        joint = joints_dict[tree.joint(link)]
+        frame = joint.get('child_frame')
+        if frame is None:
+            continue
+        transform = frame['transform']
+        zero = poses[link][0]
+        distance = angle = 0.0
+        for i, pose in enumerate(poses[link]):
+            # the occurrence moved by the link: pose @ inverse(zero) @ transform,
+            # the links are parallel to the world in the zero configuration
+            moved = [[sum(float(pose[r][k]) * transform[k][c] for k in range(3)) for c in range(4)] for r in range(3)]
+            for r in range(3):
+                moved[r][3] += float(pose[r][3]) - sum(float(pose[r][k]) * float(zero[k][3]) for k in range(3))
+            xyz = [float(pose[r][3]) for r in range(3)]
+            fusion_xyz = [sum(moved[r][c] * frame['origin'][c] for c in range(3)) + moved[r][3] for r in range(3)]
+            if i == 0:
+                exported, fusion = xyz, fusion_xyz
+            distance = max(distance, math.sqrt(sum((a - b)**2 for a, b in zip(xyz, fusion_xyz))))
+            if frame['axis'] is not None and any(joint['axis']):
+                axis = [sum(float(pose[r][c]) * joint['axis'][c] for c in range(3)) for r in range(3)]
+                fusion_axis = [sum(moved[r][c] * frame['axis'][c] for c in range(3)) for r in range(3)]
+                norm = math.sqrt(sum(_**2 for _ in axis) * sum(_**2 for _ in fusion_axis))
+                cosine = abs(sum(a*b for a, b in zip(axis, fusion_axis))) / norm
+                angle = max(angle, math.acos(min(1.0, cosine)))
+        if distance > tolerance or angle > angle_tolerance:
+            discrepancies.append((link, [round(_, 6) for _ in exported], [round(_, 6) for _ in fusion],
+                                  round(distance, 6), round(angle, 6)))
+    return discrepancies
@@ -7,13 +7,15 @@ Modified on Sun Jan 17 2021
 @author: spacemaster85
 """
 
-import adsk, re, traceback
+import re, traceback
 from xml.etree.ElementTree import Element, SubElement
 from ..utils import utils
+from . import Names
 
 class Link:
 
-    def __init__(self, name, xyz, center_of_mass, repo, mass, inertia_tensor, material):
+    def __init__(self, name, xyz, center_of_mass, repo, mass, inertia_tensor, material, canonical=False,
+                 local_mesh=False):
         """
         Parameters
         ----------
@@ -31,6 +33,11 @@ class Link:
             mass of the link
         inertia_tensor: [ixx, iyy, izz, ixy, iyz, ixz]
             tensor of the inertia
+        canonical: bool
+            write numbers with fixed precision
+        local_mesh: bool
+            the mesh is already in the link frame and in m (see
+            mesh.localize_meshes), so it needs no offset and no scale
         """
         self.name = name
         # xyz for visual
@@ -42,6 +49,8 @@ class Link:
         self.mass = mass
         self.inertia_tensor = inertia_tensor
         self.material = material
+        self.canonical = canonical
+        self.local_mesh = local_mesh
         
     def make_link_xml(self):
         """
@@ -54,38 +63,101 @@ class Link:
         #inertial
         inertial = SubElement(link, 'inertial')
         origin_i = SubElement(inertial, 'origin')
-        origin_i.attrib = {'xyz':' '.join([str(_) for _ in self.center_of_mass]), 'rpy':'0 0 0'}       
+        origin_i.attrib = {'xyz':utils.format_vector(self.center_of_mass, self.canonical), 'rpy':'0 0 0'}       
         mass = SubElement(inertial, 'mass')
-        mass.attrib = {'value':str(self.mass)}
+        mass.attrib = {'value':utils.format_number(self.mass, self.canonical)}
         inertia = SubElement(inertial, 'inertia')
+        inertia_tensor = [utils.format_number(_, self.canonical) for _ in self.inertia_tensor]
         inertia.attrib = \
-            {'ixx':str(self.inertia_tensor[0]), 'iyy':str(self.inertia_tensor[1]),\
-            'izz':str(self.inertia_tensor[2]), 'ixy':str(self.inertia_tensor[3]),\
-            'iyz':str(self.inertia_tensor[4]), 'ixz':str(self.inertia_tensor[5])}        
+            {'ixx':inertia_tensor[0], 'iyy':inertia_tensor[1],\
+            'izz':inertia_tensor[2], 'ixy':inertia_tensor[3],\
+            'iyz':inertia_tensor[4], 'ixz':inertia_tensor[5]}        
         
+        xyz = [0, 0, 0] if self.local_mesh else self.xyz
+        mesh_attrib = {'filename':'package://' + self.repo + self.name + '.stl'}
+        if not self.local_mesh:
+            mesh_attrib['scale'] = '0.001 0.001 0.001'
+
         # visual
         visual = SubElement(link, 'visual')
         origin_v = SubElement(visual, 'origin')
-        origin_v.attrib = {'xyz':' '.join([str(_) for _ in self.xyz]), 'rpy':'0 0 0'}
+        origin_v.attrib = {'xyz':utils.format_vector(xyz, self.canonical), 'rpy':'0 0 0'}
         geometry_v = SubElement(visual, 'geometry')
         mesh_v = SubElement(geometry_v, 'mesh')
-        mesh_v.attrib = {'filename':'package://' + self.repo + self.name + '.stl','scale':'0.001 0.001 0.001'}
+        mesh_v.attrib = dict(mesh_attrib)
         material = SubElement(visual, 'material')
         material.attrib = {'name': self.material}
         
         # collision
         collision = SubElement(link, 'collision')
         origin_c = SubElement(collision, 'origin')
-        origin_c.attrib = {'xyz':' '.join([str(_) for _ in self.xyz]), 'rpy':'0 0 0'}
+        origin_c.attrib = {'xyz':utils.format_vector(xyz, self.canonical), 'rpy':'0 0 0'}
         geometry_c = SubElement(collision, 'geometry')
         mesh_c = SubElement(geometry_c, 'mesh')
-        mesh_c.attrib = {'filename':'package://' + self.repo + self.name + '.stl','scale':'0.001 0.001 0.001'}
+        mesh_c.attrib = dict(mesh_attrib)
 
         # print("\n".join(utils.prettify(link).split("\n")[1:]))
         self.link_xml = "\n".join(utils.prettify(link).split("\n")[1:])
 
 
-def make_inertial_dict(root, msg):
+def iter_inertials(root, names=None, resume=None):
+    """
+    Generator over the inertial information of the top level occurrences,
+    one at a time, so the caller can process a link before the next one is
+    calculated.
+
+    Parameters
+    ----------
+    root: adsk.fusion.Design.cast(product)
+        Root component
+    names: Names.NameRegistry
+        link names of the occurrences, a new one is made if None
+    resume: callable
+        resume('inertial', link, extract) returns the data of the link,
+        e.g. from a Journal, or extract() for a new one. None extracts all.
+
+    Yields
+    ----------
+    name, {name, component, mass, inertia, center_of_mass}
+    """
+    names = names or Names.NameRegistry(root)
+    resume = resume or (lambda kind, link, extract: extract())
+    # Get component properties.      
+    allOccs = root.occurrences
+    
+    for occs in allOccs:
+        occs_dict = resume('inertial', names.name(occs), lambda: occurrence_inertial(occs, names))
+        yield occs_dict['name'], occs_dict
+
+
+def occurrence_inertial(occs, names):
+    """
+    inertial information of one top level occurrence
+
+    Returns
+    ----------
+    {name, component, mass, inertia, center_of_mass}
+    """
+    import adsk.fusion
+    occs_dict = {}
+    prop = occs.getPhysicalProperties(adsk.fusion.CalculationAccuracy.VeryHighCalculationAccuracy)
+    
+    occs_dict['name'] = names.name(occs)
+    occs_dict['component'] = occs.component.name
+
+    mass = prop.mass  # kg
+    occs_dict['mass'] = mass
+    center_of_mass = [_/100.0 for _ in prop.centerOfMass.asArray()] ## cm to m
+    occs_dict['center_of_mass'] = center_of_mass
+
+    # https://help.autodesk.com/view/fusion360/ENU/?guid=GUID-ce341ee6-4490-11e5-b25b-f8b156d7cd97
+    (_, xx, yy, zz, xy, yz, xz) = prop.getXYZMomentsOfInertia()
+    moment_inertia_world = [_ / 10000.0 for _ in [xx, yy, zz, xy, yz, xz] ] ## kg / cm^2 -> kg/m^2
+    occs_dict['inertia'] = utils.origin2center_of_mass(moment_inertia_world, center_of_mass, mass)
+    return occs_dict
+
+
+def make_inertial_dict(root, msg, names=None, resume=None):
     """      
     Parameters
     ----------
@@ -93,46 +165,172 @@ def make_inertial_dict(root, msg):
         Root component
     msg: str
         Tell the status
+    names: Names.NameRegistry
+        link names of the occurrences, a new one is made if None
+    resume: callable
+        see iter_inertials
         
     Returns
     ----------
-    inertial_dict: {name:{mass, inertia, center_of_mass}}
+    inertial_dict: {name:{name, component, mass, inertia, center_of_mass}}
     
     msg: str
         Tell the status
     """
+    inertial_dict = dict(iter_inertials(root, names, resume))
+    return inertial_dict, msg
+
+
+
+
+# appearance name normalization, compiled once for all the occurrences
+_GERMAN = str.maketrans({'ä': 'ae', 'ö': 'oe', 'ü': 'ue', 'Ä': 'Ae', 'Ö': 'Oe', 'Ü': 'Ue', 'ß': 'ss'})
+_NOT_NAME = re.compile(r'[^A-Za-z0-9 ]')
+_SPACES = re.compile(r'\s+')
+
+
+def color_name(appearance_name):
+    """
+    Material name for an appearance, e.g. 'Farbe - Rot (Glanz)' -> 'rot_glanz'
+    """
+    name = appearance_name.translate(_GERMAN).replace("Farbe - ","").replace("Color - ","")
+    name = _SPACES.sub(' ', _NOT_NAME.sub('', name))
+    return Names.sanitize(name).replace("__","_").lower()
+
+
+def resolve_appearance(appearance, cache):
+    """
+    Color of an appearance, looked up once per appearance id
+    
+    Parameters
+    ----------
+    appearance: adsk.core.Appearance
+    cache: dict
+        {appearance id: (material_name, rgba string) or None}, shared by
+        all the occurrences of a design
+
+    Returns
+    ----------
+    (material_name, rgba string) or None if it has no color property
+    """
+    key = appearance.id
+    if key not in cache:
+        import adsk.core
+        cache[key] = None
+        for prop in appearance.appearanceProperties:
+            if isinstance(prop, adsk.core.ColorProperty):
+                value = prop.value
+                cache[key] = (color_name(appearance.name),
+                              f"{value.red/255} {value.green/255} {value.blue/255} {value.opacity/255}")
+                break
+    return cache[key]
+
+
+def iter_materials(root, cache=None, names=None, resume=None):
+    """
+    Generator over the material of the top level occurrences, one at a time
+
+    Parameters
+    ----------
+    root: adsk.fusion.Design.cast(product)
+        Root component
+    cache: dict
+        appearance cache, see resolve_appearance. A new one is used if None.
+    names: Names.NameRegistry
+        link names of the occurrences, a new one is made if None
+    resume: callable
+        see iter_inertials, called with 'material'
+
+    Yields
+    ----------
+    name, {material}, (material_name, rgba string) or None
+    """
+    if cache is None:
+        cache = {}
+    names = names or Names.NameRegistry(root)
+    resume = resume or (lambda kind, link, extract: extract())
+
     # Get component properties.      
     allOccs = root.occurrences
-    inertial_dict = {}
-    
+
     for occs in allOccs:
-        # Skip the root component.
-        occs_dict = {}
-        prop = occs.getPhysicalProperties(adsk.fusion.CalculationAccuracy.VeryHighCalculationAccuracy)
-        
-        occs_dict['name'] = re.sub('[ :()]', '_', occs.name)
+        app_dict, color = resume('material', names.name(occs), lambda: occurrence_material(occs, cache))
+        yield names.name(occs), app_dict, color
 
-        mass = prop.mass  # kg
-        occs_dict['mass'] = mass
-        center_of_mass = [_/100.0 for _ in prop.centerOfMass.asArray()] ## cm to m
-        occs_dict['center_of_mass'] = center_of_mass
 
-        # https://help.autodesk.com/view/fusion360/ENU/?guid=GUID-ce341ee6-4490-11e5-b25b-f8b156d7cd97
-        (_, xx, yy, zz, xy, yz, xz) = prop.getXYZMomentsOfInertia()
-        moment_inertia_world = [_ / 10000.0 for _ in [xx, yy, zz, xy, yz, xz] ] ## kg / cm^2 -> kg/m^2
-        occs_dict['inertia'] = utils.origin2center_of_mass(moment_inertia_world, center_of_mass, mass)
-        
-        if 'base_link' in occs.component.name:
-            inertial_dict['base_link'] = occs_dict
-        else:
-            inertial_dict[re.sub('[ :()]', '_', occs.name)] = occs_dict
+def occurrence_material(occs, cache):
+    """
+    material of one top level occurrence: the color of its appearance, or
+    of its first body, its component material or its sub-occurrences
 
-    return inertial_dict, msg
+    Returns
+    ----------
+    {material}, (material_name, rgba string) or None
+    """
+    def traverseColor(occ):
+        appear = None
+        if occ.appearance:
+            appear = resolve_appearance(occ.appearance, cache)
+            if appear:
+                return appear
+
+        if occ.bRepBodies:
+            for body in occ.bRepBodies:
+                if body.appearance:
+                    appear = resolve_appearance(body.appearance, cache)
+                    if appear:
+                        return appear
 
+        if occ.component.material:
+            appear = resolve_appearance(occ.component.material.appearance, cache)
+            if appear:
+                return appear
 
+        if occ.childOccurrences:
+            for child in occ.childOccurrences:
+                appear = traverseColor(child)
+        return appear
 
+    app_dict = {}
+    app_dict['material'] = "silver_default"
+    color = None
+    try:
+        color = traverseColor(occs)
+        if color:
+            app_dict['material'] = color[0]
+    except:
+        print('Failed:\n{}'.format(traceback.format_exc()))
+    return app_dict, color
 
-def make_material_dict(root, msg):
+
+def quantize_color(rgba, step):
+    """
+    Round every channel of an rgba string to a multiple of step
+    """
+    return ' '.join(['{:.3f}'.format(round(float(_) / step) * step) for _ in rgba.split()])
+
+
+def merge_colors(material_dict, color_dict, color_step):
+    """
+    Round the colors to multiples of color_step and merge the materials
+    which end up with the same color. The first name in alphabetical order
+    is kept for each color, material_dict is updated to use it.
+
+    Returns
+    ----------
+    color_dict: {material_name:rgba string}
+    """
+    renamed = {}
+    by_color = {}
+    for name in sorted(color_dict):
+        rgba = quantize_color(color_dict[name], color_step)
+        renamed[name] = by_color.setdefault(rgba, name)
+    for app_dict in material_dict.values():
+        app_dict['material'] = renamed[app_dict['material']]
+    return {name: rgba for rgba, name in by_color.items()}
+
+
+def make_material_dict(root, msg, color_step=0, names=None, resume=None):
     """      
     Parameters
     ----------
@@ -140,6 +338,13 @@ def make_material_dict(root, msg):
         Root component
     msg: str
         Tell the status
+    color_step: float
+        if not 0, the colors are rounded to multiples of color_step and the
+        materials which end up with the same color are merged into one
+    names: Names.NameRegistry
+        link names of the occurrences, a new one is made if None
+    resume: callable
+        see iter_materials
         
     Returns
     ----------
@@ -148,120 +353,16 @@ def make_material_dict(root, msg):
     msg: str
         Tell the status 
     """
-    def convert_german(str_in):
-        str_in = str_in.replace('ä', 'ae')
-        str_in = str_in.replace( 'ö', 'oe')
-        str_in = str_in.replace( 'ü', 'ue')
-        str_in = str_in.replace( 'Ä', 'Ae')
-        str_in = str_in.replace( 'Ö', 'Oe')
-        str_in = str_in.replace( 'Ü', 'Ue')
-        str_in = str_in.replace( 'ß', 'ss')
-        return str_in
-    # Get component properties.      
-    allOccs = root.occurrences
     material_dict = {}
 
     color_dict = {}
     color_dict['silver_default'] = "0.700 0.700 0.700 1.000"
-    for occs in allOccs:
-        app_dict = {}
-        app_dict['material'] = "silver_default"
-  
-        #occs_dict = {}
-        
-        #for attr in occs.attributes:
-            #print(attr.value)
- 
-   
-        def traverseColor(occ):
-            appear = None
-            if occ.appearance:
-                #print("occ appearance")
-                for prop in occ.appearance.appearanceProperties:
-
-                    if type(prop) == adsk.core.ColorProperty:
-                        #print(prop.name)  
-                        return(occ.appearance.name, prop)
-            
-            if occ.bRepBodies:
-                for body in occ.bRepBodies:
-                    if body.appearance:
-                        for prop in body.appearance.appearanceProperties:
-
-                            if type(prop) == adsk.core.ColorProperty:
-                                #print(prop.name)  
-                                return(body.appearance.name, prop)
-                
-                # for prop in occ.component.material.appearance.appearanceProperties:
-                #     #print(prop)
-                #     if type(prop) == adsk.core.ColorProperty:
-                #         return(occ.component.material.appearance.name, prop)  
-
-
-            if occ.component.material:
-                #print("material found")
-                for prop in occ.component.material.appearance.appearanceProperties:
-                    #print(prop)
-                    if type(prop) == adsk.core.ColorProperty:
-                        return(occ.component.material.appearance.name, prop)  
-
-            if occ.childOccurrences:
-                for child in occ.childOccurrences:
-                    #print(child.name)
-                    appear = traverseColor(child)
-            return appear
-    
-        try:
-            prop_name, prop = traverseColor(occs)
-        
-        
-            if prop:
-                color_name = convert_german(prop_name).replace("Farbe - ","").replace("Color - ","")
-                color_name = ("".join(re.findall(r"[A-Za-z0-9 ]*", color_name)))
-                color_name = re.sub('\s+',' ',color_name)
-                color_name.strip()
-                color_name = re.sub('[ :()]', '_', color_name)
-                color_name = color_name.replace("__","_").lower()
-                    # print("Color found: "+ color_name)
-                    # print("Red: %d ", prop.value.red)
-                    # print("Green: %d", prop.value.green)
-                    # print("Blue: %d", prop.value.green)                    
-                    # print("Opac: %d", prop.value.opacity)
-                    
-                app_dict['material'] = color_name
-                color_dict[color_name] = f"{prop.value.red/255} {prop.value.green/255} {prop.value.blue/255} {prop.value.opacity/255}"
-     
-        
-        
-        except:
-                print('Failed:\n{}'.format(traceback.format_exc()))
-
-
-
-        # if occs.appearance:
-        #     for prop in occs.appearance.appearanceProperties:
-                
-        #         if type(prop) == adsk.core.ColorProperty:
-        # #if prop:
-        #             color_name = convert_german(occs.appearance.name).replace("Farbe - ","").replace("Color - ","")
-        #             color_name = ("".join(re.findall(r"[A-Za-z0-9 ]*", color_name)))
-        #             color_name = re.sub('\s+',' ',color_name)
-        #             color_name.strip()
-        #             color_name = re.sub('[ :()]', '_', color_name)
-        #             color_name = color_name.replace("__","_").lower()
-        #             # print("Color found: "+ color_name)
-        #             # print("Red: %d ", prop.value.red)
-        #             # print("Green: %d", prop.value.green)
-        #             # print("Blue: %d", prop.value.green)                    
-        #             # print("Opac: %d", prop.value.opacity)
-                    
-        #             app_dict['material'] = color_name
-        #             color_dict[color_name] = f"{prop.value.red/255} {prop.value.green/255} {prop.value.blue/255} {prop.value.opacity/255}"
-        #             break
-
-        if "base_link" in occs.component.name:
-            material_dict['base_link'] = app_dict
-        else:
-            material_dict[re.sub('[ :()]', '_', occs.name)] = app_dict
+    for name, app_dict, color in iter_materials(root, names=names, resume=resume):
+        material_dict[name] = app_dict
+        if color:
+            color_dict[color[0]] = color[1]
+
+    if color_step:
+        color_dict = merge_colors(material_dict, color_dict, color_step)
 
     return material_dict, color_dict, msg
\ No newline at end of file
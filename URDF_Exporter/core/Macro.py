@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 2026
+
+@author: JatinPatil2003
+"""
+
+import re
+from . import Link, Joint, Tree
+from ..utils import utils
+
+
+def _round(values):
+    return tuple(round(_, 6) for _ in values)
+
+
+def find_instances(joints_dict, inertial_dict, material_dict, tree=None):
+    """
+    Find subtrees which are repeated in the robot: same component, same
+    mass properties and material, the same joint to the parent (apart from
+    its origin, a macro parameter) and the same joints to identical
+    children at the same relative positions. Only translated copies match,
+    because the inertia is compared in the world coordinate. A subtree
+    inside another instance is written by the macro of that instance.
+
+
+    Parameters
+    ----------
+    joints_dict: dict
+        information of the each joint
+    inertial_dict: {name:{component, mass, inertia, center_of_mass}}
+    material_dict: {name:{material}}
+    tree: Tree.KinematicTree
+        index of joints_dict, built here if not given
+
+    Returns
+    ----------
+    {root link of an instance: {macro, links, joints}}
+        links and joints of the instance in the order of the macro
+        parameters, macro: {name, links, joints} of the first instance
+    """
+    tree = tree or Tree.KinematicTree(joints_dict)
+    origins = {link: joints_dict[tree.joint(link)]['xyz'] for link in tree.links()[1:]}
+    signatures = {}
+    child_keys = {}
+
+    def joint_key(link):
+        # the macro writes the joint of its first link too, only its origin is a parameter
+        joint = joints_dict[tree.joint(link)]
+        return joint['type'], _round(joint['axis']), joint['upper_limit'], joint['lower_limit']
+
+    def signature(link):
+        if link not in signatures:
+            inertial = inertial_dict[link]
+            for child in tree.children(link):
+                child_keys[child] = joint_key(child) \
+                    + (_round([c - p for c, p in zip(origins[child], origins[link])]), signature(child))
+            signatures[link] = (inertial.get('component'), material_dict[link]['material'],
+                                round(inertial['mass'], 6), _round(inertial['inertia']),
+                                _round([c - o for c, o in zip(inertial['center_of_mass'], origins[link])]),
+                                tuple(sorted(child_keys[_] for _ in tree.children(link))))
+        return signatures[link]
+
+    def subtree(link):
+        # identical subtrees list their links in the same order
+        order = [link]
+        for child in sorted(tree.children(link), key=lambda _: child_keys[_]):
+            order += subtree(child)
+        return order
+
+    groups = {}
+    for link in tree.links(sort=True)[1:]:
+        if tree.joint(link) not in tree.unreachable and link in inertial_dict and link in material_dict:
+            groups.setdefault((joint_key(link), signature(link)), []).append(link)
+
+    instances = {}
+    covered = set()
+    used_names = set()
+    for link in tree.links(sort=True)[1:]:
+        if link in covered or link not in signatures:
+            continue
+        # roots inside (or around) an instance which is already written are left out
+        roots = [_ for _ in groups.get((joint_key(link), signatures[link]), []) if covered.isdisjoint(subtree(_))]
+        if len(roots) < 2:
+            continue
+        name = re.sub('[^A-Za-z0-9_]', '_', str(inertial_dict[link].get('component') or link))
+        while name in used_names:
+            name += '_'
+        used_names.add(name)
+        links = subtree(roots[0])
+        macro = {'name': name, 'links': links, 'joints': [tree.joint(_) for _ in links]}
+        for root in roots:
+            links = subtree(root)
+            instances[root] = {'macro': macro, 'links': links, 'joints': [tree.joint(_) for _ in links]}
+            covered.update(links)
+    return instances
+
+
+def make_macro_xml(macro, joints_dict, inertial_dict, material_dict, repo, canonical=False, tree=None,
+                   local_meshes=False):
+    """
+    Generate the xacro:macro of a repeated subtree
+
+
+    Parameters
+    ----------
+    macro: {name, links, joints}
+        see find_instances
+    repo: str
+        the name of the repository of the meshes
+    local_meshes: bool
+        the meshes are in their link frames, see mesh.localize_meshes
+
+    Returns
+    ----------
+    macro_xml: str
+        parameters: parent, x y z (origin of the first link in the world
+        coordinate), xyz (origin of the first joint) and linkN, jointN
+    """
+    tree = tree or Tree.KinematicTree(joints_dict)
+    links = macro['links']
+    index = {link: i for i, link in enumerate(links)}
+    origins = {link: joints_dict[tree.joint(link)]['xyz'] for link in links}
+    params = ['parent', 'x', 'y', 'z', 'xyz'] + ['link{}'.format(i) for i in range(len(links))] \
+        + ['joint{}'.format(i) for i in range(len(links))]
+
+    xml = '<xacro:macro name="{}" params="{}">\n'.format(macro['name'], ' '.join(params))
+    for i, link in enumerate(links):
+        relative = [o - r for o, r in zip(origins[link], origins[links[0]])]
+        center_of_mass = [c - o for c, o in zip(inertial_dict[link]['center_of_mass'], origins[link])]
+        element = Link.Link(name='${{link{}}}'.format(i), xyz=[0, 0, 0],
+            center_of_mass=center_of_mass, repo=repo,
+            mass=inertial_dict[link]['mass'],
+            inertia_tensor=inertial_dict[link]['inertia'],
+            material=material_dict[link]['material'],
+            canonical=canonical, local_mesh=local_meshes)
+        # the mesh is in the world coordinate, so its offset depends on the
+        # instance. Meshes in their link frame need none.
+        element.xyz = ['${{-({} + {})}}'.format(axis, utils.format_number(r, canonical))
+                       for axis, r in zip('xyz', relative)]
+        element.make_link_xml()
+        xml += element.link_xml + '\n'
+
+    for i, link in enumerate(links):
+        joint = joints_dict[tree.joint(link)]
+        if i == 0:
+            parent, xyz = '${parent}', ['${xyz}']
+        else:
+            parent = '${{link{}}}'.format(index[tree.parent(link)])
+            xyz = [round(c - p, 6) for c, p in zip(origins[link], origins[tree.parent(link)])]
+        element = Joint.Joint(name='${{joint{}}}'.format(i), joint_type=joint['type'], xyz=xyz,
+            axis=joint['axis'], parent=parent, child='${{link{}}}'.format(i),
+            upper_limit=joint['upper_limit'], lower_limit=joint['lower_limit'], canonical=canonical)
+        element.make_joint_xml()
+        xml += element.joint_xml + '\n'
+    xml += '</xacro:macro>\n'
+    return xml
+
+
+def make_call_xml(instance, joints_dict, canonical=False, tree=None):
+    """
+    Generate the call of the macro for one instance
+
+
+    Parameters
+    ----------
+    instance: {macro, links, joints}
+        see find_instances
+
+    Returns
+    ----------
+    call_xml: str
+    """
+    tree = tree or Tree.KinematicTree(joints_dict)
+    root = instance['links'][0]
+    parent = tree.parent(root)
+    origin = joints_dict[tree.joint(root)]['xyz']
+    parent_origin = joints_dict[tree.joint(parent)]['xyz'] if parent != tree.root else [0, 0, 0]
+    xyz = [round(c - p, 6) for c, p in zip(origin, parent_origin)]
+    params = [('parent', parent)] + list(zip('xyz', [utils.format_number(_, canonical) for _ in origin]))
+    params.append(('xyz', utils.format_vector(xyz, canonical)))
+    params += [('link{}'.format(i), _) for i, _ in enumerate(instance['links'])]
+    params += [('joint{}'.format(i), _) for i, _ in enumerate(instance['joints'])]
+    return '<xacro:{} {}/>\n'.format(instance['macro']['name'],
+                                     ' '.join('{}="{}"'.format(name, value) for name, value in params))
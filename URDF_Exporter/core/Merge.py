@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 2026
+
+@author: JatinPatil2003
+"""
+
+from . import Tree
+
+
+def combine_inertials(inertials):
+    """
+    combine rigidly connected bodies into one with the parallel axis theorem
+
+
+    Parameters
+    ----------
+    inertials: [{mass, center_of_mass, inertia}]
+        entries of inertial_dict, center_of_mass in the world coordinate and
+        inertia [xx, yy, zz, xy, yz, xz] about the center of mass
+
+    Returns
+    ----------
+    {mass, center_of_mass, inertia} of the combined body
+    """
+    mass = sum(_['mass'] for _ in inertials)
+    if mass <= 0:
+        return {'mass': 0.0, 'center_of_mass': list(inertials[0]['center_of_mass']),
+                'inertia': [0.0] * 6}
+    center_of_mass = [sum(_['mass'] * _['center_of_mass'][i] for _ in inertials) / mass for i in range(3)]
+
+    inertia = [0.0] * 6
+    for body in inertials:
+        x, y, z = [c - m for c, m in zip(body['center_of_mass'], center_of_mass)]
+        m = body['mass']
+        translation_matrix = [y**2+z**2, x**2+z**2, x**2+y**2, -x*y, -y*z, -x*z]
+        inertia = [i + b + m*t for i, b, t in zip(inertia, body['inertia'], translation_matrix)]
+    return {'mass': mass, 'center_of_mass': center_of_mass, 'inertia': [round(_, 6) for _ in inertia]}
+
+
+def merge_fixed_joints(joints_dict, inertial_dict, material_dict, keep=(), tree=None):
+    """
+    Fold the child link of every fixed joint into its parent, so that the
+    robot has one link per rigid body instead of one per Fusion component.
+
+
+    Parameters
+    ----------
+    joints_dict: dict
+        information of the each joint
+    inertial_dict: {name:{mass, inertia, center_of_mass}}
+    material_dict: {name:{material}}
+    keep: [str]
+        links which keep their own frame even if they are fixed
+    tree: Tree.KinematicTree
+        index of joints_dict, built here if not given
+
+    Returns
+    ----------
+    joints_dict, inertial_dict, material_dict:
+        new dicts without the merged links and joints
+    merged: {link: [links merged into it]}
+    """
+    tree = tree or Tree.KinematicTree(joints_dict)
+    target = {tree.root: tree.root}
+    merged = {}
+    for link in tree.links()[1:]:
+        joint = joints_dict[tree.joint(link)]
+        if joint['type'] == 'fixed' and link not in keep and link in inertial_dict:
+            target[link] = target[tree.parent(link)]
+            merged.setdefault(target[link], []).append(link)
+        else:
+            target[link] = link
+
+    new_joints_dict = {}
+    for name, joint in joints_dict.items():
+        if target.get(joint['child'], joint['child']) != joint['child']:
+            continue  # folded into its parent
+        joint = dict(joint)
+        joint['parent'] = target.get(joint['parent'], joint['parent'])
+        new_joints_dict[name] = joint
+
+    new_inertial_dict = {}
+    for name, inertial in inertial_dict.items():
+        if target.get(name, name) != name:
+            continue
+        if name in merged:
+            inertial = dict(inertial)
+            inertial.update(combine_inertials([inertial_dict[_] for _ in [name] + merged[name]]))
+        new_inertial_dict[name] = inertial
+
+    new_material_dict = {name: material for name, material in material_dict.items()
+                         if target.get(name, name) == name}
+
+    return new_joints_dict, new_inertial_dict, new_material_dict, merged
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 2026
+
+@author: JatinPatil2003
+"""
+
+import os
+from xml.etree.ElementTree import Element, SubElement
+from . import Tree, Collision
+from ..utils import utils
+
+# urdf joint type -> MuJoCo joint type, the others are welded to their parent
+joint_types = {'revolute': 'hinge', 'continuous': 'hinge', 'prismatic': 'slide', 'Ball': 'ball'}
+
+
+def write_mjcf(joints_dict, links_xyz_dict, inertial_dict, material_dict, color_dict, robot_name, save_dir,
+               collision='mesh', canonical=False, tree=None, local_meshes=False, freejoint=False):
+    """
+    Write the MuJoCo model "save_dir/mjcf/robot_name.xml". The bodies are
+    nested like the kinematic tree, the inertias are written as they are
+    instead of being computed from the geoms, and the meshes of
+    "save_dir/meshes" are referenced as assets.
+
+
+    Parameters
+    ----------
+    joints_dict: dict
+        information of the each joint
+    links_xyz_dict: {link: [x, y, z]}
+        offset of the mesh in the link frame, see write_link_urdf
+    inertial_dict: dict
+        information of the each link
+    material_dict: {link: {material}}
+    color_dict: {material: rgba string}
+    robot_name: str
+        name of the robot
+    save_dir: str
+        path of the repository to save
+    collision: str
+        'mesh': the link mesh is also the collision geom, MuJoCo collides
+        its convex hull. 'box': the mesh is only visual and the axis aligned
+        bounding box of the mesh is the collision geom.
+    canonical: bool
+        write numbers with fixed precision
+    tree: Tree.KinematicTree
+    local_meshes: bool
+        the meshes are in their link frames and in m, see mesh.localize_meshes
+    freejoint: bool
+        give the base body a freejoint, e.g. for a mobile robot. Without it
+        base_link is welded to the world like in the urdf, which has no
+        joint above base_link either.
+    """
+    try: os.mkdir(save_dir + '/mjcf')
+    except: pass
+
+    tree = tree or Tree.KinematicTree(joints_dict)
+    mesh_dir = save_dir + '/meshes'
+    boxes = Collision.link_boxes(mesh_dir, links_xyz_dict) if collision == 'box' else {}
+    links = [link for link in tree.links(canonical) if link in links_xyz_dict]
+
+    mujoco = Element('mujoco')
+    mujoco.attrib = {'model': robot_name}
+    compiler = SubElement(mujoco, 'compiler')
+    compiler.attrib = {'angle': 'radian', 'meshdir': '../meshes', 'inertiafromgeom': 'false'}
+
+    asset = SubElement(mujoco, 'asset')
+    for color in (sorted(color_dict) if canonical else color_dict):
+        material = SubElement(asset, 'material')
+        material.attrib = {'name': color,
+                           'rgba': utils.format_vector([float(_) for _ in color_dict[color].split()], canonical)}
+    meshes = [link for link in links if os.path.exists(os.path.join(mesh_dir, link + '.stl'))]
+    for link in meshes:
+        mesh = SubElement(asset, 'mesh')
+        mesh.attrib = {'name': link, 'file': link + '.stl'}
+        if not local_meshes:
+            mesh.attrib['scale'] = '0.001 0.001 0.001'
+
+    bodies = {None: SubElement(mujoco, 'worldbody')}
+    for link in links:
+        parent = tree.parent(link)
+        body = SubElement(bodies[parent], 'body')
+        bodies[link] = body
+        # the link frames are parallel to the world, so the offset to the
+        # parent is the difference of their mesh offsets
+        xyz = [0, 0, 0] if parent is None else [p - c for p, c in zip(links_xyz_dict[parent], links_xyz_dict[link])]
+        body.attrib = {'name': link, 'pos': utils.format_vector(xyz, canonical)}
+        if parent is None and freejoint:
+            SubElement(body, 'freejoint').attrib = {'name': link + '_free'}
+
+        inertial = SubElement(body, 'inertial')
+        xx, yy, zz, xy, yz, xz = inertial_dict[link]['inertia']
+        center_of_mass = [c + o for c, o in zip(inertial_dict[link]['center_of_mass'], links_xyz_dict[link])]
+        inertial.attrib = {'pos': utils.format_vector(center_of_mass, canonical),
+                           'mass': utils.format_number(inertial_dict[link]['mass'], canonical),
+                           'fullinertia': utils.format_vector([xx, yy, zz, xy, xz, yz], canonical)}
+
+        joint_dict = joints_dict.get(tree.joint(link), {})
+        if joint_dict.get('type') in joint_types:
+            joint = SubElement(body, 'joint')
+            joint.attrib = {'name': tree.joint(link), 'type': joint_types[joint_dict['type']]}
+            if joint_dict['type'] != 'Ball':
+                joint.attrib['axis'] = utils.format_vector(joint_dict['axis'], canonical)
+            if joint_dict['type'] in ('revolute', 'prismatic'):
+                joint.attrib['limited'] = 'true'
+                joint.attrib['range'] = utils.format_vector([joint_dict['lower_limit'], joint_dict['upper_limit']],
+                                                            canonical)
+
+        if link in meshes:
+            geom = SubElement(body, 'geom')
+            geom.attrib = {'name': link, 'type': 'mesh', 'mesh': link,
+                           'pos': utils.format_vector([0, 0, 0] if local_meshes else links_xyz_dict[link], canonical),
+                           'material': material_dict[link]['material']}
+            if link in boxes:
+                geom.attrib.update({'contype': '0', 'conaffinity': '0', 'group': '1'})
+                lower, upper = boxes[link]
+                box = SubElement(body, 'geom')
+                box.attrib = {'name': link + '_collision', 'type': 'box', 'group': '3',
+                              'pos': utils.format_vector([(l + u) / 2 for l, u in zip(lower, upper)], canonical),
+                              'size': utils.format_vector([max((u - l) / 2, 1e-6) for l, u in zip(lower, upper)],
+                                                          canonical)}
+
+    actuator = SubElement(mujoco, 'actuator')
+    for link in links[1:]:
+        if joints_dict[tree.joint(link)]['type'] in ('revolute', 'continuous', 'prismatic'):
+            motor = SubElement(actuator, 'motor')
+            motor.attrib = {'name': tree.joint(link) + '_actr', 'joint': tree.joint(link)}
+
+    file_name = save_dir + '/mjcf/' + robot_name + '.xml'
+    with open(file_name, mode='w') as f:
+        f.write(utils.prettify(mujoco))
@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 2026
+
+@author: JatinPatil2003
+
+Save the extracted model next to the package and render packages from it
+again without Fusion, e.g. for the other ROS version:
+
+    python -m URDF_Exporter.core.Model robot_description/robot.model.json out --ros 1 --ros 2
+"""
+
+import argparse, json, os, shutil, sys
+from . import Pipeline, Render, Physics
+
+MODEL_VERSION = 1
+
+
+def save_model(file_name, robot_name, package_name, model, names, meshes, local_meshes=False):
+    """
+    write the extracted model into a json file
+
+
+    Parameters
+    ----------
+    file_name: str
+        path of the model file, the mesh paths are stored relative to it
+    robot_name: str
+    package_name: str
+    model: (joints_dict, inertial_dict, (material_dict, color_dict), merged)
+        the model as rendered, i.e. after merging fixed joints
+    names: Names.NameRegistry
+    meshes: {link: path of the mesh file}
+    local_meshes: bool
+        the meshes are in their link frames, see mesh.localize_meshes
+    """
+    joints_dict, inertial_dict, (material_dict, color_dict), merged = model
+    base = os.path.dirname(os.path.abspath(file_name))
+    data = {'version': MODEL_VERSION,
+            'robot_name': robot_name,
+            'package_name': package_name,
+            'joints': joints_dict,
+            'inertials': inertial_dict,
+            'materials': material_dict,
+            'colors': color_dict,
+            'merged': merged,
+            'names': names.names,
+            'base_link': names.base_link,
+            'local_meshes': local_meshes,
+            'meshes': {link: os.path.relpath(path, base).replace(os.sep, '/') for link, path in meshes.items()}}
+    with open(file_name, mode='w') as f:
+        json.dump(data, f, separators=(',', ':'))
+
+
+def load_model(file_name):
+    """
+    read a model file written by save_model
+
+
+    Returns
+    ----------
+    {robot_name, package_name, joints, inertials, materials, colors, merged,
+    names, base_link, local_meshes, meshes: {link: absolute path}}
+    """
+    with open(file_name) as f:
+        data = json.load(f)
+    if data.get('version') != MODEL_VERSION:
+        raise ValueError('{} is not a model file of version {}'.format(file_name, MODEL_VERSION))
+    base = os.path.dirname(os.path.abspath(file_name))
+    data.setdefault('local_meshes', False)
+    data['meshes'] = {link: os.path.join(base, path) for link, path in data['meshes'].items()}
+    return data
+
+
+def copy_meshes(meshes, mesh_dir):
+    """
+    copy the mesh files into mesh_dir unless they are already there
+    """
+    try: os.makedirs(mesh_dir)
+    except: pass
+    for link, path in meshes.items():
+        target = os.path.join(mesh_dir, link + '.stl')
+        if not os.path.exists(target) or not os.path.samefile(path, target):
+            if os.path.exists(target):
+                os.remove(target)  # it may be a hardlink into a mesh store
+            shutil.copyfile(path, target)
+
+
+def render_model(data, save_dirs, progress=None, max_workers=4, **options):
+    """
+    write the packages of a loaded model
+
+
+    Parameters
+    ----------
+    data: dict
+        see load_model
+    save_dirs: {ros version (1 or 2): directory of the package}
+    progress: Pipeline.Progress
+    max_workers: int
+        threads of the pipeline, 1 runs the stages one after the other
+    options:
+        passed on to Render.add_stages, local_meshes is taken from the model
+
+    Returns
+    ----------
+    pipeline: Pipeline.Pipeline
+        the finished pipeline with the results and timings of the stages
+    """
+    for save_dir in save_dirs.values():
+        try: os.makedirs(save_dir)
+        except: pass
+    save_dir = save_dirs[list(save_dirs)[0]]
+    pipeline = Pipeline.Pipeline(max_workers, progress)
+    pipeline.add('model', lambda: (data['joints'], data['inertials'], (data['materials'], data['colors']),
+                                   data['merged']))
+    pipeline.add('meshes', lambda: copy_meshes(data['meshes'], save_dir + '/meshes'))
+    Render.add_stages(pipeline, data['package_name'], data['robot_name'], save_dirs,
+                      local_meshes=data['local_meshes'], **options)
+    pipeline.run()
+    return pipeline
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Render ROS packages from a model saved by Fusion2URDF.')
+    parser.add_argument('model', help='model file, <robot>.model.json in the exported package')
+    parser.add_argument('output', help='directory the package is written to')
+    parser.add_argument('--ros', type=int, choices=[1, 2], action='append',
+                        help='ROS version, give it twice for both (default: 1)')
+    parser.add_argument('--canonical', action='store_true',
+                        help='write links and joints in a stable order and with fixed precision')
+    parser.add_argument('--macros', action='store_true', help='write xacro macros for repeated sub-assemblies')
+    parser.add_argument('--srdf', action='store_true', help='write the SRDF with the disabled collisions')
+    parser.add_argument('--srdf-samples', type=int, default=1000)
+    parser.add_argument('--check-inertia', action='store_true',
+                        help='compare the mass properties of the meshes with the model')
+    parser.add_argument('--mjcf', choices=['mesh', 'box'],
+                        help='also write a MuJoCo model with these collision geoms')
+    parser.add_argument('--mjcf-freejoint', action='store_true',
+                        help='give the base body of the MuJoCo model a freejoint instead of welding it to the world')
+    parser.add_argument('--gazebo-profile', choices=sorted(Physics.PROFILES),
+                        help='write a Gazebo world and contact settings with this physics profile')
+    parser.add_argument('--no-validate', action='store_true', help="don't check the written packages")
+    parser.add_argument('--progress', action='store_true', help='print the finished stages to stderr')
+    args = parser.parse_args(argv)
+
+    def print_progress(progress, stage):
+        if progress.stages[stage]['end'] is not None:
+            print('[{:3.0f}%] {}'.format(100 * progress.fraction(), progress.describe(stage)), file=sys.stderr)
+
+    data = load_model(args.model)
+    versions = sorted(set(args.ros or [1]))
+    if len(versions) == 1:
+        save_dirs = {versions[0]: os.path.join(args.output, data['package_name'])}
+    else:
+        save_dirs = {version: os.path.join(args.output, 'ros{}'.format(version), data['package_name'])
+                     for version in versions}
+    pipeline = render_model(data, save_dirs, Pipeline.Progress(print_progress) if args.progress else None,
+                            canonical=args.canonical, macros=args.macros,
+                            srdf=args.srdf, srdf_samples=args.srdf_samples, mesh_inertia=args.check_inertia,
+                            mjcf=bool(args.mjcf), mjcf_collision=args.mjcf or 'mesh',
+                            mjcf_freejoint=args.mjcf_freejoint,
+                            validate=not args.no_validate, gazebo_profile=args.gazebo_profile)
+    for version, save_dir in save_dirs.items():
+        print('{}: ROS {} package'.format(save_dir, version))
+    print('rendered in {:.3f} s'.format(pipeline.timings['total']))
+    for name, differences in (pipeline.results.get('mesh_inertia') or {}).items():
+        print('{}: {}'.format(name, ', '.join(differences)))
+    for name, problems in Render.problems(pipeline).items():
+        for problem in problems:
+            print('{}: {}'.format(name, problem))
+
+
+if __name__ == '__main__':
+    main()
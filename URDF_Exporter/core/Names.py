@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 2026
+
+@author: JatinPatil2003
+"""
+
+import re
+
+_SEPARATORS = re.compile('[ :()]')
+
+
+def sanitize(name):
+    """
+    Name of a Fusion occurrence as it can be written to the urdf and used
+    as a file name, e.g. 'cam (front):1' -> 'cam__front__1'
+    """
+    return _SEPARATORS.sub('_', name)
+
+
+def is_base_link(occ):
+    """
+    True if the occurrence is the root link of the robot
+    """
+    return 'base_link' in occ.component.name
+
+
+class NameRegistry:
+
+    def __init__(self, root):
+        """
+        Link names of the top level occurrences of a design, assigned once
+        during the extraction and looked up by every module afterwards.
+
+        The occurrences are named in the order of their Fusion names, so
+        two occurrences which sanitize to the same link name (e.g. 'a b:1'
+        and 'a_b:1') always get the same unique names: the first one keeps
+        it, the others get a '_2', '_3', ... suffix.
+
+        Parameters
+        ----------
+        root: adsk.fusion.Design.cast(product)
+            Root component
+
+        Attributes
+        ----------
+        names: {occurrence name: link name}
+        base_link: str
+            name of the occurrence which is the base_link, None if there is none
+        collisions: [(occurrence name, link name)]
+            occurrences which were renamed to keep the link names unique
+        """
+        self.names = {}
+        self.base_link = None
+        self.collisions = []
+        self._taken = set()
+        occurrences = sorted(root.occurrences, key=lambda occ: occ.name)
+        for occ in occurrences:
+            if is_base_link(occ):
+                self.base_link = occ.name
+                self.names[occ.name] = 'base_link'
+                self._taken.add('base_link')
+                break
+        for occ in occurrences:
+            self.name(occ)
+
+    def name(self, occ):
+        """
+        Link name of a top level occurrence
+        """
+        try:
+            return self.names[occ.name]
+        except KeyError:
+            pass
+        name = unique = sanitize(occ.name)
+        count = 2
+        while unique in self._taken:
+            unique = '{}_{}'.format(name, count)
+            count += 1
+        if unique != name:
+            self.collisions.append((occ.name, unique))
+        self.names[occ.name] = unique
+        self._taken.add(unique)
+        return unique
+
+    def is_base_link(self, occ):
+        """
+        True if the occurrence is the one registered as base_link
+        """
+        return occ.name == self.base_link
@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 2026
+
+@author: JatinPatil2003
+
+Physics profiles of the Gazebo package. What a profile costs per simulated
+second can be compared for a saved model before starting Gazebo:
+
+    python -m URDF_Exporter.core.Physics myrobot_description/myrobot.model.json
+"""
+
+import argparse, os
+from xml.etree.ElementTree import Element, SubElement
+from . import Tree, Collision, Kinematics
+from ..utils import utils
+
+# Gazebo physics profiles. The world and the controllers run at 1 / max_step_size,
+# self_collide is 'touching' (only the links which can touch another one)
+# or 'none'.
+PROFILES = {
+    'accurate': {'max_step_size': 0.001, 'iters': 50, 'max_contacts': 20, 'self_collide': 'touching'},
+    'balanced': {'max_step_size': 0.002, 'iters': 30, 'max_contacts': 10, 'self_collide': 'touching'},
+    'fast': {'max_step_size': 0.004, 'iters': 20, 'max_contacts': 4, 'self_collide': 'none'},
+}
+
+
+def self_collide_links(joints_dict, boxes, samples=1000, tree=None):
+    """
+    Links which need <selfCollide>. Two links of a model collide in Gazebo
+    if either of them has selfCollide, and links connected by a joint never
+    do. So it is enough to enable it for one link of every pair which can
+    touch in the sampled configurations. The links covering the most pairs
+    are chosen first. Pairs whose boxes overlap in every sample are among
+    them, the boxes can't tell whether their meshes touch.
+
+
+    Parameters
+    ----------
+    joints_dict: dict
+        information of the each joint
+    boxes: {link: (lower, upper)}
+        bounding boxes from Collision.link_boxes, links without one have no
+        collision geometry
+    samples: int
+        number of random configurations, see Collision.disable_collisions
+    tree: Tree.KinematicTree
+
+    Returns
+    ----------
+    links: set
+    """
+    tree = tree or Tree.KinematicTree(joints_dict)
+    disabled = Collision.disable_collisions(joints_dict, boxes, samples, tree)
+    links = [_ for _ in tree.links(sort=True) if _ in boxes]
+    pairs = set(frozenset((a, b)) for i, a in enumerate(links) for b in links[i + 1:])
+    pairs -= set(frozenset(_[:2]) for _ in disabled)
+
+    selected = set()
+    while pairs:
+        candidates = [_ for _ in links if any(_ in pair for pair in pairs)]
+        link = max(candidates, key=lambda _: (sum(1 for pair in pairs if _ in pair), -links.index(_)))
+        selected.add(link)
+        pairs = set(pair for pair in pairs if link not in pair)
+    return selected
+
+
+def write_world(robot_name, save_dir, profile):
+    """
+    write the Gazebo world "save_dir/worlds/robot_name.world" with the
+    physics settings of the profile
+
+
+    Parameters
+    ----------
+    robot_name: str
+        name of the robot
+    save_dir: str
+        path of the repository to save
+    profile: str
+        key of PROFILES
+    """
+    try: os.mkdir(save_dir + '/worlds')
+    except: pass
+
+    settings = PROFILES[profile]
+    sdf = Element('sdf')
+    sdf.attrib = {'version': '1.6'}
+    world = SubElement(sdf, 'world')
+    world.attrib = {'name': 'default'}
+    for model in ('ground_plane', 'sun'):
+        SubElement(SubElement(world, 'include'), 'uri').text = 'model://' + model
+
+    physics = SubElement(world, 'physics')
+    physics.attrib = {'name': profile, 'default': 'true', 'type': 'ode'}
+    SubElement(physics, 'max_step_size').text = utils.format_number(settings['max_step_size'])
+    SubElement(physics, 'real_time_factor').text = '1'
+    SubElement(physics, 'real_time_update_rate').text = str(int(round(1 / settings['max_step_size'])))
+    SubElement(physics, 'max_contacts').text = str(settings['max_contacts'])
+    ode = SubElement(physics, 'ode')
+    solver = SubElement(ode, 'solver')
+    SubElement(solver, 'type').text = 'quick'
+    SubElement(solver, 'iters').text = str(settings['iters'])
+    SubElement(solver, 'sor').text = '1.3'
+    constraints = SubElement(ode, 'constraints')
+    SubElement(constraints, 'cfm').text = '0'
+    SubElement(constraints, 'erp').text = '0.2'
+    SubElement(constraints, 'contact_max_correcting_vel').text = '100'
+    SubElement(constraints, 'contact_surface_layer').text = '0.001'
+
+    file_name = save_dir + '/worlds/' + robot_name + '.world'
+    with open(file_name, mode='w') as f:
+        f.write(utils.prettify(sdf))
+
+
+def profile_costs(joints_dict, boxes, samples=1000, tree=None):
+    """
+    the work of every profile per simulated second. This counts what the
+    profile asks of the physics engine, it does not run it: the real time
+    factor depends on the contacts and the machine and is only known from
+    gz stats while the world runs. The counts rank the profiles for a model
+    the same way before Gazebo is started.
+
+
+    Parameters
+    ----------
+    see self_collide_links
+
+    Returns
+    ----------
+    {profile: {steps, iterations, self_collide, pairs, pair_checks}}
+        steps and solver iterations per simulated second, the links with
+        selfCollide, the link pairs tested for self collision in every step
+        and those tests per simulated second. 'default' is the package
+        written without a profile: the Gazebo defaults and selfCollide on
+        every link.
+    """
+    tree = tree or Tree.KinematicTree(joints_dict)
+    links = [_ for _ in tree.links(sort=True) if _ in boxes]
+    adjacent = set(frozenset((_['parent'], _['child'])) for _ in joints_dict.values())
+    touching = None
+    results = {}
+    profiles = dict(default={'max_step_size': 0.001, 'iters': 50, 'self_collide': 'all'}, **PROFILES)
+    for name, settings in profiles.items():
+        if settings['self_collide'] == 'all':
+            self_collide = set(links)
+        elif settings['self_collide'] == 'touching':
+            if touching is None:
+                touching = self_collide_links(joints_dict, boxes, samples, tree)
+            self_collide = touching
+        else:
+            self_collide = set()
+        pairs = sum(1 for i, a in enumerate(links) for b in links[i + 1:]
+                    if (a in self_collide or b in self_collide) and frozenset((a, b)) not in adjacent)
+        steps = int(round(1 / settings['max_step_size']))
+        results[name] = {'steps': steps, 'iterations': steps * settings['iters'],
+                         'self_collide': sorted(self_collide), 'pairs': pairs, 'pair_checks': steps * pairs}
+    return results
+
+
+def main(argv=None):
+    from . import Model
+    parser = argparse.ArgumentParser(description='Compare the Gazebo physics profiles for a model saved by Fusion2URDF.')
+    parser.add_argument('model', help='model file, <robot>.model.json in the exported package')
+    parser.add_argument('--samples', type=int, default=1000, help='configurations sampled for the self collisions')
+    args = parser.parse_args(argv)
+
+    data = Model.load_model(args.model)
+    joints_dict = data['joints']
+    origins = Kinematics.link_origins(joints_dict)
+    links_xyz_dict = {link: [-_ for _ in xyz] for link, xyz in origins.items()}
+    boxes = Collision.link_boxes(os.path.join(os.path.dirname(args.model), 'meshes'), links_xyz_dict)
+    print('{:<10}{:>8}{:>12}{:>8}{:>14}  {}'.format('profile', 'steps/s', 'iters/s', 'pairs', 'pair tests/s', 'selfCollide'))
+    for name, result in profile_costs(joints_dict, boxes, args.samples).items():
+        print('{:<10}{steps:>8}{iterations:>12}{pairs:>8}{pair_checks:>14}  {links}'.format(
+            name, links=', '.join(result['self_collide']) or '-', **result))
+    print('the real time factor of a profile is shown by gz stats while its world runs')
+
+
+if __name__ == '__main__':
+    main()
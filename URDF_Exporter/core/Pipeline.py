@@ -0,0 +1,269 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 2026
+
+@author: JatinPatil2003
+"""
+
+import threading, time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+
+class ExportError(Exception):
+    """
+    Raised by a stage to stop the export with a message for the user
+    """
+
+
+class Cancelled(ExportError):
+    """
+    Raised when the user cancelled the export
+    """
+
+
+class Progress:
+
+    def __init__(self, callback=None):
+        """
+        Progress of the stages of a pipeline, with an estimate of the time
+        left for the running stages. Stages which loop over the links
+        report their steps, so a long stage has a meaningful estimate.
+
+        Parameters
+        ----------
+        callback: callable
+            callback(progress, stage) after every change, from the thread
+            which runs the stage. It may call cancel.
+
+        Attributes
+        ----------
+        total: int
+            number of stages, set by Pipeline.run
+        stages: {name: {start, done, total, end}}
+        cancelled: bool
+        """
+        self.callback = callback
+        self.total = 0
+        self.stages = {}
+        self.cancelled = False
+        self._lock = threading.Lock()
+
+    def cancel(self):
+        self.cancelled = True
+
+    def check(self):
+        """
+        raise Cancelled if the export was cancelled
+        """
+        if self.cancelled:
+            raise Cancelled('The export was cancelled. Run it again to continue where it stopped.')
+
+    def _update(self, stage, **values):
+        with self._lock:
+            self.stages.setdefault(stage, {'start': time.perf_counter(), 'done': 0, 'total': None, 'end': None})
+            self.stages[stage].update(values)
+        if self.callback:
+            self.callback(self, stage)
+        self.check()
+
+    def start(self, stage, total=None):
+        self._update(stage, start=time.perf_counter(), total=total)
+
+    def step(self, stage, done, total=None):
+        """
+        report that done of total steps of stage are finished, raises
+        Cancelled if the export was cancelled meanwhile
+        """
+        self._update(stage, done=done, total=total or self.stages.get(stage, {}).get('total'))
+
+    def finish(self, stage):
+        self._update(stage, end=time.perf_counter())
+
+    def eta(self, stage):
+        """
+        Returns
+        ----------
+        estimated seconds until stage is finished, None if unknown
+        """
+        info = self.stages.get(stage)
+        if not info or info['end'] is not None:
+            return 0.0 if info else None
+        if not info['total'] or not info['done']:
+            return None
+        elapsed = time.perf_counter() - info['start']
+        return elapsed / info['done'] * (info['total'] - info['done'])
+
+    def fraction(self):
+        """
+        Returns
+        ----------
+        finished part of the pipeline between 0 and 1
+        """
+        with self._lock:
+            stages = list(self.stages.values())
+        done = sum(1.0 if info['end'] is not None else
+                   min(info['done'] / info['total'], 1.0) if info['total'] else 0.0 for info in stages)
+        return done / max(self.total, len(stages), 1)
+
+    def describe(self, stage):
+        """
+        Returns
+        ----------
+        e.g. "stl 3/10, 12 s left": str
+        """
+        info = self.stages.get(stage, {})
+        text = stage
+        if info.get('total'):
+            text += ' {}/{}'.format(info['done'], info['total'])
+        eta = self.eta(stage)
+        if eta:
+            text += ', {:.0f} s left'.format(eta)
+        return text
+
+
+class Pipeline:
+
+    def __init__(self, max_workers=4, progress=None):
+        """
+        Run export stages in the order given by their dependencies.
+
+        The Fusion API may only be used from the main thread, so stages
+        added with main_thread=True run inline one after the other. All
+        other stages (rendering and writing files) are handed to a thread
+        pool as soon as their dependencies are done, which lets them
+        overlap with the Fusion-bound work.
+
+        Parameters
+        ----------
+        max_workers: int
+            threads for the stages which don't use the Fusion API
+        progress: Progress
+            told when a stage starts and finishes, cancelling it stops the
+            pipeline before the next stage
+
+        Attributes
+        ----------
+        stages: {name: {func, deps, main_thread}}
+            registered stages in insertion order
+        results: {name: return value of the stage}
+        timings: {name: seconds spent in the stage}
+        """
+        self.max_workers = max_workers
+        self.progress = progress
+        self.stages = {}
+        self.results = {}
+        self.timings = {}
+
+    def add(self, name, func, deps=(), main_thread=False):
+        """
+        Register a stage
+
+        Parameters
+        ----------
+        name: str
+            name of the stage
+        func: callable
+            called with the results of deps, in the same order
+        deps: [str]
+            stages which have to finish before this one starts
+        main_thread: bool
+            True if the stage calls the Fusion API
+        """
+        self.stages[name] = {'func': func, 'deps': list(deps), 'main_thread': main_thread}
+
+    def order(self):
+        """
+        Returns
+        ----------
+        names of the stages in a valid execution order
+        """
+        order = []
+        visiting = set()
+
+        def visit(name):
+            if name in order:
+                return
+            if name in visiting:
+                raise ValueError('Stage {} depends on itself'.format(name))
+            if name not in self.stages:
+                raise ValueError('Unknown stage {}'.format(name))
+            visiting.add(name)
+            for dep in self.stages[name]['deps']:
+                visit(dep)
+            visiting.discard(name)
+            order.append(name)
+
+        for name in self.stages:
+            visit(name)
+        return order
+
+    def _call(self, name):
+        stage = self.stages[name]
+        if self.progress:
+            self.progress.start(name)
+        start = time.perf_counter()
+        result = stage['func'](*[self.results[dep] for dep in stage['deps']])
+        self.timings[name] = time.perf_counter() - start
+        self.results[name] = result
+        if self.progress:
+            self.progress.finish(name)
+        return result
+
+    def run(self):
+        """
+        Execute every stage. The first exception raised by a stage cancels
+        the stages which have not started yet and is raised again here.
+
+        Returns
+        ----------
+        results: {name: return value of the stage}
+        """
+        pending = self.order()
+        if self.progress:
+            self.progress.total = len(pending)
+        done = set()
+        futures = {}
+
+        def ready(name):
+            return all(dep in done for dep in self.stages[name]['deps'])
+
+        def collect(finished):
+            for future in finished:
+                name = futures.pop(future)
+                future.result()
+                done.add(name)
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            try:
+                while pending or futures:
+                    for name in [n for n in pending if ready(n) and not self.stages[n]['main_thread']]:
+                        pending.remove(name)
+                        futures[executor.submit(self._call, name)] = name
+
+                    main = next((n for n in pending if ready(n)), None)
+                    if main is not None:
+                        pending.remove(main)
+                        self._call(main)
+                        done.add(main)
+                        collect(wait(futures, timeout=0)[0])
+                    elif futures:
+                        collect(wait(futures, return_when=FIRST_COMPLETED)[0])
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+        self.timings['total'] = time.perf_counter() - start
+        return self.results
+
+    def report(self):
+        """
+        Returns
+        ----------
+        one line per stage with the time it took: str
+        """
+        lines = ['{:<20}{:8.3f} s'.format(name, self.timings[name])
+                 for name in self.stages if name in self.timings]
+        if 'total' in self.timings:
+            lines.append('{:<20}{:8.3f} s'.format('total', self.timings['total']))
+        return '\n'.join(lines)
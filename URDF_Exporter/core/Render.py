@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 2026
+
+@author: JatinPatil2003
+"""
+
+import os
+from . import Write, Tree, Collision, Mjcf, Kinematics, Validate, Physics
+from ..utils import utils, mesh
+
+# the template packages next to URDF_Exporter.py
+package_dir_ros1 = os.path.dirname(os.path.dirname(os.path.abspath(__file__))) + '/package_ros1/'
+package_dir_ros2 = os.path.dirname(os.path.dirname(os.path.abspath(__file__))) + '/package_ros2/'
+
+
+def add_stages(pipeline, package_name, robot_name, save_dirs, canonical=False, macros=False,
+               srdf=False, srdf_samples=1000, mesh_inertia=False, mjcf=False, mjcf_collision='mesh',
+               local_meshes=False, validate=True, gazebo_profile=None, mjcf_freejoint=False):
+    """
+    Add the stages which write the packages from the extracted model. They
+    don't call the Fusion API, so they run in the background during an
+    export and without Fusion when a saved model is rendered (Model.py).
+
+    The files which are the same for every ROS version (urdf, materials,
+    transmissions, srdf, mjcf and meshes) are rendered once into the package of
+    the first version and linked into the others, see utils.link_file.
+
+
+    Parameters
+    ----------
+    pipeline: Pipeline.Pipeline
+        has to provide the stages 'model', (joints_dict, inertial_dict,
+        (material_dict, color_dict), merged), and 'meshes', which is done
+        once the meshes are in the meshes directory of the first package
+    package_name: str
+    robot_name: str
+    save_dirs: {ros version (1 or 2): directory of the package}
+    canonical: bool
+        write links and joints in a stable order and with fixed precision
+    macros: bool
+        write xacro macros for repeated sub-assemblies
+    srdf: bool
+        write the SRDF with the disabled collision pairs
+    srdf_samples: int
+        number of configurations sampled for the SRDF
+    mesh_inertia: bool
+        compare the mass properties of the meshes with the model
+    mjcf: bool
+        write a MuJoCo model, see Mjcf.write_mjcf
+    mjcf_collision: str
+        collision geoms of the MuJoCo model, 'mesh' or 'box'
+    mjcf_freejoint: bool
+        the base body of the MuJoCo model is free instead of welded to the world
+    local_meshes: bool
+        the meshes are in their link frames and in m, see
+        mesh.localize_meshes, so the urdf has no mesh offsets and scales
+    validate: bool
+        check the cross references of every written package, the problems
+        are the results of the stages 'validate' (or 'validate_ros1', ...)
+    gazebo_profile: str
+        key of Physics.PROFILES: writes a world with its physics settings,
+        the controller update rates and selfCollide only for the links
+        which can touch (sampled like the SRDF). None keeps the defaults of
+        Gazebo and selfCollide on every link.
+    """
+    versions = list(save_dirs)
+    save_dir = save_dirs[versions[0]]
+
+    def stage(name, version):
+        # the stages of one version are suffixed if there are several
+        return name if len(versions) == 1 else '{}_ros{}'.format(name, version)
+
+    def write_urdf(joints_dict, inertial_dict, materials, tree):
+        links_xyz_dict = {}
+        Write.write_urdf(joints_dict, links_xyz_dict, inertial_dict, materials[0], package_name, robot_name, save_dir,
+                         versions[0] == 1, canonical, tree, macros, local_meshes)
+        return links_xyz_dict
+
+    def link_files(target_dir, *paths):
+        for path in paths:
+            if os.path.isdir(save_dir + path):
+                try: os.makedirs(target_dir + path)
+                except: pass
+                for name in os.listdir(save_dir + path):
+                    utils.link_file(save_dir + path + '/' + name, target_dir + path + '/' + name)
+            else:
+                try: os.makedirs(os.path.dirname(target_dir + path))
+                except: pass
+                utils.link_file(save_dir + path, target_dir + path)
+
+    def share_urdf(version):
+        target_dir = save_dirs[version]
+        Write.retarget_urdf(package_name, robot_name, save_dir, target_dir, version == 1)
+        link_files(target_dir, '/urdf/materials.xacro', '/urdf/{}.trans'.format(robot_name))
+
+    def copy_package(version):
+        target_dir = save_dirs[version]
+        utils.copy_package(target_dir, package_dir_ros2 if version == 2 else package_dir_ros1)
+        utils.update_cmakelists(target_dir, package_name)
+        utils.update_package_xml(target_dir, package_name)
+        if version == 2:
+            utils.update_ros2_launchfile(target_dir, robot_name)
+
+    pipeline.add('joints', lambda model: model[0], ['model'])
+    pipeline.add('inertials', lambda model: model[1], ['model'])
+    pipeline.add('materials', lambda model: model[2], ['model'])
+    pipeline.add('tree', Tree.KinematicTree, ['joints'])
+    # --------------------
+    # Generate URDF
+    pipeline.add('urdf', write_urdf, ['joints', 'inertials', 'materials', 'tree'])
+    pipeline.add('materials_xacro', lambda materials:
+        Write.write_materials_xacro(materials[1], robot_name, save_dir, canonical), ['materials'])
+    pipeline.add('trans', lambda joints_dict, links_xyz_dict, tree:
+        Write.write_transmissions_xacro(joints_dict, links_xyz_dict, robot_name, save_dir, canonical, tree),
+        ['joints', 'urdf', 'tree'])
+    if srdf:
+        pipeline.add('srdf', lambda joints_dict, links_xyz_dict, tree, _:
+            Write.write_srdf(robot_name, save_dir, Collision.disable_collisions(
+                joints_dict, Collision.link_boxes(save_dir + '/meshes', links_xyz_dict), srdf_samples, tree)),
+            ['joints', 'urdf', 'tree', 'meshes'])
+    if mesh_inertia:
+        pipeline.add('mesh_inertia', lambda inertial_dict, joints_dict, _:
+            mesh.check_inertial_dict(inertial_dict, save_dir + '/meshes',
+                                     origins=Kinematics.link_origins(joints_dict)),
+            ['inertials', 'joints', 'meshes'])
+    if mjcf:
+        pipeline.add('mjcf', lambda joints_dict, links_xyz_dict, inertial_dict, materials, tree, _:
+            Mjcf.write_mjcf(joints_dict, links_xyz_dict, inertial_dict, materials[0], materials[1], robot_name, save_dir,
+                            mjcf_collision, canonical, tree, local_meshes, mjcf_freejoint),
+            ['joints', 'urdf', 'inertials', 'materials', 'tree', 'meshes'])
+    if gazebo_profile and 1 in versions:
+        pipeline.add('self_collide', lambda joints_dict, links_xyz_dict, tree, _:
+            Physics.self_collide_links(joints_dict, Collision.link_boxes(save_dir + '/meshes', links_xyz_dict),
+                                       srdf_samples, tree)
+            if Physics.PROFILES[gazebo_profile]['self_collide'] == 'touching' else set(),
+            ['joints', 'urdf', 'tree', 'meshes'])
+    update_rate = int(round(1 / Physics.PROFILES[gazebo_profile]['max_step_size'])) if gazebo_profile else 100
+
+    for version in versions:
+        target_dir = save_dirs[version]
+        shared = ['urdf', 'materials_xacro', 'trans']
+        if target_dir != save_dir:
+            shared = [stage('shared', version)]
+            pipeline.add(shared[0], lambda *_, version=version: share_urdf(version),
+                         ['urdf', 'materials_xacro', 'trans'])
+            pipeline.add(stage('shared_meshes', version), lambda _, target_dir=target_dir:
+                link_files(target_dir, '/meshes'), ['meshes'])
+            if srdf:
+                pipeline.add(stage('shared_srdf', version), lambda _, target_dir=target_dir:
+                    link_files(target_dir, '/urdf/{}.srdf'.format(robot_name)), ['srdf'])
+            if mjcf:
+                pipeline.add(stage('shared_mjcf', version), lambda _, target_dir=target_dir:
+                    link_files(target_dir, '/mjcf'), ['mjcf'])
+        if version == 1:
+            shared.append(stage('gazebo', version))
+            pipeline.add(shared[-1], lambda joints_dict, links_xyz_dict, inertial_dict, tree, self_collide=None,
+                                            target_dir=target_dir:
+                Write.write_gazebo_xacro(joints_dict, links_xyz_dict, inertial_dict, package_name, robot_name, target_dir,
+                                         canonical, tree, gazebo_profile, self_collide),
+                ['joints', 'urdf', 'inertials', 'tree'] + (['self_collide'] if gazebo_profile else []))
+            pipeline.add(stage('display_launch', version), lambda target_dir=target_dir:
+                Write.write_display_launch(package_name, robot_name, target_dir))
+            pipeline.add(stage('gazebo_launch', version), lambda target_dir=target_dir:
+                Write.write_gazebo_launch(package_name, robot_name, target_dir, bool(gazebo_profile)))
+            if gazebo_profile:
+                pipeline.add(stage('world', version), lambda target_dir=target_dir:
+                    Physics.write_world(robot_name, target_dir, gazebo_profile))
+            pipeline.add(stage('control_launch', version), lambda joints_dict, tree, target_dir=target_dir:
+                Write.write_control_launch(package_name, robot_name, target_dir, joints_dict, canonical, tree),
+                ['joints', 'tree'])
+            pipeline.add(stage('yaml', version), lambda joints_dict, tree, target_dir=target_dir:
+                Write.write_yaml(package_name, robot_name, target_dir, joints_dict, canonical, tree),
+                ['joints', 'tree'])
+        if version == 2:
+            pipeline.add(stage('controllers', version), lambda joints_dict, tree, target_dir=target_dir:
+                Write.write_ros2_controllers_yaml(robot_name, target_dir, joints_dict, canonical, tree, update_rate),
+                ['joints', 'tree'])
+        # the launch files load the expanded urdf instead of running xacro
+        pipeline.add(stage('flat_urdf', version), lambda *_, target_dir=target_dir:
+            Write.write_flat_urdf(package_name, robot_name, target_dir), shared)
+        pipeline.add(stage('package', version), lambda version=version: copy_package(version))
+        if validate:
+            pipeline.add(stage('validate', version), lambda *_, target_dir=target_dir:
+                Validate.validate_package(package_name, robot_name, target_dir),
+                [stage('flat_urdf', version), stage('package', version),
+                 'meshes' if target_dir == save_dir else stage('shared_meshes', version)])
+
+
+def problems(pipeline):
+    """
+    Returns
+    ----------
+    {stage: [problems]} of the validate stages which found any
+    """
+    return {name: result for name, result in pipeline.results.items()
+            if name.split('_')[0] == 'validate' and result}
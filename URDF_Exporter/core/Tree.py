@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 2026
+
+@author: JatinPatil2003
+"""
+
+from collections import deque
+
+
+class KinematicTree:
+
+    def __init__(self, joints_dict, root='base_link'):
+        """
+        Parent/child index of the links, built once from joints_dict
+
+        Attributes
+        ----------
+        root: str
+            name of the root link
+        parent_of: {child link: parent link}
+        joint_of: {child link: name of the joint to its parent}
+        children_of: {link: [child links in joints_dict order]}
+        depth: {link: number of joints between root and link}
+        subtree_size: {link: number of links in the subtree incl. the link}
+        multiple_parents: [str]
+            links which are the child of more than one joint
+        unreachable: [str]
+            joints which are not part of the tree below root
+        """
+        self.root = root
+        self.joints_dict = joints_dict
+        self.parent_of = {}
+        self.joint_of = {}
+        self.children_of = {root: []}
+        self.multiple_parents = []
+
+        for name, joint in joints_dict.items():
+            parent, child = joint['parent'], joint['child']
+            if child in self.joint_of:
+                if child not in self.multiple_parents:
+                    self.multiple_parents.append(child)
+                continue
+            self.parent_of[child] = parent
+            self.joint_of[child] = name
+            self.children_of.setdefault(parent, []).append(child)
+            self.children_of.setdefault(child, [])
+
+        self.depth = {root: 0}
+        queue = deque([root])
+        while queue:
+            link = queue.popleft()
+            for child in self.children_of[link]:
+                if child not in self.depth:  # guard against loops
+                    self.depth[child] = self.depth[link] + 1
+                    queue.append(child)
+
+        self.subtree_size = {}
+        for link in sorted(self.depth, key=self.depth.get, reverse=True):
+            self.subtree_size[link] = 1 + sum(self.subtree_size.get(c, 0) for c in self.children_of[link]
+                                              if self.depth.get(c, -1) > self.depth[link])
+
+        self.unreachable = [name for name, joint in joints_dict.items()
+                            if joint['child'] not in self.depth or self.joint_of[joint['child']] != name]
+
+    def parent(self, link):
+        """
+        Returns
+        ----------
+        parent link or None for the root
+        """
+        return self.parent_of.get(link)
+
+    def joint(self, link):
+        """
+        Returns
+        ----------
+        name of the joint which connects link to its parent or None
+        """
+        return self.joint_of.get(link)
+
+    def children(self, link):
+        """
+        Returns
+        ----------
+        child links: [str]
+        """
+        return self.children_of.get(link, [])
+
+    def is_link(self, name):
+        return name == self.root or name in self.joint_of
+
+    def links(self, sort=False, depth_first=False):
+        """
+        Links from root to the leaves
+
+
+        Parameters
+        ----------
+        sort: bool
+            visit the children of a link sorted by name instead of in
+            joints_dict order
+        depth_first: bool
+            DFS instead of BFS
+
+        Returns
+        ----------
+        link names: [str]
+        """
+        order = []
+        visited = set()
+        pending = deque([self.root])
+        while pending:
+            link = pending.pop() if depth_first else pending.popleft()
+            if link in visited:
+                continue
+            visited.add(link)
+            order.append(link)
+            children = sorted(self.children(link)) if sort else self.children(link)
+            if depth_first:
+                children = reversed(children)
+            pending.extend(children)
+        return order
+
+    def joints(self, sort=False, depth_first=False):
+        """
+        Joints in the order of their child links (see links), followed by
+        the joints which are not connected to root
+
+        Returns
+        ----------
+        joint names: [str]
+        """
+        order = [self.joint_of[link] for link in self.links(sort, depth_first)[1:]]
+        return order + (sorted(self.unreachable) if sort else self.unreachable)
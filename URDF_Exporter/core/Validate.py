@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 2026
+
+@author: JatinPatil2003
+
+Check a written package the way ROS will load it: the robot xacro and its
+includes are parsed as a stream, every name is indexed and every reference
+(joint parents and children, materials, transmissions, gazebo references,
+include files, macros and meshes) is looked up in the index.
+"""
+
+import os, re, struct
+from concurrent.futures import ThreadPoolExecutor
+from xml.etree.ElementTree import iterparse
+
+XACRO = '{http://www.ros.org/wiki/xacro}'
+_PARAM = re.compile(r'\$\{(\w+)\}')
+_FIND = re.compile(r'\$\(find ([^)]+)\)')
+# xacro elements which are not macro calls
+_XACRO_TAGS = {'include', 'macro', 'property', 'arg', 'if', 'unless', 'insert_block', 'call', 'element',
+               'attribute'}
+
+
+class _Index:
+
+    def __init__(self):
+        self.links = {}  # name: file
+        self.joints = {}  # name: (parent, child, file)
+        self.materials = set()
+        self.material_refs = []  # (link, material, file)
+        self.meshes = []  # (link, filename, file)
+        self.transmissions = []  # (transmission, joint, file)
+        self.references = []  # (gazebo reference, file)
+        self.problems = []
+
+    def add(self, kind, values, file):
+        if kind == 'link':
+            if values[0] in self.links:
+                self.problems.append('{}: link {} is defined twice'.format(file, values[0]))
+            self.links[values[0]] = file
+        elif kind == 'joint':
+            if values[0] in self.joints:
+                self.problems.append('{}: joint {} is defined twice'.format(file, values[0]))
+            self.joints[values[0]] = (values[1], values[2], file)
+        elif kind == 'material':
+            self.materials.add(values[0])
+        elif kind == 'material_ref':
+            self.material_refs.append(tuple(values) + (file,))
+        elif kind == 'mesh':
+            self.meshes.append(tuple(values) + (file,))
+        elif kind == 'transmission':
+            self.transmissions.append(tuple(values) + (file,))
+        elif kind == 'reference':
+            self.references.append((values[0], file))
+
+
+def _parse(file_name, packages, index, macros):
+    """
+    stream the elements of one xacro file into index, following its
+    includes. Macro bodies are kept as templates and added once per call
+    with the parameters of the call.
+    """
+    file = os.path.basename(file_name)
+    stack = []
+    macro = None  # items of the macro being defined
+    link = joint = transmission = None
+
+    def add(kind, *values):
+        if macro is not None:
+            macro.append((kind, values))
+        else:
+            index.add(kind, values, file)
+
+    for event, elem in iterparse(file_name, events=('start', 'end')):
+        tag = elem.tag
+        if event == 'start':
+            parent = stack[-1] if stack else None
+            stack.append(tag)
+            if tag == XACRO + 'include':
+                include = _FIND.sub(lambda m: packages.get(m.group(1), m.group(0)), elem.get('filename', ''))
+                if os.path.exists(include):
+                    _parse(include, packages, index, macros)
+                else:
+                    index.problems.append('{}: included file {} does not exist'.format(file, elem.get('filename')))
+            elif tag == XACRO + 'macro':
+                macro = macros.setdefault(elem.get('name'), [])
+            elif tag.startswith(XACRO) and tag[len(XACRO):] in macros:
+                params = elem.attrib
+                for kind, values in macros[tag[len(XACRO):]]:
+                    add(kind, *[_PARAM.sub(lambda m: params.get(m.group(1), m.group(0)), _) for _ in values])
+            elif tag.startswith(XACRO) and tag[len(XACRO):] not in _XACRO_TAGS:
+                index.problems.append('{}: macro {} is not defined'.format(file, tag[len(XACRO):]))
+            elif tag == 'link' and parent != 'transmission':
+                link = elem.get('name')
+                add('link', link)
+            elif tag == 'joint' and parent == 'transmission':
+                add('transmission', transmission, elem.get('name'))
+            elif tag == 'joint':
+                joint = [elem.get('name'), None, None]
+            elif tag in ('parent', 'child') and parent == 'joint' and joint:
+                joint[1 if tag == 'parent' else 2] = elem.get('link')
+            elif tag == 'transmission':
+                transmission = elem.get('name')
+            elif tag == 'material' and parent == 'visual':
+                add('material_ref', link, elem.get('name'))
+            elif tag == 'material' and elem.get('name'):
+                add('material', elem.get('name'))
+            elif tag == 'mesh':
+                add('mesh', link, elem.get('filename', ''))
+            elif tag == 'gazebo' and elem.get('reference'):
+                add('reference', elem.get('reference'))
+        else:
+            stack.pop()
+            if tag == XACRO + 'macro':
+                macro = None
+            elif tag == 'joint' and joint:
+                add('joint', *joint)
+                joint = None
+            elif tag == 'link':
+                link = None
+            if len(stack) == 1:
+                elem.clear()  # keep only the index, not the tree
+
+
+def _check_mesh(file_name):
+    """
+    Returns
+    ----------
+    what is wrong with the stl file or None
+    """
+    try:
+        size = os.path.getsize(file_name)
+    except OSError:
+        return 'does not exist'
+    if size == 0:
+        return 'is empty'
+    with open(file_name, 'rb') as f:
+        header = f.read(84)
+    if len(header) == 84 and 84 + 50 * struct.unpack_from('<I', header, 80)[0] == size:
+        return None
+    if header.lstrip().startswith(b'solid'):
+        return None
+    return 'is not a valid stl file'
+
+
+def validate_package(package_name, robot_name, save_dir, max_workers=8):
+    """
+    check every cross reference of the written package
+
+
+    Parameters
+    ----------
+    package_name: str
+        $(find package_name) and package://package_name resolve to save_dir
+    robot_name: str
+        name of the robot, "save_dir/urdf/robot_name.xacro" is checked
+    save_dir: str
+        path of the package
+    max_workers: int
+        threads which check the mesh files
+
+    Returns
+    ----------
+    problems: [str]
+        empty if the package is consistent
+    """
+    index = _Index()
+    file_name = save_dir + '/urdf/' + robot_name + '.xacro'
+    if not os.path.exists(file_name):
+        return ['{} does not exist'.format(file_name)]
+    _parse(file_name, {package_name: save_dir}, index, {})
+    problems = index.problems
+
+    parents = {}
+    for name, (parent, child, file) in index.joints.items():
+        for role, link in (('parent', parent), ('child', child)):
+            if link not in index.links:
+                problems.append('{}: {} link {} of joint {} is not defined'.format(file, role, link, name))
+        parents.setdefault(child, []).append(name)
+    for link, joints in parents.items():
+        if len(joints) > 1:
+            problems.append('link {} is the child of several joints: {}'.format(link, ', '.join(joints)))
+    roots = [link for link in index.links if link not in parents]
+    if len(roots) != 1:
+        problems.append('the robot has {} root links: {}'.format(len(roots), ', '.join(roots)))
+
+    for link, material, file in index.material_refs:
+        if material not in index.materials:
+            problems.append('{}: material {} of link {} is not defined'.format(file, material, link))
+    for transmission, joint, file in index.transmissions:
+        if joint not in index.joints:
+            problems.append('{}: joint {} of transmission {} is not defined'.format(file, joint, transmission))
+    for reference, file in index.references:
+        if reference not in index.links and reference not in index.joints:
+            problems.append('{}: gazebo reference {} is neither a link nor a joint'.format(file, reference))
+
+    meshes = {}
+    prefix = 'package://' + package_name + '/'
+    for link, filename, file in index.meshes:
+        if not filename.startswith(prefix):
+            problems.append('{}: mesh {} of link {} is not in package {}'.format(file, filename, link, package_name))
+            continue
+        meshes.setdefault(save_dir + '/' + filename[len(prefix):], (link, filename, file))
+    with ThreadPoolExecutor(max_workers) as executor:
+        results = executor.map(_check_mesh, list(meshes))
+        for path, result in zip(list(meshes), results):
+            if result:
+                link, filename, file = meshes[path]
+                problems.append('{}: mesh {} of link {} {}'.format(file, filename, link, result))
+    return problems
@@ -0,0 +1,350 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 2026
+
+@author: JatinPatil2003
+
+Keep an exported package up to date while the design is edited. Every
+change notifies the Watcher. Once no change came in for `delay` seconds
+the design is compared with the fingerprints of the last update, and only
+the links which changed are extracted and exported again before the
+package is rendered from the updated model.
+"""
+
+import json, os, time, traceback
+from . import Joint, Link, Pipeline, Render, Model, Kinematics
+from ..utils import utils, mesh
+
+# id of the custom event which polls the watcher on the main thread
+POLL_EVENT = 'fusion2urdf_watch_poll'
+
+
+def fingerprint(root, names):
+    """
+    cheap summary of every top level occurrence, it changes when the
+    occurrence is moved, its geometry, appearance or material is changed
+    or it is hidden. The volume and area of the bodies and the mass tell
+    edits apart which keep the bounding box, e.g. a pocket or a fillet.
+
+    Returns
+    ----------
+    {link: tuple}
+    """
+    import adsk.fusion
+    fingerprints = {}
+    for occ in root.occurrences:
+        box = occ.boundingBox
+        material = occ.component.material
+        mass = occ.getPhysicalProperties(adsk.fusion.CalculationAccuracy.LowCalculationAccuracy).mass
+        fingerprints[names.name(occ)] = (
+            occ.component.name, occ.isLightBulbOn, len(occ.bRepBodies), len(occ.childOccurrences),
+            tuple(occ.transform.asArray()), tuple(box.minPoint.asArray()), tuple(box.maxPoint.asArray()),
+            tuple((round(body.volume, 6), round(body.area, 6)) for body in occ.bRepBodies), round(mass, 9),
+            occ.appearance.id if occ.appearance else None, material.id if material else None)
+    return fingerprints
+
+
+class Watcher:
+
+    def __init__(self, app, names, joints_dict, inertial_dict, materials, package_name, robot_name, save_dirs,
+                 make_model, options=None, color_step=0, delay=1.0, clock=time.monotonic):
+        """
+        Parameters
+        ----------
+        app: adsk.core.Application
+        names: Names.NameRegistry
+        joints_dict, inertial_dict, materials:
+            the model extracted by the last export, see run
+        package_name: str
+        robot_name: str
+        save_dirs: {ros version: directory of the package}
+        make_model: callable
+            (joints_dict, inertial_dict, materials) -> model, see Render.add_stages
+        options: dict
+            passed on to Render.add_stages
+        color_step: float
+            see Link.make_material_dict
+        delay: float
+            seconds without a change before the package is updated
+        clock: callable
+            time in seconds, replaced by ReplayEventSource
+
+        Attributes
+        ----------
+        changes: [{links, removed, joints, exported, events, latency, duration}]
+            one entry per update. latency is the time from the first event
+            to the updated package, duration the part spent updating it,
+            both measured with clock.
+        """
+        self.app = app
+        self.root = app.activeProduct.rootComponent
+        self.names = names
+        self.joints_dict = joints_dict
+        self.inertial_dict = dict(inertial_dict)
+        self.material_dict = dict(materials[0])
+        self.color_dict = dict(materials[1])
+        self.package_name = package_name
+        self.robot_name = robot_name
+        self.save_dirs = save_dirs
+        self.save_dir = save_dirs[list(save_dirs)[0]]
+        self.make_model = make_model
+        self.options = options or {}
+        self.color_step = color_step
+        self.delay = delay
+        self.clock = clock
+        self.merged = make_model(joints_dict, inertial_dict, materials)[3]
+        self.fingerprints = fingerprint(self.root, names)
+        self.events = []
+        self.first_event = None
+        self.last_event = None
+        self.changes = []
+
+    def notify(self, event=None):
+        """
+        record a change of the design, called by the event source
+        """
+        now = self.clock()
+        if self.first_event is None:
+            self.first_event = now
+        self.last_event = now
+        self.events.append(event)
+
+    def poll(self):
+        """
+        update the package if the last change is older than delay, called
+        regularly on the main thread
+
+        Returns
+        ----------
+        the entry of changes or None
+        """
+        if self.last_event is None or self.clock() - self.last_event < self.delay:
+            return None
+        waited = self.clock() - self.first_event
+        events = self.events
+        self.first_event = self.last_event = None
+        self.events = []
+        start = self.clock()
+        change = self.update()
+        if change is not None:
+            change['events'] = events
+            change['duration'] = self.clock() - start
+            change['latency'] = waited + change['duration']
+            self.changes.append(change)
+            print('watch: updated {} links, {} joints in {:.3f} s ({:.3f} s after the first change)'.format(
+                len(change['links']) + len(change['removed']), len(change['joints']),
+                change['duration'], change['latency']))
+        return change
+
+    def update(self):
+        """
+        extract and export the links which changed since the last update
+        and render the package again
+
+        Returns
+        ----------
+        {links, removed, joints, exported} or None if nothing changed,
+        exported are the links whose meshes were exported again
+        """
+        fingerprints = fingerprint(self.root, self.names)
+        links = sorted(link for link in fingerprints if fingerprints[link] != self.fingerprints.get(link))
+        removed = sorted(link for link in self.fingerprints if link not in fingerprints)
+        joints_dict, msg = Joint.make_joints_dict(self.root, 'ok', self.names)
+        if msg != 'ok':
+            print('watch: ' + msg)
+            return None
+        joints = sorted(joint for joint in set(joints_dict) | set(self.joints_dict)
+                        if joints_dict.get(joint) != self.joints_dict.get(joint))
+        self.fingerprints = fingerprints
+        if not links and not removed and not joints:
+            return None
+
+        appearances = {}
+        for occ in self.root.occurrences:
+            link = self.names.name(occ)
+            if link in links:
+                self.inertial_dict[link] = Link.occurrence_inertial(occ, self.names)
+                self.material_dict[link], color = Link.occurrence_material(occ, appearances)
+                if color:
+                    self.color_dict[color[0]] = color[1]
+        for link in removed:
+            self.inertial_dict.pop(link, None)
+            self.material_dict.pop(link, None)
+            for save_dir in self.save_dirs.values():
+                try: os.remove(save_dir + '/meshes/' + link + '.stl')
+                except: pass
+        if self.color_step:
+            self.color_dict = Link.merge_colors(self.material_dict, self.color_dict, self.color_step)
+
+        # a link is exported again if it changed or its joint did (the frame
+        # of a local mesh moves with the joint). The meshes of merged links
+        # are concatenated, so every group which contains such a link or
+        # which is merged differently now is exported again as a whole.
+        merged = self.make_model(joints_dict, self.inertial_dict, (self.material_dict, self.color_dict))[3]
+        exported = set(links)
+        for joint in joints:
+            for joint_dict in (joints_dict.get(joint), self.joints_dict.get(joint)):
+                if joint_dict:
+                    exported.add(joint_dict['child'])
+        for target in set(self.merged) | set(merged):
+            if sorted(self.merged.get(target, [])) != sorted(merged.get(target, [])):
+                exported.update([target] + self.merged.get(target, []) + merged.get(target, []))
+        groups = [set([target] + group) for target, group in list(self.merged.items()) + list(merged.items())]
+        grown = True
+        while grown:
+            grown = False
+            for group in groups:
+                if exported & group and not group <= exported:
+                    exported |= group
+                    grown = True
+        exported &= set(fingerprints)
+        self.joints_dict = joints_dict
+
+        save_dir = self.save_dir
+        local_meshes = self.options.get('local_meshes', False)
+
+        def update_meshes(model):
+            mesh.merge_meshes(save_dir + '/meshes', model[3])
+            if local_meshes:
+                mesh.localize_meshes(save_dir + '/meshes', Kinematics.link_origins(model[0]))
+
+        pipeline = Pipeline.Pipeline()
+        pipeline.add('model', lambda: self.make_model(self.joints_dict, self.inertial_dict,
+                                                      (self.material_dict, self.color_dict)))
+        pipeline.add('stl', lambda: utils.export_stl(self.app, save_dir, self.names, exported), main_thread=True)
+        pipeline.add('meshes', lambda model, _: update_meshes(model), ['model', 'stl'])
+        Render.add_stages(pipeline, self.package_name, self.robot_name, self.save_dirs, **self.options)
+        pipeline.run()
+        for problems in Render.problems(pipeline).values():
+            for problem in problems:
+                print('watch: ' + problem)
+
+        model = pipeline.results['model']
+        self.merged = model[3]
+        folded = set(link for group in self.merged.values() for link in group)
+        meshes = {link: save_dir + '/meshes/' + link + '.stl' for link in self.inertial_dict
+                  if link not in folded and os.path.exists(save_dir + '/meshes/' + link + '.stl')}
+        Model.save_model(save_dir + '/' + self.robot_name + '.model.json', self.robot_name, self.package_name,
+                         model, self.names, meshes, local_meshes)
+        return {'links': links, 'removed': removed, 'joints': joints, 'exported': sorted(exported)}
+
+
+class FusionEventSource:
+
+    def __init__(self, app, watcher, interval=0.25, record=None):
+        """
+        Notify the watcher after every command which ran in Fusion and poll
+        it on the main thread every interval seconds.
+
+        Parameters
+        ----------
+        app: adsk.core.Application
+        watcher: Watcher
+        interval: float
+            seconds between two polls
+        record: str
+            file to append the events to, for ReplayEventSource.load
+        """
+        self.app = app
+        self.watcher = watcher
+        self.interval = interval
+        self.record = record
+        self.handlers = []
+        self.started = None
+
+    def start(self):
+        import adsk.core, threading
+        source = self
+
+        class CommandTerminatedHandler(adsk.core.ApplicationCommandEventHandler):
+            def notify(self, args):
+                # view and selection commands end up here as well, the
+                # fingerprints tell whether the design really changed
+                source.watcher.notify(args.commandId)
+                if source.record:
+                    with open(source.record, mode='a') as f:
+                        f.write(json.dumps({'t': time.monotonic() - source.started, 'event': args.commandId}) + '\n')
+
+        class PollHandler(adsk.core.CustomEventHandler):
+            def notify(self, args):
+                # an exception would end the handler silently
+                try:
+                    source.watcher.poll()
+                except:
+                    source.app.userInterface.messageBox('Failed:\n{}'.format(traceback.format_exc()))
+
+        self.started = time.monotonic()
+        self.handlers = [CommandTerminatedHandler(), PollHandler()]
+        self.app.userInterface.commandTerminated.add(self.handlers[0])
+        self.app.registerCustomEvent(POLL_EVENT).add(self.handlers[1])
+        self.stopped = threading.Event()
+
+        def tick():
+            # the Fusion API may only be used on the main thread, so the
+            # timer only fires an event which is handled there
+            while not self.stopped.wait(self.interval):
+                self.app.fireCustomEvent(POLL_EVENT)
+        threading.Thread(target=tick, daemon=True).start()
+
+    def stop(self):
+        if not self.handlers:
+            return
+        self.stopped.set()
+        self.app.userInterface.commandTerminated.remove(self.handlers[0])
+        self.app.unregisterCustomEvent(POLL_EVENT)
+        self.handlers = []
+
+
+class ReplayEventSource:
+
+    def __init__(self, watcher, stream, apply=None, step=0.05):
+        """
+        Replay a recorded change stream with a virtual clock, so the
+        debouncing behaves the same on every run.
+
+        Parameters
+        ----------
+        watcher: Watcher
+            its clock is replaced by the virtual one
+        stream: [(seconds, event)]
+        apply: callable
+            apply(event) makes the change in the design before the watcher
+            is notified, e.g. to edit a stand-in design
+        step: float
+            seconds between two polls
+        """
+        self.watcher = watcher
+        self.stream = sorted(stream, key=lambda _: _[0])
+        self.apply = apply
+        self.step = step
+        self.now = 0.0
+        watcher.clock = lambda: self.now
+
+    @staticmethod
+    def load(file_name):
+        """
+        read a stream recorded by FusionEventSource
+        """
+        with open(file_name) as f:
+            events = [json.loads(line) for line in f if line.strip()]
+        return [(_['t'], _['event']) for _ in events]
+
+    def advance(self, until):
+        while self.now + self.step <= until:
+            self.now += self.step
+            self.watcher.poll()
+        self.now = until
+
+    def run(self):
+        """
+        Returns
+        ----------
+        watcher.changes
+        """
+        for t, event in self.stream:
+            self.advance(t)
+            if self.apply:
+                self.apply(event)
+            self.watcher.notify(event)
+        self.advance(self.now + self.watcher.delay + self.step)
+        return self.watcher.changes
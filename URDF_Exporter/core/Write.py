@@ -7,12 +7,13 @@ Modified on Sun Jan 17 2021
 @author: spacemaster85
 """
 
-import adsk, os, re
+import os
 from xml.etree.ElementTree import Element, SubElement
-from . import Link, Joint
-from ..utils import utils
+from . import Link, Joint, Tree, Macro, Pipeline, Physics
+from ..utils import utils, xacro
 
-def write_link_urdf(joints_dict, repo, links_xyz_dict, file_name, inertial_dict, material_dict):
+def write_link_urdf(joints_dict, repo, links_xyz_dict, file_name, inertial_dict, material_dict, canonical=False, tree=None,
+                    instances=None, local_meshes=False):
     """
     Write links information into urdf "repo/file_name"
     
@@ -31,11 +32,23 @@ def write_link_urdf(joints_dict, repo, links_xyz_dict, file_name, inertial_dict,
         information of the each inertial
     material_dict:
         information of the each inertial    
+    canonical: bool
+        write in a stable order with fixed precision
+    tree: Tree.KinematicTree
+        index of joints_dict, built here if not given
+    instances: dict
+        repeated subtrees from Macro.find_instances, written as macro calls
+    local_meshes: bool
+        the meshes are in their link frames and in m, see mesh.localize_meshes
     Note
     ----------
     In this function, links_xyz_dict is set for write_joint_tran_urdf.
     The origin of the coordinate of center_of_mass is the coordinate of the link
+    Links are written from base_link to the leaves.
     """
+    tree = tree or Tree.KinematicTree(joints_dict)
+    instances = instances or {}
+    covered = set(link for instance in instances.values() for link in instance['links'])
     
     
     
@@ -46,43 +59,42 @@ def write_link_urdf(joints_dict, repo, links_xyz_dict, file_name, inertial_dict,
             center_of_mass=center_of_mass, repo=repo,
             mass=inertial_dict['base_link']['mass'],
             inertia_tensor=inertial_dict['base_link']['inertia'],
-            material = material_dict['base_link']['material'])
+            material = material_dict['base_link']['material'],
+            canonical=canonical, local_mesh=local_meshes)
         links_xyz_dict[link.name] = link.xyz
         link.make_link_xml()
         f.write(link.link_xml)
         f.write('\n')
 
         # others
-        for joint in joints_dict:
-            num_child = 0
-            for joint_search in joints_dict:
-                if joints_dict[joint]['child'] == joints_dict[joint_search]['child']:
-                    num_child += 1
-
-            if num_child > 1:
-                app = adsk.core.Application.get()
-                ui = app.userInterface
-                ui.messageBox("Component %s with more than one child connection.\
+        for joint in tree.joints(canonical):
+            if joints_dict[joint]['child'] in tree.multiple_parents:
+                raise Pipeline.ExportError("Component %s with more than one child connection.\
                      \nThis mostly happens when you connect several subcomponents to different parents.\
                       \nBe aware to threat nested componets as a singel component!"
-                % (joints_dict[joint]['child']), "Error!")
-                quit()
+                % (joints_dict[joint]['child']))
+            elif joints_dict[joint]['child'] in covered:
+                name = joints_dict[joint]['child']
+                links_xyz_dict[name] = [-_ for _ in joints_dict[joint]['xyz']]
+                if name in instances:
+                    f.write(Macro.make_call_xml(instances[name], joints_dict, canonical, tree))
             else: 
-                name = re.sub('[ :()]', '_', joints_dict[joint]['child'])
+                name = joints_dict[joint]['child']
                 center_of_mass = \
                     [ i-j for i, j in zip(inertial_dict[name]['center_of_mass'], joints_dict[joint]['xyz'])]
                 link = Link.Link(name=name, xyz=joints_dict[joint]['xyz'],\
                     center_of_mass=center_of_mass,\
                     repo=repo, mass=inertial_dict[name]['mass'],\
                     inertia_tensor=inertial_dict[name]['inertia'],
-                    material = material_dict[name]['material'])
+                    material = material_dict[name]['material'],
+                    canonical=canonical, local_mesh=local_meshes)
                 links_xyz_dict[link.name] = link.xyz            
                 link.make_link_xml()
                 f.write(link.link_xml)
                 f.write('\n')
 
 
-def write_joint_urdf(joints_dict, repo, links_xyz_dict, file_name):
+def write_joint_urdf(joints_dict, repo, links_xyz_dict, file_name, canonical=False, tree=None, instances=None):
     """
     Write joints and transmission information into urdf "repo/file_name"
     
@@ -97,10 +109,21 @@ def write_joint_urdf(joints_dict, repo, links_xyz_dict, file_name):
         xyz information of the each link
     file_name: str
         urdf full path
+    canonical: bool
+        write in a stable order with fixed precision
+    tree: Tree.KinematicTree
+        index of joints_dict, built here if not given
+    instances: dict
+        repeated subtrees from Macro.find_instances, their joints are
+        written by the macros
     """
+    tree = tree or Tree.KinematicTree(joints_dict)
+    covered = set(joint for instance in (instances or {}).values() for joint in instance['joints'])
     
     with open(file_name, mode='a') as f:
-        for j in joints_dict:
+        for j in tree.joints(canonical):
+            if j in covered:
+                continue
             parent = joints_dict[j]['parent']
             child = joints_dict[j]['child']
             joint_type = joints_dict[j]['type']
@@ -110,17 +133,14 @@ def write_joint_urdf(joints_dict, repo, links_xyz_dict, file_name):
                 xyz = [round(p-c, 6) for p, c in \
                     zip(links_xyz_dict[parent], links_xyz_dict[child])]  # xyz = parent - child
             except KeyError as ke:
-                app = adsk.core.Application.get()
-                ui = app.userInterface
-                ui.messageBox("There seems to be an error with the connection between\n\n%s\nand\n%s\n\nCheck \
+                raise Pipeline.ExportError("There seems to be an error with the connection between\n\n%s\nand\n%s\n\nCheck \
 whether the connections\nparent=component2=%s\nchild=component1=%s\nare correct or if you need \
 to swap component1<=>component2"
-                % (parent, child, parent, child), "Error!")
-                quit()
+                % (parent, child, parent, child))
                 
             joint = Joint.Joint(name=j, joint_type = joint_type, xyz=xyz, \
             axis=joints_dict[j]['axis'], parent=parent, child=child, \
-            upper_limit=upper_limit, lower_limit=lower_limit)
+            upper_limit=upper_limit, lower_limit=lower_limit, canonical=canonical)
             joint.make_joint_xml()
             joint.make_transmission_xml()
             f.write(joint.joint_xml)
@@ -140,7 +160,8 @@ def write_gazebo_endtag(file_name):
         f.write('</robot>\n')
         
 
-def write_urdf(joints_dict, links_xyz_dict, inertial_dict, material_dict, package_name, robot_name, save_dir, gazebo):
+def write_urdf(joints_dict, links_xyz_dict, inertial_dict, material_dict, package_name, robot_name, save_dir, gazebo, canonical=False,
+               tree=None, macros=False, local_meshes=False):
     try: os.mkdir(save_dir + '/urdf')
     except: pass 
 
@@ -159,11 +180,78 @@ def write_urdf(joints_dict, links_xyz_dict, inertial_dict, material_dict, packag
             f.write('<xacro:include filename="$(find {})/urdf/{}.gazebo" />'.format(package_name, robot_name))
             f.write('\n')
 
-    write_link_urdf(joints_dict, repo, links_xyz_dict, file_name, inertial_dict, material_dict)
-    write_joint_urdf(joints_dict, repo, links_xyz_dict, file_name)
+    tree = tree or Tree.KinematicTree(joints_dict)
+    instances = {}
+    if macros:
+        # one xacro:macro per repeated subtree instead of a copy per instance
+        instances = Macro.find_instances(joints_dict, inertial_dict, material_dict, tree)
+        written = []
+        with open(file_name, mode='a') as f:
+            for instance in instances.values():
+                if instance['macro'] not in written:
+                    written.append(instance['macro'])
+                    f.write('\n')
+                    f.write(Macro.make_macro_xml(instance['macro'], joints_dict, inertial_dict, material_dict, repo,
+                                                 canonical, tree, local_meshes))
+            f.write('\n')
+    write_link_urdf(joints_dict, repo, links_xyz_dict, file_name, inertial_dict, material_dict, canonical, tree, instances,
+                    local_meshes)
+    write_joint_urdf(joints_dict, repo, links_xyz_dict, file_name, canonical, tree, instances)
     write_gazebo_endtag(file_name)
 
-def write_materials_xacro(color_dict, robot_name, save_dir):
+def retarget_urdf(package_name, robot_name, src_dir, save_dir, gazebo):
+    """
+    Write "save_dir/urdf/robot_name.xacro" for another target from the one
+    write_urdf wrote into src_dir. Only the include of the gazebo xacro
+    differs, so the links and joints are not rendered again.
+
+
+    Parameters
+    ----------
+    package_name: str
+    robot_name: str
+    src_dir: str
+        package written by write_urdf
+    save_dir: str
+        path of the repository to save
+    gazebo: bool
+        include the gazebo xacro
+    """
+    try: os.mkdir(save_dir + '/urdf')
+    except: pass
+
+    include = '<xacro:include filename="$(find {})/urdf/{}.gazebo" />\n'.format(package_name, robot_name)
+    trans = '<xacro:include filename="$(find {})/urdf/{}.trans" />\n'.format(package_name, robot_name)
+    with open(src_dir + '/urdf/' + robot_name.lower() + '.xacro') as f:
+        lines = [line for line in f if line != include]
+    if gazebo:
+        lines.insert(lines.index(trans) + 1, include)
+    with open(save_dir + '/urdf/' + robot_name.lower() + '.xacro', mode='w') as f:
+        f.writelines(lines)
+
+def write_flat_urdf(package_name, robot_name, save_dir):
+    """
+    Expand "save_dir/urdf/robot_name.xacro" with all its includes into
+    "save_dir/urdf/robot_name.urdf", so that launch files can load the
+    robot description without running xacro.
+
+
+    Parameters
+    ----------
+    package_name: str
+        name of the package, $(find package_name) resolves to save_dir
+    robot_name: str
+        name of the robot
+    save_dir: str
+        path of the repository to save
+    """
+    robot = xacro.expand(save_dir + '/urdf/' + robot_name + '.xacro', {package_name: save_dir})
+
+    file_name = save_dir + '/urdf/' + robot_name + '.urdf'
+    with open(file_name, mode='w') as f:
+        f.write(utils.prettify(robot))
+
+def write_materials_xacro(color_dict, robot_name, save_dir, canonical=False):
     try: os.mkdir(save_dir + '/urdf')
     except: pass  
 
@@ -172,14 +260,17 @@ def write_materials_xacro(color_dict, robot_name, save_dir):
         f.write('<?xml version="1.0" ?>\n')
         f.write('<robot name="{}" xmlns:xacro="http://www.ros.org/wiki/xacro" >\n'.format(robot_name))
         f.write('\n')
-        for color in color_dict:
+        for color in (sorted(color_dict) if canonical else color_dict):
+            rgba = color_dict[color]
+            if canonical:
+                rgba = utils.format_vector([float(_) for _ in rgba.split()], canonical)
             f.write(f'<material name="{color}">\n')
-            f.write(f'  <color rgba="{color_dict[color]}"/>\n')
+            f.write(f'  <color rgba="{rgba}"/>\n')
             f.write('</material>\n')
         f.write('\n')
         f.write('</robot>\n')
 
-def write_transmissions_xacro(joints_dict, links_xyz_dict, robot_name, save_dir):
+def write_transmissions_xacro(joints_dict, links_xyz_dict, robot_name, save_dir, canonical=False, tree=None):
     """
     Write joints and transmission information into urdf "repo/file_name"
     
@@ -194,7 +285,12 @@ def write_transmissions_xacro(joints_dict, links_xyz_dict, robot_name, save_dir)
         xyz information of the each link
     file_name: str
         urdf full path
+    canonical: bool
+        write in a stable order
+    tree: Tree.KinematicTree
+        index of joints_dict, built here if not given
     """
+    tree = tree or Tree.KinematicTree(joints_dict)
     
     file_name = save_dir + '/urdf/{}.trans'.format(robot_name)  # the name of urdf file
     with open(file_name, mode='w') as f:
@@ -202,7 +298,7 @@ def write_transmissions_xacro(joints_dict, links_xyz_dict, robot_name, save_dir)
         f.write('<robot name="{}" xmlns:xacro="http://www.ros.org/wiki/xacro" >\n'.format(robot_name))
         f.write('\n')
 
-        for j in joints_dict:
+        for j in tree.joints(canonical):
             parent = joints_dict[j]['parent']
             child = joints_dict[j]['child']
             joint_type = joints_dict[j]['type']
@@ -211,15 +307,11 @@ def write_transmissions_xacro(joints_dict, links_xyz_dict, robot_name, save_dir)
             try:
                 xyz = [round(p-c, 6) for p, c in \
                     zip(links_xyz_dict[parent], links_xyz_dict[child])]  # xyz = parent - child
-                print(f"xyz: {xyz}")    
             except KeyError as ke:
-                app = adsk.core.Application.get()
-                ui = app.userInterface
-                ui.messageBox("There seems to be an error with the connection between\n\n%s\nand\n%s\n\nCheck \
+                raise Pipeline.ExportError("There seems to be an error with the connection between\n\n%s\nand\n%s\n\nCheck \
 whether the connections\nparent=component2=%s\nchild=component1=%s\nare correct or if you need \
 to swap component1<=>component2"
-                % (parent, child, parent, child), "Error!")
-                quit()
+                % (parent, child, parent, child))
                 
             joint = Joint.Joint(name=j, joint_type = joint_type, xyz=xyz, \
             axis=joints_dict[j]['axis'], parent=parent, child=child, \
@@ -231,13 +323,38 @@ to swap component1<=>component2"
 
         f.write('</robot>\n')
 
-def write_gazebo_xacro(joints_dict, links_xyz_dict, inertial_dict, package_name, robot_name, save_dir):
+def write_gazebo_xacro(joints_dict, links_xyz_dict, inertial_dict, package_name, robot_name, save_dir, canonical=False, tree=None,
+                       profile=None, self_collide=None):
+    """
+    write the gazebo settings "save_dir/urdf/robot_name.gazebo"
+
+
+    Parameter
+    ---------
+    profile: str
+        key of Physics.PROFILES. If None, every link has selfCollide and
+        the controllers run at the update rate of the world.
+    self_collide: set
+        links with selfCollide if profile is set, see Physics.self_collide_links
+    """
+    tree = tree or Tree.KinematicTree(joints_dict)
+    if profile is not None:
+        settings = Physics.PROFILES[profile]
+        self_collide = self_collide or set()
     try: os.mkdir(save_dir + '/urdf')
     except: pass  
 
     file_name = save_dir + '/urdf/' + robot_name + '.gazebo'  # the name of urdf file
     repo = robot_name + '/meshes/'  # the repository of binary stl files
     #repo = package_name + '/' + robot_name + '/bin_stl/'  # the repository of binary stl files
+
+    def write_contact_settings(f, link):
+        if profile is None:
+            f.write('  <selfCollide>true</selfCollide>\n')
+            return
+        f.write('  <selfCollide>{}</selfCollide>\n'.format(str(link in self_collide).lower()))
+        f.write('  <maxContacts>{}</maxContacts>\n'.format(settings['max_contacts']))
+
     with open(file_name, mode='w') as f:
         f.write('<?xml version="1.0" ?>\n')
         f.write('<robot name="{}" xmlns:xacro="http://www.ros.org/wiki/xacro" >\n'.format(robot_name))
@@ -248,6 +365,9 @@ def write_gazebo_xacro(joints_dict, links_xyz_dict, inertial_dict, package_name,
         gazebo = Element('gazebo')
         plugin = SubElement(gazebo, 'plugin')
         plugin.attrib = {'name':'control', 'filename':'libgazebo_ros_control.so'}
+        if profile is not None:
+            # controllers update at every physics step
+            SubElement(plugin, 'controlPeriod').text = utils.format_number(settings['max_step_size'])
         gazebo_xml = "\n".join(utils.prettify(gazebo).split("\n")[1:])
         f.write(gazebo_xml)
 
@@ -256,27 +376,55 @@ def write_gazebo_xacro(joints_dict, links_xyz_dict, inertial_dict, package_name,
         f.write('  <material>${body_color}</material>\n')
         f.write('  <mu1>0.2</mu1>\n')
         f.write('  <mu2>0.2</mu2>\n')
-        f.write('  <selfCollide>true</selfCollide>\n')
+        write_contact_settings(f, 'base_link')
         f.write('  <gravity>true</gravity>\n')
         f.write('</gazebo>\n')
         f.write('\n')
 
         # others
-        for joint in joints_dict:
+        for joint in tree.joints(canonical):
             name = joints_dict[joint]['child']
             f.write('<gazebo reference="{}">\n'.format(name))
             f.write('  <material>${body_color}</material>\n')
             f.write('  <mu1>0.2</mu1>\n')
             f.write('  <mu2>0.2</mu2>\n')
-            f.write('  <selfCollide>true</selfCollide>\n')
+            write_contact_settings(f, name)
             f.write('</gazebo>\n')
             f.write('\n')
 
         f.write('</robot>\n')
 
+def write_srdf(robot_name, save_dir, disabled_collisions):
+    """
+    write the self collision matrix for MoveIt into "save_dir/urdf/robot_name.srdf"
+
+
+    Parameter
+    ---------
+    robot_name: str
+        name of the robot
+    save_dir: str
+        path of the repository to save
+    disabled_collisions: [(link1, link2, reason)]
+        see Collision.disable_collisions
+    """
+    try: os.mkdir(save_dir + '/urdf')
+    except: pass
+
+    robot = Element('robot')
+    robot.attrib = {'name':robot_name}
+    for link1, link2, reason in disabled_collisions:
+        disable = SubElement(robot, 'disable_collisions')
+        disable.attrib = {'link1':link1, 'link2':link2, 'reason':reason}
+
+    file_name = save_dir + '/urdf/' + robot_name + '.srdf'
+    with open(file_name, mode='w') as f:
+        f.write(utils.prettify(robot))
+
 def write_display_launch(package_name, robot_name, save_dir):
     """
     write display launch file "save_dir/launch/display.launch"
+    The robot description is loaded from the urdf of write_flat_urdf.
 
 
     Parameter
@@ -292,7 +440,7 @@ def write_display_launch(package_name, robot_name, save_dir):
     launch = Element('launch')     
 
     arg1 = SubElement(launch, 'arg')
-    arg1.attrib = {'name':'model', 'default':'$(find {})/urdf/{}.xacro'.format(package_name, robot_name)}
+    arg1.attrib = {'name':'model', 'default':'$(find {})/urdf/{}.urdf'.format(package_name, robot_name)}
 
     arg2 = SubElement(launch, 'arg')
     arg2.attrib = {'name':'gui', 'default':'true'}
@@ -301,7 +449,7 @@ def write_display_launch(package_name, robot_name, save_dir):
     arg3.attrib = {'name':'rvizconfig', 'default':'$(find {})/launch/urdf.rviz'.format(package_name)}
 
     param1 = SubElement(launch, 'param')
-    param1.attrib = {'name':'robot_description', 'command':'$(find xacro)/xacro $(arg model)'}
+    param1.attrib = {'name':'robot_description', 'textfile':'$(arg model)'}
 
     param2 = SubElement(launch, 'param')
     param2.attrib = {'name':'use_gui', 'value':'$(arg gui)'}
@@ -321,9 +469,10 @@ def write_display_launch(package_name, robot_name, save_dir):
     with open(file_name, mode='w') as f:
         f.write(launch_xml)
 
-def write_gazebo_launch(package_name, robot_name, save_dir):
+def write_gazebo_launch(package_name, robot_name, save_dir, world=False):
     """
     write gazebo launch file "save_dir/launch/gazebo.launch"
+    The robot description is loaded from the urdf of write_flat_urdf.
     
     
     Parameter
@@ -332,6 +481,8 @@ def write_gazebo_launch(package_name, robot_name, save_dir):
         name of the robot
     save_dir: str
         path of the repository to save
+    world: bool
+        start the world of Physics.write_world instead of the empty world
     """
     
     try: os.mkdir(save_dir + '/launch')
@@ -339,7 +490,7 @@ def write_gazebo_launch(package_name, robot_name, save_dir):
     
     launch = Element('launch')
     param = SubElement(launch, 'param')
-    param.attrib = {'name':'robot_description', 'command':'$(find xacro)/xacro $(find {})/urdf/{}.xacro'.format(package_name, robot_name)}
+    param.attrib = {'name':'robot_description', 'textfile':'$(find {})/urdf/{}.urdf'.format(package_name, robot_name)}
 
     node = SubElement(launch, 'node')
     node.attrib = {'name':'spawn_urdf', 'pkg':'gazebo_ros', 'type':'spawn_model',\
@@ -358,7 +509,9 @@ def write_gazebo_launch(package_name, robot_name, save_dir):
         arg = SubElement(include_, 'arg')
         arg.attrib = {'name' : args_name_value_pairs[i][0] , 
         'value' : args_name_value_pairs[i][1]}
-
+    if world:
+        arg = SubElement(include_, 'arg')
+        arg.attrib = {'name':'world_name', 'value':'$(find {})/worlds/{}.world'.format(package_name, robot_name)}
 
     
     launch_xml = "\n".join(utils.prettify(launch).split("\n")[1:])        
@@ -368,7 +521,7 @@ def write_gazebo_launch(package_name, robot_name, save_dir):
         f.write(launch_xml)
 
 
-def write_control_launch(package_name, robot_name, save_dir, joints_dict):
+def write_control_launch(package_name, robot_name, save_dir, joints_dict, canonical=False, tree=None):
     """
     write control launch file "save_dir/launch/controller.launch"
     
@@ -381,7 +534,12 @@ def write_control_launch(package_name, robot_name, save_dir, joints_dict):
         path of the repository to save
     joints_dict: dict
         information of the joints
+    canonical: bool
+        write in a stable order
+    tree: Tree.KinematicTree
+        index of joints_dict, built here if not given
     """
+    tree = tree or Tree.KinematicTree(joints_dict)
     
     try: os.mkdir(save_dir + '/launch')
     except: pass     
@@ -394,7 +552,7 @@ def write_control_launch(package_name, robot_name, save_dir, joints_dict):
     #                   'command':'load'}
                        
     controller_args_str = ""
-    for j in joints_dict:
+    for j in tree.joints(canonical):
         joint_type = joints_dict[j]['type']
         if joint_type != 'fixed':
             controller_args_str += j + '_position_controller '
@@ -428,7 +586,7 @@ def write_control_launch(package_name, robot_name, save_dir, joints_dict):
         f.write('</launch>')
         
 
-def write_yaml(package_name, robot_name, save_dir, joints_dict):
+def write_yaml(package_name, robot_name, save_dir, joints_dict, canonical=False, tree=None):
     """
     write yaml file "save_dir/launch/controller.yaml"
     
@@ -441,7 +599,12 @@ def write_yaml(package_name, robot_name, save_dir, joints_dict):
         path of the repository to save
     joints_dict: dict
         information of the joints
+    canonical: bool
+        write in a stable order
+    tree: Tree.KinematicTree
+        index of joints_dict, built here if not given
     """
+    tree = tree or Tree.KinematicTree(joints_dict)
     try: os.mkdir(save_dir + '/launch')
     except: pass 
 
@@ -456,7 +619,7 @@ def write_yaml(package_name, robot_name, save_dir, joints_dict):
         f.write('    publish_rate: 50\n\n')
         # position_controllers
         f.write('  # Position Controllers --------------------------------------\n')
-        for joint in joints_dict:
+        for joint in tree.joints(canonical):
             joint_type = joints_dict[joint]['type']
             if joint_type != 'fixed':
                 f.write('  ' + joint + '_position_controller:\n')
@@ -465,3 +628,49 @@ def write_yaml(package_name, robot_name, save_dir, joints_dict):
                 f.write('    pid: {p: 100.0, i: 0.01, d: 10.0}\n')
 
 
+def write_ros2_controllers_yaml(robot_name, save_dir, joints_dict, canonical=False, tree=None, update_rate=100):
+    """
+    write the ros2_control controllers "save_dir/config/controllers.yaml":
+    a joint_state_broadcaster and one position controller for all movable
+    joints
+    
+    
+    Parameter
+    ---------
+    robot_name: str
+        name of the robot
+    save_dir: str
+        path of the repository to save
+    joints_dict: dict
+        information of the joints
+    canonical: bool
+        write in a stable order
+    tree: Tree.KinematicTree
+        index of joints_dict, built here if not given
+    update_rate: int
+        rate of the controller manager in Hz
+    """
+    tree = tree or Tree.KinematicTree(joints_dict)
+    try: os.mkdir(save_dir + '/config')
+    except: pass 
+
+    controller_name = robot_name + '_position_controller'
+    joints = [j for j in tree.joints(canonical)
+              if joints_dict[j]['type'] in ('revolute', 'continuous', 'prismatic')]
+    file_name = save_dir + '/config/controllers.yaml'
+    with open(file_name, 'w') as f:
+        f.write('controller_manager:\n')
+        f.write('  ros__parameters:\n')
+        f.write('    update_rate: {}  # Hz\n\n'.format(update_rate))
+        f.write('    joint_state_broadcaster:\n')
+        f.write('      type: joint_state_broadcaster/JointStateBroadcaster\n')
+        if joints:
+            f.write('\n')
+            f.write('    ' + controller_name + ':\n')
+            f.write('      type: position_controllers/JointGroupPositionController\n')
+            f.write('\n')
+            f.write(controller_name + ':\n')
+            f.write('  ros__parameters:\n')
+            f.write('    joints:\n')
+            for joint in joints:
+                f.write('      - ' + joint + '\n')
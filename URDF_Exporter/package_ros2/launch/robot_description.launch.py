@@ -1,28 +1,22 @@
 #!/usr/bin/env python3
 
+import os
+
+from ament_index_python.packages import get_package_share_directory
 from launch import LaunchDescription
-from launch.actions import DeclareLaunchArgument
-from launch.substitutions import Command, FindExecutable, LaunchConfiguration, PathJoinSubstitution
 from launch_ros.actions import Node
-from launch_ros.substitutions import FindPackageShare
 
 def generate_launch_description():
 
-
-    robot_description_content = Command(
-        [
-            PathJoinSubstitution([FindExecutable(name="xacro")]),
-            " ",
-            PathJoinSubstitution(
-                [
-                    FindPackageShare("fusion2urdf_description"),
-                    "urdf",
-                    "fusion2urdf.xacro",
-                ]
-            ),
-
-        ]
+    # The exporter writes a fully expanded urdf next to the xacro, so the
+    # description is read as is instead of running xacro on every launch.
+    urdf_file = os.path.join(
+        get_package_share_directory("fusion2urdf_description"),
+        "urdf",
+        "fusion2urdf.urdf",
     )
+    with open(urdf_file, 'r') as f:
+        robot_description_content = f.read()
     robot_description = {"robot_description": robot_description_content}
 
     return LaunchDescription([
@@ -32,4 +26,4 @@ def generate_launch_description():
             name='robot_state_publisher',
             output='screen',
             parameters=[robot_description]),
-    ])
\ No newline at end of file
+    ])
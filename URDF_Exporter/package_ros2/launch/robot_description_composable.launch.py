@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+
+import os
+
+from ament_index_python.packages import get_package_share_directory
+from launch import LaunchDescription
+from launch.actions import DeclareLaunchArgument
+from launch.conditions import LaunchConfigurationEquals
+from launch_ros.actions import ComposableNodeContainer, Node
+from launch_ros.descriptions import ComposableNode
+
+def generate_launch_description():
+
+    # The exporter writes a fully expanded urdf next to the xacro, so the
+    # description is read as is instead of running xacro on every launch.
+    urdf_file = os.path.join(
+        get_package_share_directory("fusion2urdf_description"),
+        "urdf",
+        "fusion2urdf.urdf",
+    )
+    with open(urdf_file, 'r') as f:
+        robot_description_content = f.read()
+    robot_description = {"robot_description": robot_description_content}
+
+    # robot_state_publisher runs as a component, so the joint states of
+    # other components in this container and the transforms it publishes
+    # are passed within the process instead of being serialized.
+    container = ComposableNodeContainer(
+        name='robot_description_container',
+        namespace='',
+        package='rclcpp_components',
+        executable='component_container',
+        output='screen',
+        composable_node_descriptions=[
+            ComposableNode(
+                package='robot_state_publisher',
+                plugin='robot_state_publisher::RobotStatePublisher',
+                name='robot_state_publisher',
+                parameters=[robot_description],
+                extra_arguments=[{'use_intra_process_comms': True}]),
+        ])
+
+    # joint_state_publisher is a python node and can't be loaded into the
+    # container. Use joint_state_source:=none if the joint states come from
+    # a driver or from ros2_control (see config/controllers.yaml).
+    joint_state_publisher = Node(
+        package='joint_state_publisher',
+        executable='joint_state_publisher',
+        name='joint_state_publisher',
+        output='screen',
+        parameters=[robot_description],
+        condition=LaunchConfigurationEquals('joint_state_source', 'publisher'))
+
+    return LaunchDescription([
+        DeclareLaunchArgument('joint_state_source', default_value='publisher',
+                              description='publisher or none'),
+        container,
+        joint_state_publisher,
+    ])
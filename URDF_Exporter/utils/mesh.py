@@ -0,0 +1,314 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 2026
+
+@author: JatinPatil2003
+"""
+
+import struct
+from . import utils
+
+# header of the meshes which localize_meshes moved into their link frame,
+# followed by the origin of the frame (3 doubles)
+LOCAL_HEADER = b'Fusion2URDF link frame in m'
+
+
+def read_stl(file_name):
+    """
+    read the triangles of a binary or ASCII stl file
+
+
+    Parameters
+    ----------
+    file_name: str
+        stl full path
+
+    Returns
+    ----------
+    triangles: numpy array of shape (N, 3, 3) if numpy is available,
+        otherwise [[(x, y, z), (x, y, z), (x, y, z)]]
+    """
+    np = utils.optional_import('numpy')
+    with open(file_name, 'rb') as f:
+        data = f.read()
+
+    if len(data) >= 84:
+        count = struct.unpack_from('<I', data, 80)[0]
+        if 84 + 50 * count == len(data):  # binary
+            if np is not None:
+                dtype = np.dtype([('normal', '<f4', 3), ('vertices', '<f4', (3, 3)), ('attribute', '<u2')])
+                return np.frombuffer(data, dtype=dtype, count=count, offset=84)['vertices'].astype(float)
+            return [[values[3:6], values[6:9], values[9:12]]
+                    for values in struct.iter_unpack('<12fH', data[84:])]
+
+    vertices = [tuple(float(_) for _ in line.split()[1:4])
+                for line in data.decode('ascii', 'ignore').splitlines() if line.strip().startswith('vertex')]
+    triangles = [vertices[i:i + 3] for i in range(0, len(vertices) - 2, 3)]
+    if np is not None:
+        return np.array(triangles, dtype=float).reshape(-1, 3, 3)
+    return triangles
+
+
+def write_stl(file_name, triangles, header=b'Fusion2URDF'):
+    """
+    write triangles into a binary stl file
+
+
+    Parameters
+    ----------
+    file_name: str
+        stl full path
+    triangles: [[(x, y, z), (x, y, z), (x, y, z)]] or numpy array (N, 3, 3)
+    header: bytes
+        up to 80 bytes
+    """
+    import os
+    # the old file may be a hardlink into a mesh store, don't write through it
+    if os.path.exists(file_name):
+        os.remove(file_name)
+    with open(file_name, 'wb') as f:
+        f.write(header.ljust(80, b' '))
+        f.write(struct.pack('<I', len(triangles)))
+        for a, b, c in triangles:
+            f.write(struct.pack('<12fH', 0.0, 0.0, 0.0, *a, *b, *c, 0))
+
+
+def merge_meshes(mesh_dir, merged):
+    """
+    concatenate the meshes of merged links into the mesh of their target
+    link and remove them. The exported meshes share the world coordinate,
+    so the triangles can be copied as they are.
+
+
+    Parameters
+    ----------
+    mesh_dir: str
+        directory with the "name.stl" files
+    merged: {link: [links merged into it]}
+    """
+    import os
+    np = utils.optional_import('numpy')
+    for link, links in merged.items():
+        file_names = [os.path.join(mesh_dir, _ + '.stl') for _ in [link] + links]
+        file_names = [_ for _ in file_names if os.path.exists(_)]
+        if not file_names:
+            continue
+        triangles = [read_stl(_) for _ in file_names]
+        if np is not None:
+            triangles = np.concatenate(triangles)
+        else:
+            triangles = [t for _ in triangles for t in _]
+        write_stl(os.path.join(mesh_dir, link + '.stl'), triangles)
+        for file_name in file_names:
+            if file_name != os.path.join(mesh_dir, link + '.stl'):
+                os.remove(file_name)
+
+
+def is_local(file_name):
+    """
+    True if the mesh was already moved into its link frame by localize_meshes
+    """
+    with open(file_name, 'rb') as f:
+        return f.read(80).startswith(LOCAL_HEADER)
+
+
+def local_origin(file_name):
+    """
+    Returns
+    ----------
+    the origin [x, y, z] (m) of the link frame the mesh was moved into by
+    localize_meshes, None if it is not local or the origin wasn't recorded
+    """
+    with open(file_name, 'rb') as f:
+        header = f.read(80)
+    if not header.startswith(LOCAL_HEADER) or header[len(LOCAL_HEADER):len(LOCAL_HEADER) + 1] != b':':
+        return None
+    return list(struct.unpack_from('<3d', header, len(LOCAL_HEADER) + 1))
+
+
+def localize_meshes(mesh_dir, origins, scale=0.001):
+    """
+    move the exported meshes from the world coordinate in mm into the frame
+    of their link in m, so the urdf needs neither an offset nor a scale and
+    the vertices stay close to the origin. The origin is recorded in the
+    header: meshes which were already moved are skipped, or moved again if
+    the origin of their link changed since, so it can run again after some
+    meshes were exported anew or joints were moved.
+
+
+    Parameters
+    ----------
+    mesh_dir: str
+        directory with the "name.stl" files
+    origins: {link: [x, y, z]}
+        origin of the link frames in m, see Kinematics.link_origins
+    scale: float
+        factor from the mesh unit to m
+
+    Returns
+    ----------
+    links: [str]
+        the meshes which were moved
+    """
+    import os
+    np = utils.optional_import('numpy')
+    moved = []
+    for link, origin in origins.items():
+        file_name = os.path.join(mesh_dir, link + '.stl')
+        if not os.path.exists(file_name):
+            continue
+        factor, offset = scale, list(origin)
+        if is_local(file_name):
+            old = local_origin(file_name)
+            if old is None or all(abs(o - n) < 1e-9 for o, n in zip(old, origin)):
+                continue
+            factor, offset = 1.0, [n - o for o, n in zip(old, origin)]
+        triangles = read_stl(file_name)
+        if np is not None:
+            triangles = np.asarray(triangles, dtype=float).reshape(-1, 3, 3) * factor - np.asarray(offset, dtype=float)
+        else:
+            triangles = [[[p[i] * factor - offset[i] for i in range(3)] for p in triangle] for triangle in triangles]
+        write_stl(file_name, triangles, LOCAL_HEADER + b':' + struct.pack('<3d', *origin))
+        moved.append(link)
+    return moved
+
+
+def mass_properties(triangles, density=None, mass=None, scale=0.001):
+    """
+    volume, center of mass and inertia tensor of a closed triangle mesh.
+    Every triangle spans a signed tetrahedron with the origin, summing
+    their integrals gives the integrals over the enclosed solid.
+
+
+    Parameters
+    ----------
+    triangles: see read_stl
+    density: float
+        density in kg/m^3
+    mass: float
+        mass in kg (e.g. the one reported by Fusion), used instead of density
+    scale: float
+        factor from the mesh unit to m, the exported stl files are in mm
+
+    Returns
+    ----------
+    {volume, mass, center_of_mass, inertia}
+        volume in m^3, center_of_mass [x, y, z] in m and
+        inertia [xx, yy, zz, xy, yz, xz] about the center of mass in kg m^2
+    """
+    np = utils.optional_import('numpy')
+    if np is not None:
+        tri = np.asarray(triangles, dtype=float).reshape(-1, 3, 3) * scale
+        a, b, c = tri[:, 0], tri[:, 1], tri[:, 2]
+        v = np.einsum('ij,ij->i', a, np.cross(b, c)) / 6.0
+        volume = float(v.sum())
+        s = a + b + c
+        first = (v[:, None] * s).sum(axis=0) / 4.0
+        # integral of x x^T over each tetrahedron (0, a, b, c)
+        second = np.einsum('i,ij,ik->jk', v / 20.0, a, a) + np.einsum('i,ij,ik->jk', v / 20.0, b, b) \
+            + np.einsum('i,ij,ik->jk', v / 20.0, c, c) + np.einsum('i,ij,ik->jk', v / 20.0, s, s)
+        first, second = first.tolist(), second.tolist()
+    else:
+        volume = 0.0
+        first = [0.0] * 3
+        second = [[0.0] * 3 for _ in range(3)]
+        for triangle in triangles:
+            a, b, c = [[_ * scale for _ in p] for p in triangle]
+            v = (a[0] * (b[1]*c[2] - b[2]*c[1]) + a[1] * (b[2]*c[0] - b[0]*c[2])
+                 + a[2] * (b[0]*c[1] - b[1]*c[0])) / 6.0
+            volume += v
+            s = [a[i] + b[i] + c[i] for i in range(3)]
+            for i in range(3):
+                first[i] += v * s[i] / 4.0
+                for j in range(3):
+                    second[i][j] += v / 20.0 * (a[i]*a[j] + b[i]*b[j] + c[i]*c[j] + s[i]*s[j])
+
+    if abs(volume) < 1e-15:
+        raise ValueError('The mesh does not enclose a volume')
+    if mass is not None:
+        density = mass / volume
+    mass = density * volume
+    center_of_mass = [_ / volume for _ in first]
+    xx, yy, zz = [density * second[i][i] for i in range(3)]
+    inertia_origin = [yy + zz, xx + zz, xx + yy,
+                      -density * second[0][1], -density * second[1][2], -density * second[0][2]]
+    return {'volume': volume, 'mass': mass, 'center_of_mass': center_of_mass,
+            'inertia': utils.origin2center_of_mass(inertia_origin, center_of_mass, mass)}
+
+
+def compare_inertial(mesh_inertial, inertial, com_tolerance=1e-3, inertia_tolerance=0.05):
+    """
+    compare the mass properties of a mesh with the ones from Fusion
+
+
+    Parameters
+    ----------
+    mesh_inertial: dict
+        result of mass_properties
+    inertial: dict
+        entry of inertial_dict
+    com_tolerance: float
+        allowed distance between the centers of mass in m
+    inertia_tolerance: float
+        allowed difference of the inertia relative to the largest moment
+
+    Returns
+    ----------
+    differences: [str]
+    """
+    differences = []
+    distance = sum((a - b)**2 for a, b in zip(mesh_inertial['center_of_mass'], inertial['center_of_mass']))**0.5
+    if distance > com_tolerance:
+        differences.append('center of mass differs by {:.6f} m'.format(distance))
+    largest = max(abs(_) for _ in inertial['inertia'][:3]) or 1.0
+    error = max(abs(a - b) for a, b in zip(mesh_inertial['inertia'], inertial['inertia'])) / largest
+    if error > inertia_tolerance:
+        differences.append('inertia differs by {:.1%}'.format(error))
+    return differences
+
+
+def check_inertial_dict(inertial_dict, mesh_dir, com_tolerance=1e-3, inertia_tolerance=0.05, origins=None):
+    """
+    cross-check every entry of inertial_dict with its exported mesh, using
+    the mass reported by Fusion
+
+
+    Parameters
+    ----------
+    inertial_dict: {name:{mass, inertia, center_of_mass}}
+    mesh_dir: str
+        directory with the "name.stl" files
+    com_tolerance, inertia_tolerance: float
+        see compare_inertial
+    origins: {link: [x, y, z]}
+        origin of the link frames, needed for the meshes moved by
+        localize_meshes, see Kinematics.link_origins
+
+    Returns
+    ----------
+    {name: [differences]} for the links which do not match
+    """
+    import os
+    differences = {}
+    for name, inertial in inertial_dict.items():
+        file_name = os.path.join(mesh_dir, name + '.stl')
+        if not os.path.exists(file_name) or inertial['mass'] <= 0:
+            continue
+        local = is_local(file_name)
+        if local and (origins is None or name not in origins):
+            raise ValueError('{} is in the frame of its link, check_inertial_dict needs the origin of {}'.format(
+                file_name, name))
+        try:
+            if local:
+                mesh_inertial = mass_properties(read_stl(file_name), mass=inertial['mass'], scale=1.0)
+                mesh_inertial['center_of_mass'] = [c + o for c, o in zip(mesh_inertial['center_of_mass'],
+                                                                          origins[name])]
+            else:
+                mesh_inertial = mass_properties(read_stl(file_name), mass=inertial['mass'])
+        except ValueError as e:
+            differences[name] = [str(e)]
+            continue
+        result = compare_inertial(mesh_inertial, inertial, com_tolerance, inertia_tolerance)
+        if result:
+            differences[name] = result
+    return differences
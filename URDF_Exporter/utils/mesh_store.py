@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 2026
+
+@author: JatinPatil2003
+
+Mesh store shared by all exported packages. Every mesh is stored once under
+the hash of its geometry and the packages hardlink to it, so standard parts
+(motors, bearings, sensors) used by many robots take their space once:
+
+    python -m URDF_Exporter.utils.mesh_store ~/fusion2urdf_meshes stats
+    python -m URDF_Exporter.utils.mesh_store ~/fusion2urdf_meshes evict --max-mb 500
+"""
+
+import argparse, hashlib, json, os, shutil, struct, threading, time
+
+from . import mesh
+
+
+def geometry_hash(file_name):
+    """
+    hash of the triangles of a stl file, the 80 byte header (which may hold
+    a name or a time stamp) is left out unless it holds the link frame of a
+    local mesh, see mesh.localize_meshes
+
+    Returns
+    ----------
+    hex digest: str
+    """
+    with open(file_name, 'rb') as f:
+        data = f.read()
+    if len(data) >= 84 and 84 + 50 * struct.unpack_from('<I', data, 80)[0] == len(data):
+        return hashlib.sha256(data[0 if data.startswith(mesh.LOCAL_HEADER) else 80:]).hexdigest()
+    # ASCII: hash the vertices, the formatting of the numbers doesn't matter
+    return hashlib.sha256(repr([[tuple(p) for p in t] for t in mesh.read_stl(file_name)]).encode()).hexdigest()
+
+
+def _link(src, dst):
+    # a hardlink or a copy, never a symlink, so evicting an object from the
+    # store never breaks a package
+    tmp = dst + '.tmp'
+    try:
+        os.link(src, tmp)
+    except OSError:
+        shutil.copyfile(src, tmp)
+    os.replace(tmp, dst)
+
+
+class MeshStore:
+
+    def __init__(self, root, max_bytes=0):
+        """
+        Parameters
+        ----------
+        root: str
+            directory of the store, created if needed
+        max_bytes: int
+            the least recently used meshes are evicted above this size, 0
+            for no limit. Packages keep their hardlinks of evicted meshes.
+
+        Attributes
+        ----------
+        index: {objects: {hash: {size, used}}, hits, misses, saved}
+            saved is the number of bytes which were not stored again
+        """
+        self.root = root
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        try: os.makedirs(root + '/objects')
+        except: pass
+        try:
+            with open(root + '/index.json') as f:
+                self.index = json.load(f)
+        except (OSError, ValueError):
+            self.index = {'objects': {}, 'hits': 0, 'misses': 0, 'saved': 0}
+
+    def path(self, digest):
+        return os.path.join(self.root, 'objects', digest[:2], digest + '.stl')
+
+    def add(self, file_name):
+        """
+        put a mesh into the store and replace it by a hardlink to the
+        stored mesh with the same geometry
+
+        Returns
+        ----------
+        True if the geometry was already stored
+        """
+        digest = geometry_hash(file_name)
+        size = os.path.getsize(file_name)
+        path = self.path(digest)
+        with self._lock:
+            objects = self.index['objects']
+            hit = digest in objects and os.path.exists(path) and os.path.getsize(path) == size
+            if hit:
+                self.index['hits'] += 1
+                self.index['saved'] += size
+                if not os.path.samefile(path, file_name):
+                    _link(path, file_name)
+            else:
+                self.index['misses'] += 1
+                try: os.makedirs(os.path.dirname(path))
+                except: pass
+                _link(file_name, path)
+            objects[digest] = {'size': size, 'used': time.time()}
+        return hit
+
+    def add_dir(self, mesh_dir):
+        """
+        add every "name.stl" of mesh_dir, evict and save the index
+
+        Returns
+        ----------
+        {name: True if it was already stored}
+        """
+        results = {}
+        for name in sorted(os.listdir(mesh_dir)):
+            if name.endswith('.stl'):
+                results[name[:-4]] = self.add(os.path.join(mesh_dir, name))
+        self.evict()
+        self.save()
+        return results
+
+    def evict(self, max_bytes=None):
+        """
+        remove the least recently used meshes until the store is below
+        max_bytes (default self.max_bytes, 0 keeps everything)
+
+        Returns
+        ----------
+        number of evicted meshes
+        """
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        if not max_bytes:
+            return 0
+        with self._lock:
+            objects = self.index['objects']
+            total = sum(_['size'] for _ in objects.values())
+            evicted = 0
+            for digest in sorted(objects, key=lambda _: objects[_]['used']):
+                if total <= max_bytes:
+                    break
+                try: os.remove(self.path(digest))
+                except OSError: pass
+                total -= objects.pop(digest)['size']
+                evicted += 1
+        return evicted
+
+    def save(self):
+        with self._lock:
+            tmp = self.root + '/index.json.tmp'
+            with open(tmp, mode='w') as f:
+                json.dump(self.index, f)
+            os.replace(tmp, self.root + '/index.json')
+
+    def stats(self):
+        """
+        Returns
+        ----------
+        {meshes, bytes, hits, misses, hit_rate, saved}
+        """
+        lookups = self.index['hits'] + self.index['misses']
+        return {'meshes': len(self.index['objects']),
+                'bytes': sum(_['size'] for _ in self.index['objects'].values()),
+                'hits': self.index['hits'], 'misses': self.index['misses'],
+                'hit_rate': self.index['hits'] / lookups if lookups else 0.0,
+                'saved': self.index['saved']}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Inspect the shared mesh store of Fusion2URDF.')
+    parser.add_argument('store', help='directory of the store')
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('stats', help='print the size, hit rate and bytes saved')
+    evict = commands.add_parser('evict', help='remove the least recently used meshes')
+    evict.add_argument('--max-mb', type=float, required=True)
+    add = commands.add_parser('add', help='add the meshes of a package')
+    add.add_argument('mesh_dir')
+    args = parser.parse_args(argv)
+
+    store = MeshStore(args.store)
+    if args.command == 'evict':
+        print('evicted {} meshes'.format(store.evict(int(args.max_mb * 2**20))))
+        store.save()
+    elif args.command == 'add':
+        results = store.add_dir(args.mesh_dir)
+        print('{} meshes, {} already stored'.format(len(results), sum(results.values())))
+    stats = store.stats()
+    print('{meshes} meshes, {mb:.1f} MB, {hits} hits, {misses} misses, hit rate {hit_rate:.0%}, '
+          '{saved_mb:.1f} MB saved'.format(mb=stats['bytes'] / 2**20, saved_mb=stats['saved'] / 2**20, **stats))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,234 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 2026
+
+@author: JatinPatil2003
+
+Find out which Fusion API accesses an export spends its time in. The
+objects handed to the extraction and the STL export are wrapped in proxies
+which time every property access and method call and pass everything on
+to the real object:
+
+    tracer = trace.Tracer()
+    root = tracer.wrap(design.rootComponent)
+    ...
+    print(tracer.report())
+    tracer.write_chrome_trace('fusion_api.trace.json')  # chrome://tracing or ui.perfetto.dev
+"""
+
+import json, os, sys, threading, time
+
+# values which are returned as they are instead of being wrapped
+_PLAIN = (type(None), bool, int, float, complex, str, bytes)
+
+
+class Tracer:
+
+    def __init__(self):
+        """
+        Attributes
+        ----------
+        events: [(member, site, start, duration, thread id)]
+            start and duration in seconds, site is "file:line function" of
+            the code which used the API
+        active: bool
+            proxies only record while it is set, see stop
+        """
+        self.events = []
+        self.active = True
+        self.origin = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def wrap(self, target):
+        """
+        Returns
+        ----------
+        a Proxy of target which records into this tracer, plain values
+        (numbers, strings, ...) and lists or tuples of them are returned as
+        they are
+        """
+        if isinstance(target, _PLAIN) or isinstance(target, Proxy):
+            return target
+        # collections of the API (even list based ones) are proxied themselves
+        if type(target) in (list, tuple):
+            if all(isinstance(_, _PLAIN) for _ in target):
+                return target
+            return type(target)(self.wrap(_) for _ in target)
+        if not type(target).__module__.startswith('adsk'):
+            return target
+        return Proxy(target, self)
+
+    def stop(self):
+        """
+        stop recording, proxies kept after the export pass everything on
+        """
+        self.active = False
+
+    def record(self, member, start, depth=2):
+        """
+        record a finished access which started at start (perf_counter)
+        """
+        duration = time.perf_counter() - start
+        if not self.active:
+            return
+        frame = sys._getframe(depth)
+        site = '{}:{} {}'.format(os.path.basename(frame.f_code.co_filename), frame.f_lineno, frame.f_code.co_name)
+        with self._lock:
+            self.events.append((member, site, start - self.origin, duration, threading.get_ident()))
+
+    def summary(self, key='member'):
+        """
+        Parameters
+        ----------
+        key: str
+            'member' (e.g. "Occurrence.bRepBodies") or 'site'
+
+        Returns
+        ----------
+        {member or site: {count, total, mean}}, the slowest first
+        """
+        index = 0 if key == 'member' else 1
+        stats = {}
+        for event in self.events:
+            entry = stats.setdefault(event[index], {'count': 0, 'total': 0.0})
+            entry['count'] += 1
+            entry['total'] += event[3]
+        for entry in stats.values():
+            entry['mean'] = entry['total'] / entry['count']
+        return dict(sorted(stats.items(), key=lambda _: -_[1]['total']))
+
+    def report(self, top=15):
+        """
+        Returns
+        ----------
+        the members and call sites which took the most time: str
+        """
+        lines = []
+        for key in ('member', 'site'):
+            lines.append('{:<50}{:>8}{:>12}{:>12}'.format(key, 'calls', 'total ms', 'mean us'))
+            for name, entry in list(self.summary(key).items())[:top]:
+                lines.append('{:<50}{:>8}{:>12.3f}{:>12.1f}'.format(
+                    name[:49], entry['count'], entry['total'] * 1e3, entry['mean'] * 1e6))
+        return '\n'.join(lines)
+
+    def write_chrome_trace(self, file_name):
+        """
+        write the events in the Chrome trace event format, which is read by
+        chrome://tracing and ui.perfetto.dev
+        """
+        events = [{'name': member, 'cat': 'adsk', 'ph': 'X', 'pid': 1, 'tid': tid,
+                   'ts': round(start * 1e6, 3), 'dur': round(duration * 1e6, 3), 'args': {'site': site}}
+                  for member, site, start, duration, tid in self.events]
+        with open(file_name, mode='w') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+
+
+def unwrap(value):
+    """
+    the real object of a Proxy, also inside lists and tuples
+    """
+    if isinstance(value, Proxy):
+        return object.__getattribute__(value, '_target')
+    if isinstance(value, (list, tuple)):
+        return type(value)(unwrap(_) for _ in value)
+    return value
+
+
+def wrap_like(proxy, value):
+    """
+    value wrapped into the Tracer of proxy, as it is if proxy is no Proxy
+    """
+    if isinstance(proxy, Proxy):
+        return object.__getattribute__(proxy, '_tracer').wrap(value)
+    return value
+
+
+class Proxy:
+    """
+    Stand-in for an adsk object which records every access into its Tracer.
+    Results are wrapped again, arguments are unwrapped before they reach
+    the API. __class__ is the class of the real object, so isinstance
+    checks against adsk types hold, and the SWIG `this` pointer is passed
+    on, so the API accepts a proxy where it expects the object.
+    """
+
+    __slots__ = ('_target', '_tracer')
+
+    def __init__(self, target, tracer):
+        object.__setattr__(self, '_target', target)
+        object.__setattr__(self, '_tracer', tracer)
+
+    @property
+    def __class__(self):
+        return type(object.__getattribute__(self, '_target'))
+
+    def __getattr__(self, name):
+        target = object.__getattribute__(self, '_target')
+        tracer = object.__getattribute__(self, '_tracer')
+        member = type(target).__name__ + '.' + name
+        start = time.perf_counter()
+        value = getattr(target, name)
+        tracer.record(member, start)
+        if callable(value) and not isinstance(value, type):
+            return _method(value, member, tracer)
+        return tracer.wrap(value)
+
+    def __setattr__(self, name, value):
+        target = object.__getattribute__(self, '_target')
+        tracer = object.__getattribute__(self, '_tracer')
+        start = time.perf_counter()
+        setattr(target, name, unwrap(value))
+        tracer.record(type(target).__name__ + '.' + name + '=', start)
+
+    def _call(self, name, *args):
+        # special methods are looked up on the type, so they are forwarded here
+        target = object.__getattribute__(self, '_target')
+        tracer = object.__getattribute__(self, '_tracer')
+        start = time.perf_counter()
+        value = getattr(target, name)(*[unwrap(_) for _ in args])
+        tracer.record(type(target).__name__ + '.' + name, start, 3)
+        return tracer.wrap(value)
+
+    def __iter__(self):
+        target = object.__getattribute__(self, '_target')
+        tracer = object.__getattribute__(self, '_tracer')
+        items = iter(target)
+        member = type(target).__name__ + '.__next__'
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(items)
+            except StopIteration:
+                return
+            tracer.record(member, start)
+            yield tracer.wrap(item)
+
+    def __len__(self):
+        return Proxy._call(self, '__len__')
+
+    def __getitem__(self, key):
+        return Proxy._call(self, '__getitem__', key)
+
+    def __bool__(self):
+        return bool(object.__getattribute__(self, '_target'))
+
+    def __eq__(self, other):
+        return object.__getattribute__(self, '_target') == unwrap(other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(object.__getattribute__(self, '_target'))
+
+    def __repr__(self):
+        return '<traced {!r}>'.format(object.__getattribute__(self, '_target'))
+
+
+def _method(func, member, tracer):
+    def call(*args, **kwargs):
+        start = time.perf_counter()
+        value = func(*[unwrap(_) for _ in args], **{k: unwrap(v) for k, v in kwargs.items()})
+        tracer.record(member + '()', start)
+        return tracer.wrap(value)
+    return call
@@ -8,29 +8,120 @@ Modified on Fri Nov 15 2024
 @author: JatinPatil2003
 """
 
-import adsk
-import adsk.core
-import adsk.fusion
+import importlib
 import os.path
-import re
-from xml.etree import ElementTree
-from xml.dom import minidom
-import shutil
-import fileinput
 import sys
 
+# Heavy or optional modules (minidom, ElementTree, shutil, numpy, ...) are
+# imported inside the functions that use them so that loading the add-in
+# stays cheap. Only the export itself pays for them. The same goes for the
+# Fusion API (adsk), so the writers also run from a saved model without
+# Fusion, see core/Model.py.
+_optional_modules = {}
 
-def export_stl(_app, save_dir):
+
+def optional_import(name):
     """
-    export stl files into "sace_dir/"
+    import an optional accelerator module (e.g. "numpy") on first use
 
 
     Parameters
     ----------
-    _app: adsk.core.Application.get()
-    save_dir: str
-        directory path to save
+    name: str
+        module name
+
+    Returns
+    ----------
+    module or None if it is not available in this Python
     """
+    if name not in _optional_modules:
+        try:
+            _optional_modules[name] = importlib.import_module(name)
+        except ImportError:
+            _optional_modules[name] = None
+    return _optional_modules[name]
+
+
+# hidden document the meshes are exported from, kept between exports
+_export_doc = None
+
+
+def get_export_document(_app):
+    """
+    return the hidden direct design document used by export_stl, it is
+    created on the first export and reused afterwards
+    """
+    import adsk.core, adsk.fusion
+    from . import trace
+    global _export_doc
+    if _export_doc is None or not _export_doc.isValid:
+        # create export Doc - DirectDesign
+        fusionDocType = adsk.core.DocumentTypes.FusionDesignDocumentType
+        # keep the real document, a traced one would go on recording into
+        # its tracer in the exports which are not traced
+        _export_doc = trace.unwrap(_app.documents.add(fusionDocType, False))
+        expDes: adsk.fusion.Design = _export_doc.design
+        expDes.designType = adsk.fusion.DesignTypes.DirectDesignType
+    return trace.wrap_like(_app, _export_doc)
+
+
+def release_export_document():
+    """
+    close the hidden export document
+    """
+    global _export_doc
+    if _export_doc is not None and _export_doc.isValid:
+        _export_doc.close(False)
+    _export_doc = None
+
+
+def process_memory():
+    """
+    current working set (resident memory) of the Fusion process in bytes,
+    None if it can't be measured. Not the peak, which never goes down and
+    so can't tell which link needed the memory.
+    """
+    psutil = optional_import('psutil')
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    if sys.platform == 'win32':
+        import ctypes
+        from ctypes import wintypes
+
+        class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+            _fields_ = [('cb', wintypes.DWORD), ('PageFaultCount', wintypes.DWORD),
+                        ('PeakWorkingSetSize', ctypes.c_size_t), ('WorkingSetSize', ctypes.c_size_t),
+                        ('QuotaPeakPagedPoolUsage', ctypes.c_size_t), ('QuotaPagedPoolUsage', ctypes.c_size_t),
+                        ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t), ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+                        ('PagefileUsage', ctypes.c_size_t), ('PeakPagefileUsage', ctypes.c_size_t)]
+
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        if ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+            return counters.WorkingSetSize
+        return None
+    if os.path.exists('/proc/self/statm'):
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    return None
+
+
+def iter_show_bodies(root):
+    """
+    Generator over the visible bodies of every link, one link at a time
+
+
+    Parameters
+    ----------
+    root: adsk.fusion.Component
+        root component of the design
+
+    Yields
+    ----------
+    top level occurrence or None for the bodies of root, [adsk.fusion.BRepBody]
+    """
+    import adsk.fusion
 
     def traverse( occ):
     # recursive method to get all bodies from components and sub-components
@@ -43,16 +134,11 @@ def export_stl(_app, save_dir):
             liste = liste + [body for body in occ.bRepBodies if body.isLightBulbOn and occ.component.isBodiesFolderLightBulbOn]
         return liste
 
-
-    des: adsk.fusion.Design = _app.activeProduct
-    root: adsk.fusion.Component = des.rootComponent
-
-    showBodies = []
     body = adsk.fusion.BRepBody.cast(None)
     if root.isBodiesFolderLightBulbOn:
         lst = [body for body in root.bRepBodies if body.isLightBulbOn]
         if len(lst) > 0:
-            showBodies.append(['root', lst])
+            yield None, lst
 
         occ = adsk.fusion.Occurrence.cast(None)
         for occ in root.allOccurrences:
@@ -62,58 +148,125 @@ def export_stl(_app, save_dir):
                     for child in occ.childOccurrences:
                         lst = lst + traverse(child)
                 if len(lst) > 0:
-                    showBodies.append([occ.name, lst])
+                    yield occ, lst
 
-        # get clone body
-        tmpBrepMng = adsk.fusion.TemporaryBRepManager.get()
-        tmpBodies = []
-        for name, bodies in showBodies:
-            lst = [tmpBrepMng.copy(body) for body in bodies]
-            if len(lst) > 0:
-                tmpBodies.append([name, lst])
 
-        # create export Doc - DirectDesign
-        fusionDocType = adsk.core.DocumentTypes.FusionDesignDocumentType
-        expDoc: adsk.fusion.FusionDocument = _app.documents.add(fusionDocType)
-        expDes: adsk.fusion.Design = expDoc.design
-        expDes.designType = adsk.fusion.DesignTypes.DirectDesignType
+def export_stl(_app, save_dir, names=None, links=None, on_export=None):
+    """
+    export stl files into "sace_dir/"
 
-        # get export rootComponent
-        expRoot: adsk.fusion.Component = expDes.rootComponent
+    The links are processed one after the other: their bodies are copied,
+    pasted into the export document, exported and deleted again before
+    the next link is visited, so only one link's geometry is held at a time.
+    The export document itself is reused, see get_export_document.
 
+
+    Parameters
+    ----------
+    _app: adsk.core.Application.get()
+    save_dir: str
+        directory path to save
+    names: Names.NameRegistry
+        link names of the occurrences, a new one is made if None
+    links: [str]
+        export only the meshes of these links, all if None
+    on_export: callable
+        on_export(mesh name, file name) after each mesh, e.g. to record it
+        in a Journal or to report the progress
+
+    Returns
+    ----------
+    {mesh name: bytes the process memory grew by while the bodies of the
+    link were copied and exported}
+        None for the links if the memory can't be measured
+    """
+    import adsk.core, adsk.fusion
+    from ..core import Names
+    des: adsk.fusion.Design = _app.activeProduct
+    root: adsk.fusion.Component = des.rootComponent
+    names = names or Names.NameRegistry(root)
+    memory = {}
+    if not root.isBodiesFolderLightBulbOn:
+        return memory
+
+    tmpBrepMng = adsk.fusion.TemporaryBRepManager.get()
+
+    # get export rootComponent
+    expRoot: adsk.fusion.Component = get_export_document(_app).design.rootComponent
+
+    try:
+        os.mkdir(save_dir + '/meshes')
+    except:
+        pass
+    exportFolder = save_dir + '/meshes'
+
+    exportMgr = des.exportManager
+    mat0 = adsk.core.Matrix3D.create()
+    for link_occ, bodies in iter_show_bodies(root):
+        expName = names.name(link_occ) if link_occ else 'root'
+        if links is not None and expName not in links:
+            continue
         # paste clone body
-        mat0 = adsk.core.Matrix3D.create()
-        for name, bodies in tmpBodies:
-            occ = expRoot.occurrences.addNewComponent(mat0)
+        before = process_memory()
+        occ = expRoot.occurrences.addNewComponent(mat0)
+        try:
             comp = occ.component
-            comp.name = name
+            comp.name = expName
             for body in bodies:
-                comp.bRepBodies.add(body)
+                comp.bRepBodies.add(tmpBrepMng.copy(body))
 
-        # export stl
-        try:
-            os.mkdir(save_dir + '/meshes')
-        except:
-            pass
-        exportFolder = save_dir + '/meshes'
-
-        exportMgr = des.exportManager
-        for occ in expRoot.allOccurrences:
-            if "base_link" in occ.component.name:
-                expName = "base_link"
-            else:
-                expName = re.sub('[ :()]', '_', occ.component.name)
+            # export stl
             expPath = os.path.join(exportFolder, '{}.stl'.format(expName))
+            # the old file may be a hardlink into a mesh store, don't write through it
+            if os.path.exists(expPath):
+                os.remove(expPath)
             stlOpts = exportMgr.createSTLExportOptions(occ, expPath)
             exportMgr.execute(stlOpts)
+            after = process_memory()
+            memory[expName] = after - before if before is not None and after is not None else None
+            if on_export:
+                on_export(expName, expPath)
+        finally:
+            # release the bodies of this link, the document stays for the next one
+            occ.deleteMe()
+    return memory
+
+
+class ProgressDialog:
+
+    def __init__(self, ui, title):
+        """
+        Fusion progress dialog for a Pipeline.Progress, use it as its
+        callback. The dialog is only touched from the main thread, the
+        stages on other threads show up with the next main thread update.
+        """
+        import threading
+        self.main_thread = threading.main_thread()
+        self.dialog = ui.createProgressDialog()
+        self.dialog.cancelButtonText = 'Cancel'
+        self.dialog.isBackgroundTranslucent = False
+        self.dialog.isCancelButtonShown = True
+        self.dialog.show(title, 'Preparing the export', 0, 100, 0)
+
+    def __call__(self, progress, stage):
+        import adsk, threading
+        if threading.current_thread() is not self.main_thread:
+            return
+        if self.dialog.wasCancelled:
+            progress.cancel()
+        self.dialog.progressValue = int(100 * progress.fraction())
+        self.dialog.message = progress.describe(stage) + ' (%p%)'
+        adsk.doEvents()  # redraw and handle the cancel button
+
+    def close(self):
+        self.dialog.hide()
 
-        # remove export Doc
-        expDoc.close(False)
 
 def file_dialog(ui):
     """
     display the dialog to save the file
     """
+    import adsk.core
     # Set styles of folder dialog.
     folderDlg = ui.createFolderDialog()
     folderDlg.title = 'Fusion Folder Dialog'
@@ -149,6 +302,39 @@ def origin2center_of_mass(inertia, center_of_mass, mass):
     return [round(i - mass*t, 6) for i, t in zip(inertia, translation_matrix)]
 
 
+def format_number(value, canonical=False):
+    """
+    convert a number into the string written to the urdf
+
+
+    Parameters
+    ----------
+    value: float
+    canonical: bool
+        if True, use fixed precision so that identical designs are written
+        byte by byte identically
+
+    Returns
+    ----------
+    formatted number: str
+    """
+    if isinstance(value, str):
+        return value  # a xacro expression
+    if not canonical:
+        return str(value)
+    text = '{:.6f}'.format(value)
+    if text.strip('-0.') == '':
+        text = '0.000000'  # no "-0.000000"
+    return text
+
+
+def format_vector(values, canonical=False):
+    """
+    convert [x, y, z, ...] into "x y z ..." with format_number
+    """
+    return ' '.join([format_number(_, canonical) for _ in values])
+
+
 def prettify(elem):
     """
     Return a pretty-printed XML string for the Element.
@@ -161,12 +347,15 @@ def prettify(elem):
     ----------
     pretified xml : str
     """
+    from xml.dom import minidom
+    from xml.etree import ElementTree
     rough_string = ElementTree.tostring(elem, 'utf-8')
     reparsed = minidom.parseString(rough_string)
     return reparsed.toprettyxml(indent="  ")
 
 
 def copy_package(save_dir, package_dir):
+    import shutil
     try:
         os.mkdir(save_dir + '/launch')
     except:
@@ -178,32 +367,54 @@ def copy_package(save_dir, package_dir):
     shutil.copytree(package_dir, save_dir, dirs_exist_ok=True)
 
 
+def link_file(src, dst):
+    """
+    make dst the same file as src without copying its content: a hardlink,
+    a symlink where hardlinks fail (e.g. another drive) or a copy as the
+    last resort
+    """
+    import shutil
+    if os.path.lexists(dst):
+        if os.path.exists(dst) and os.path.samefile(src, dst):
+            return
+        os.remove(dst)
+    try:
+        os.link(src, dst)
+    except OSError:
+        try:
+            os.symlink(os.path.relpath(src, os.path.dirname(dst)), dst)
+        except OSError:
+            shutil.copyfile(src, dst)
+
+
+def replace_in_file(file_name, replacements):
+    """
+    apply re.sub(pattern, repl, text, flags=re.M) for every (pattern, repl)
+    to the text of the file and write it back. The whole file is read and
+    written in one go: fileinput swaps the process wide sys.stdout, so
+    anything printed by another stage would end up in the file.
+    """
+    import re
+    with open(file_name) as f:
+        text = f.read()
+    for pattern, repl in replacements:
+        text = re.sub(pattern, lambda m: repl, text, flags=re.M)
+    with open(file_name, mode='w') as f:
+        f.write(text)
+
 def update_cmakelists(save_dir, package_name):
     file_name = save_dir + '/CMakeLists.txt'
-
-    for line in fileinput.input(file_name, inplace=True):
-        if 'project(fusion2urdf)' in line:
-            sys.stdout.write("project(" + package_name + ")\n")
-        else:
-            sys.stdout.write(line)
+    replace_in_file(file_name, [(r'^.*project\(fusion2urdf\).*$', 'project(' + package_name + ')')])
 
 def update_ros2_launchfile(save_dir, package_name):
-    file_name = save_dir + '/launch/robot_description.launch.py'
+    file_names = [save_dir + '/launch/robot_description.launch.py',
+                  save_dir + '/launch/robot_description_composable.launch.py']
 
-    for line in fileinput.input(file_name, inplace=True):
-        if 'fusion2urdf' in line:
-            sys.stdout.write(line.replace('fusion2urdf', package_name))
-        else:
-            sys.stdout.write(line)
+    for file_name in file_names:
+        if os.path.exists(file_name):
+            replace_in_file(file_name, [('fusion2urdf', package_name)])
 
 def update_package_xml(save_dir, package_name):
     file_name = save_dir + '/package.xml'
-
-    for line in fileinput.input(file_name, inplace=True):
-        if '<name>' in line:
-            sys.stdout.write("  <name>" + package_name + "</name>\n")
-        elif '<description>' in line:
-            sys.stdout.write("<description>The " +
-                             package_name + " package</description>\n")
-        else:
-            sys.stdout.write(line)
+    replace_in_file(file_name, [(r'^.*<name>.*$', '  <name>' + package_name + '</name>'),
+                                (r'^.*<description>.*$', '<description>The ' + package_name + ' package</description>')])
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 2026
+
+@author: JatinPatil2003
+"""
+
+import copy, math, re
+from xml.etree import ElementTree
+
+XACRO_NS = '{http://www.ros.org/wiki/xacro}'
+_find = re.compile(r'\$\(find ([^)\s]+)\)')
+_expression = re.compile(r'\$\{([^}]*)\}')
+
+
+def _value(text):
+    try:
+        return float(text)
+    except ValueError:
+        return text
+
+
+def _evaluate(text, properties):
+    """
+    substitute every ${expression} in text, the expressions are python
+    expressions over the properties like in xacro
+    """
+    def substitute(match):
+        namespace = {name: _value(value) for name, value in properties.items()}
+        result = eval(match.group(1), {'__builtins__': {}, 'pi': math.pi}, namespace)
+        if isinstance(result, float) and result.is_integer():
+            result = int(result)
+        return str(result)
+    return _expression.sub(substitute, text)
+
+
+def _resolve(file_name, packages):
+    # $(find package) -> path of the package
+    return _find.sub(lambda match: packages.get(match.group(1), match.group(0)), file_name)
+
+
+def _expand(element, properties, packages, macros):
+    """
+    expand the children of element in place
+    """
+    if element.text and not element.text.strip():
+        element.text = None  # the layout is redone by prettify
+    children = []
+    for child in list(element):
+        if child.tag == XACRO_NS + 'property':
+            properties[child.attrib['name']] = _evaluate(child.attrib.get('value', ''), properties)
+        elif child.tag == XACRO_NS + 'include':
+            included = ElementTree.parse(_resolve(child.attrib['filename'], packages)).getroot()
+            _expand(included, properties, packages, macros)
+            children += list(included)
+        elif child.tag == XACRO_NS + 'macro':
+            macros[child.attrib['name']] = (child.attrib.get('params', '').split(), child)
+        elif child.tag.startswith(XACRO_NS) and child.tag[len(XACRO_NS):] in macros:
+            params, body = macros[child.tag[len(XACRO_NS):]]
+            scope = dict(properties)
+            scope.update({name: _evaluate(child.attrib.get(name, ''), properties) for name in params})
+            body = copy.deepcopy(body)
+            _expand(body, scope, packages, macros)
+            children += list(body)
+        else:
+            child.attrib = {name: _evaluate(value, properties) for name, value in child.attrib.items()}
+            if child.text:
+                child.text = _evaluate(child.text, properties)
+            _expand(child, properties, packages, macros)
+            children.append(child)
+    for child in list(element):
+        element.remove(child)
+    for child in children:
+        child.tail = None
+    element.extend(children)
+
+
+def expand(file_name, packages):
+    """
+    Expand a xacro file into plain urdf. Supports what the exporter writes:
+    includes, properties, macros without default parameters and ${}
+    expressions.
+
+
+    Parameters
+    ----------
+    file_name: str
+        xacro full path
+    packages: {package name: path}
+        used to resolve $(find package)
+
+    Returns
+    ----------
+    robot element: xml.etree.ElementTree.Element
+    """
+    robot = ElementTree.parse(file_name).getroot()
+    _expand(robot, {}, packages, {})
+    return robot
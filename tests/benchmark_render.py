@@ -0,0 +1,54 @@
+"""
+Time rendering a saved model with the stages run one after the other
+(max_workers=1) and as a graph on the thread pool (max_workers=4):
+
+    python tests/benchmark_render.py [links] [repeat]
+
+The writers are plain python and hold the GIL, so rendering alone gains
+little from the thread pool. The pool pays off in the export, where the
+writers overlap with the STL export on the main thread.
+"""
+
+import os, sys, tempfile, time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from conftest import _joint, save_model
+
+from URDF_Exporter.core import Model
+
+OPTIONS = {'srdf': True, 'srdf_samples': 200, 'mjcf': True, 'mesh_inertia': True}
+
+
+def make_joints(links):
+    # arms of four links around the base
+    joints = {}
+    for i in range(1, links):
+        parent = 'base_link' if i % 4 == 1 else 'link_{}'.format(i - 1)
+        xyz = [0.05 * (i % 4), 0.1 * (i // 4), 0.02 * (i % 4)]
+        joints['joint_{}'.format(i)] = _joint('revolute', [0, 0, 1], parent, 'link_{}'.format(i), xyz, (-1.0, 1.0))
+    return joints
+
+
+def benchmark(links=40, repeat=3, directory=None):
+    """
+    Returns
+    ----------
+    {max_workers: best time in s}
+    """
+    directory = directory or tempfile.mkdtemp()
+    data = Model.load_model(save_model(os.path.join(directory, 'model'), make_joints(links)))
+    times = {}
+    for max_workers in (1, 4):
+        for i in range(repeat):
+            save_dirs = {version: os.path.join(directory, 'out{}_{}'.format(max_workers, i), 'ros{}'.format(version))
+                         for version in (1, 2)}
+            start = time.perf_counter()
+            Model.render_model(data, save_dirs, max_workers=max_workers, **OPTIONS)
+            times[max_workers] = min(times.get(max_workers, float('inf')), time.perf_counter() - start)
+    return times
+
+
+if __name__ == '__main__':
+    times = benchmark(*[int(_) for _ in sys.argv[1:3]])
+    print('serial {:.3f} s, graph {:.3f} s, speedup {:.2f}'.format(times[1], times[4], times[1] / times[4]))
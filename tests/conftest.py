@@ -0,0 +1,118 @@
+import json, os, sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# stand-in for the Fusion API
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'stubs'))
+
+from URDF_Exporter.utils import mesh
+
+
+def _joint(joint_type, axis, parent, child, xyz, limits=(0.0, 0.0)):
+    return {'type': joint_type, 'axis': axis, 'upper_limit': limits[1], 'lower_limit': limits[0],
+            'parent': parent, 'child': child, 'xyz': xyz}
+
+
+def make_joints():
+    return {
+        'arm_joint': _joint('revolute', [0, 0, 1], 'base_link', 'arm_1', [0.0, 0.0, 0.03], (-1.5, 1.5)),
+        'wheel_1_joint': _joint('continuous', [1, 0, 0], 'arm_1', 'wheel_1', [0.03, 0.0, 0.08]),
+        'wheel_2_joint': _joint('continuous', [1, 0, 0], 'arm_1', 'wheel_2', [-0.03, 0.0, 0.08]),
+        'bracket_joint': _joint('fixed', [0, 0, 0], 'arm_1', 'bracket_1', [0.0, 0.02, 0.08]),
+        'cam_joint': _joint('fixed', [0, 0, 0], 'bracket_1', 'cam_1', [0.0, 0.03, 0.09]),
+    }
+
+
+def make_design():
+    """
+    stand-in design (see tests/stubs) of the robot of make_joints, a cube per
+    link with the origin of its occurrence at its joint
+
+    Returns
+    ----------
+    adsk.core.Application, {occurrence name: occurrence}
+    """
+    import adsk.core, adsk.fusion
+    root = adsk.fusion.Component('bot v1')
+    red = adsk.core.Appearance('Farbe - Rot (glänzend)', adsk.core.Color(255, 0, 0), 'red')
+    occurrences = {}
+    for name, center, size, appearance in (('base_link:1', (0, 0, 0), 4.0, None), ('arm:1', (0, 0, 3), 2.0, red),
+                                           ('wheel:1', (3, 0, 8), 1.0, None), ('wheel:2', (-3, 0, 8), 1.0, None),
+                                           ('bracket:1', (0, 2, 8), 0.5, red), ('cam:1', (0, 3, 9), 0.5, None)):
+        component = adsk.fusion.Component(name.split(':')[0], [adsk.fusion.BRepBody(size, center)])
+        occurrences[name] = adsk.fusion.Occurrence(component, name, transform=adsk.core.Matrix3D.translated(*center),
+                                                   appearance=appearance)
+        root.occurrences.append(occurrences[name])
+    J = adsk.fusion.Joint
+    root.joints += [
+        J('arm_joint', 1, occurrences['arm:1'], occurrences['base_link:1'], (0, 0, 3), limits=(-1.5, 1.5)),
+        J('wheel_1_joint', 1, occurrences['wheel:1'], occurrences['arm:1'], (3, 0, 8), (1, 0, 0), direction=0),
+        J('wheel_2_joint', 1, occurrences['wheel:2'], occurrences['arm:1'], (-3, 0, 8), (1, 0, 0), direction=0),
+        J('bracket_joint', 0, occurrences['bracket:1'], occurrences['arm:1'], (0, 2, 8)),
+        J('cam_joint', 0, occurrences['cam:1'], occurrences['bracket:1'], (0, 3, 9)),
+    ]
+    return adsk.core.Application(adsk.fusion.Design(root)), occurrences
+
+
+def box(center, size):
+    """
+    triangles of an axis aligned box in mm around center (m)
+    """
+    c = [_ * 1000 for _ in center]
+    h = size * 500
+    corners = [[c[0] + x * h, c[1] + y * h, c[2] + z * h] for x in (-1, 1) for y in (-1, 1) for z in (-1, 1)]
+    faces = [(0, 1, 3, 2), (4, 6, 7, 5), (0, 4, 5, 1), (2, 3, 7, 6), (0, 2, 6, 4), (1, 5, 7, 3)]
+    triangles = []
+    for a, b, c_, d in faces:
+        triangles.append([corners[a], corners[b], corners[c_]])
+        triangles.append([corners[a], corners[c_], corners[d]])
+    return triangles
+
+
+def save_model(directory, joints, components=None):
+    """
+    save a model (see core/Model.py) with a box mesh per link into directory
+
+    Parameters
+    ----------
+    joints: dict
+        joints_dict, the origins are in the world coordinate
+    components: {link: component}
+        links of the same component are identical parts
+
+    Returns
+    ----------
+    path of the model file
+    """
+    components = components or {}
+    links = ['base_link'] + [_['child'] for _ in joints.values()]
+    origins = {'base_link': [0.0, 0.0, 0.0]}
+    origins.update({_['child']: _['xyz'] for _ in joints.values()})
+    os.makedirs(os.path.join(directory, 'meshes'))
+    meshes = {}
+    for link in links:
+        meshes[link] = 'meshes/' + link + '.stl'
+        mesh.write_stl(os.path.join(directory, meshes[link]), box(origins[link], 0.01))
+    # a solid cube of 1 kg with an edge of 0.01 m: I = m (a^2 + a^2) / 12
+    moment = 1.0 * 2 * 0.01**2 / 12
+    data = {'version': 1, 'robot_name': 'bot', 'package_name': 'bot_description', 'joints': joints,
+            'inertials': {link: {'name': link, 'component': components.get(link, link), 'mass': 1.0,
+                                 'center_of_mass': origins[link], 'inertia': [moment, moment, moment, 0.0, 0.0, 0.0]}
+                          for link in links},
+            'materials': {link: {'material': 'silver_default'} for link in links},
+            'colors': {'silver_default': '0.700 0.700 0.700 1.000'}, 'merged': {},
+            'names': {link + ':1': link for link in links}, 'base_link': 'base_link:1',
+            'local_meshes': False, 'meshes': meshes}
+    file_name = os.path.join(directory, 'bot.model.json')
+    with open(file_name, mode='w') as f:
+        json.dump(data, f)
+    return file_name
+
+
+@pytest.fixture
+def model_file(tmp_path):
+    """
+    a saved model of a small robot with box meshes
+    """
+    return save_model(str(tmp_path / 'model'), make_joints())
@@ -0,0 +1,5 @@
+"""
+Stand-in for the Fusion API, just enough of it to run the add-in and
+export_stl without Fusion. The fusion module counts the allocations of
+documents and bodies, see fusion.counters.
+"""
@@ -0,0 +1,127 @@
+from . import fusion
+
+
+class Point3D:
+
+    def __init__(self, x=0.0, y=0.0, z=0.0):
+        self.x, self.y, self.z = x, y, z
+
+    @staticmethod
+    def create(x=0.0, y=0.0, z=0.0):
+        return Point3D(x, y, z)
+
+    def asArray(self):
+        return (self.x, self.y, self.z)
+
+    def copy(self):
+        return type(self)(self.x, self.y, self.z)
+
+
+class Vector3D(Point3D):
+
+    @staticmethod
+    def create(x=0.0, y=0.0, z=0.0):
+        return Vector3D(x, y, z)
+
+
+class Matrix3D:
+
+    def __init__(self, rows=None):
+        # 4x4, translation in cm
+        self.rows = [list(_) for _ in rows] if rows else [[float(r == c) for c in range(4)] for r in range(4)]
+
+    @staticmethod
+    def create():
+        return Matrix3D()
+
+    @staticmethod
+    def translated(x, y, z):
+        return Matrix3D([[1, 0, 0, x], [0, 1, 0, y], [0, 0, 1, z], [0, 0, 0, 1]])
+
+    def asArray(self):
+        return [value for row in self.rows for value in row]
+
+    def getCell(self, row, column):
+        return self.rows[row][column]
+
+    @property
+    def translation(self):
+        return Vector3D(*[self.rows[r][3] for r in range(3)])
+
+    def apply(self, point):
+        # the point (cm) in the coordinates this matrix maps from, in the world
+        return Point3D(*[sum(self.rows[r][c] * point[c] for c in range(3)) + self.rows[r][3] for r in range(3)])
+
+
+class Color:
+
+    def __init__(self, red, green, blue, opacity=255):
+        self.red, self.green, self.blue, self.opacity = red, green, blue, opacity
+
+
+class Property:
+    name = ''
+
+
+class ColorProperty(Property):
+
+    def __init__(self, value, name='Color'):
+        self.name = name
+        self.value = value
+
+
+class FloatProperty(Property):
+    name = 'Roughness'
+    value = 0.5
+
+
+class Appearance:
+
+    def __init__(self, name, color, id=None):
+        self.name = name
+        self.id = id or name
+        self.appearanceProperties = [FloatProperty(), ColorProperty(color)]
+
+
+class DocumentTypes:
+    FusionDesignDocumentType = 0
+
+
+class DialogResults:
+    DialogOK = 0
+
+
+class Document:
+
+    def __init__(self):
+        self.isValid = True
+        self.design = fusion.Design(fusion.Component('root'))
+
+    def close(self, save):
+        self.isValid = False
+        fusion.counters['open_documents'] -= 1
+
+
+class Documents:
+
+    def add(self, document_type, visible=True):
+        fusion.counters['documents'] += 1
+        fusion.counters['open_documents'] += 1
+        return Document()
+
+
+class UserInterface:
+
+    def __init__(self):
+        self.messages = []
+
+    def messageBox(self, text, title=''):
+        self.messages.append(text)
+
+
+class Application:
+
+    def __init__(self, design):
+        self.activeProduct = design
+        self.documents = Documents()
+        self.userInterface = UserInterface()
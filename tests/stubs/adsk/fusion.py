@@ -0,0 +1,298 @@
+import struct
+
+from . import core
+
+# documents: created, open_documents: not closed yet, bodies: live body
+# copies, peak_bodies: most live copies at a time, exports: stl files
+counters = {}
+
+
+def reset():
+    counters.update({'documents': 0, 'open_documents': 0, 'bodies': 0, 'peak_bodies': 0, 'exports': 0})
+
+
+reset()
+
+# g/cm^3
+DENSITY = 1.0
+
+
+class CalculationAccuracy:
+    LowCalculationAccuracy, VeryHighCalculationAccuracy = 0, 3
+
+
+class DesignTypes:
+    DirectDesignType = 0
+
+
+class JointTypes:
+    RigidJointType, RevoluteJointType, SliderJointType = 0, 1, 2
+
+
+class JointDirections:
+    XAxisJointDirection, YAxisJointDirection, ZAxisJointDirection, CustomJointDirection = 0, 1, 2, 3
+
+
+class BRepBody:
+
+    def __init__(self, size=1.0, center=(0.0, 0.0, 0.0), appearance=None, pocket=0.0):
+        """
+        cube with an edge of size (cm) around center (cm, world), a pocket
+        is a cube of that edge cut out of its middle, so it changes the
+        volume but not the bounding box
+        """
+        self.size = size
+        self.center = tuple(center)
+        self.appearance = appearance
+        self.pocket = pocket
+        self.isLightBulbOn = True
+        self.name = 'Body'
+
+    @staticmethod
+    def cast(value):
+        return value
+
+    @property
+    def volume(self):
+        return self.size**3 - self.pocket**3
+
+    @property
+    def area(self):
+        return 6 * (self.size**2 + self.pocket**2)
+
+    def triangles(self):
+        # in mm, as the stl export writes them
+        c = [10 * _ for _ in self.center]
+        faces = [(0, 1, 3, 2), (4, 6, 7, 5), (0, 4, 5, 1), (2, 3, 7, 6), (0, 2, 6, 4), (1, 5, 7, 3)]
+        triangles = []
+        for edge, sign in ((self.size, 1), (self.pocket, -1)):
+            if not edge:
+                continue
+            h = 5 * edge
+            v = [[c[0] + x * h, c[1] + y * h, c[2] + z * h] for x in (-1, 1) for y in (-1, 1) for z in (-1, 1)]
+            for a, b, c_, d in faces:
+                if sign < 0:
+                    b, d = d, b
+                triangles += [[v[a], v[b], v[c_]], [v[a], v[c_], v[d]]]
+        return triangles
+
+
+class BRepBodies(list):
+
+    def add(self, body):
+        counters['bodies'] += 1
+        counters['peak_bodies'] = max(counters['peak_bodies'], counters['bodies'])
+        self.append(body)
+        return body
+
+
+class Occurrences(list):
+
+    def addNewComponent(self, matrix):
+        occ = Occurrence(Component(''), '', self)
+        self.append(occ)
+        return occ
+
+
+class Component:
+
+    def __init__(self, name, bodies=()):
+        self.name = name
+        self.bRepBodies = list(bodies)
+        self.occurrences = Occurrences()
+        self.joints = []
+        self.material = None
+        self.isBodiesFolderLightBulbOn = True
+
+    @property
+    def allOccurrences(self):
+        occurrences = []
+
+        def visit(occ):
+            occurrences.append(occ)
+            for child in occ.childOccurrences:
+                visit(child)
+        for occ in self.occurrences:
+            visit(occ)
+        return occurrences
+
+
+class BoundingBox3D:
+
+    def __init__(self, bodies):
+        self.minPoint = core.Point3D(*[min([b.center[i] - b.size / 2 for b in bodies] or [0.0]) for i in range(3)])
+        self.maxPoint = core.Point3D(*[max([b.center[i] + b.size / 2 for b in bodies] or [0.0]) for i in range(3)])
+
+
+class PhysicalProperties:
+
+    def __init__(self, bodies):
+        # every body is a solid cube with a concentric cube cut out of it
+        self.volume = sum(b.volume for b in bodies)
+        self.area = sum(b.area for b in bodies)
+        self.mass = self.volume * DENSITY / 1000.0  # kg
+        center = [sum(b.volume * b.center[i] for b in bodies) / self.volume if self.volume else 0.0
+                  for i in range(3)]
+        self.centerOfMass = core.Point3D(*center)
+        moments = [0.0] * 6
+        for b in bodies:
+            m = b.volume * DENSITY / 1000.0
+            i = DENSITY / 1000.0 * (b.size**5 - b.pocket**5) / 6.0
+            x, y, z = b.center
+            for k, value in enumerate([i + m * (y*y + z*z), i + m * (x*x + z*z), i + m * (x*x + y*y),
+                                       -m * x * y, -m * y * z, -m * x * z]):
+                moments[k] += value
+        self._moments = moments
+
+    def getXYZMomentsOfInertia(self):
+        return (True,) + tuple(self._moments)
+
+
+class Occurrence:
+
+    def __init__(self, component, name, parent=None, transform=None, appearance=None):
+        self.component = component
+        self.name = name
+        self.parent = parent
+        self.isLightBulbOn = True
+        self.assemblyContext = None
+        self.childOccurrences = []
+        self.appearance = appearance
+        self.transform2 = transform or core.Matrix3D()
+        if parent is not None:
+            component.bRepBodies = BRepBodies()
+
+    @property
+    def transform(self):
+        return self.transform2
+
+    @property
+    def fullPathName(self):
+        return self.name
+
+    @property
+    def entityToken(self):
+        return self.name
+
+    @property
+    def bRepBodies(self):
+        return self.component.bRepBodies
+
+    @property
+    def boundingBox(self):
+        return BoundingBox3D(self.component.bRepBodies)
+
+    def getPhysicalProperties(self, accuracy):
+        return PhysicalProperties(self.component.bRepBodies)
+
+    def deleteMe(self):
+        counters['bodies'] -= len(self.component.bRepBodies)
+        self.parent.remove(self)
+
+    @staticmethod
+    def cast(value):
+        return value
+
+
+class JointGeometry:
+
+    def __init__(self, origin, axes=((1, 0, 0), (0, 1, 0), (0, 0, 1))):
+        """
+        origin (cm) and the x, y and z axis of the joint, in the world like
+        the geometry of a joint between two occurrences
+        """
+        self.origin = core.Point3D(*origin)
+        self.primaryAxisVector, self.secondaryAxisVector, self.thirdAxisVector = [core.Vector3D(*_) for _ in axes]
+
+
+class JointOrigin:
+
+    def __init__(self, origin, axes=((1, 0, 0), (0, 1, 0), (0, 0, 1))):
+        """
+        joint origin made in a component, its geometry is in the coordinates
+        of that component
+        """
+        self.geometry = JointGeometry(origin, axes)
+        self.primaryAxisVector = self.geometry.primaryAxisVector
+        self.secondaryAxisVector = self.geometry.secondaryAxisVector
+        self.thirdAxisVector = self.geometry.thirdAxisVector
+
+
+class JointLimits:
+
+    def __init__(self, limits=None):
+        self.isMinimumValueEnabled = self.isMaximumValueEnabled = limits is not None
+        self.minimumValue, self.maximumValue = limits or (0.0, 0.0)
+
+
+class JointMotion:
+
+    def __init__(self, joint_type, axis, direction, limits):
+        self.jointType = joint_type
+        self.rotationAxis = self.slideDirection = direction
+        self.rotationAxisVector = self.slideDirectionVector = core.Vector3D(*axis)
+        self.rotationLimits = self.slideLimits = JointLimits(limits)
+
+
+class Joint:
+
+    def __init__(self, name, joint_type, child, parent, origin, axis=(0, 0, 1), limits=None, child_side=None,
+                 direction=JointDirections.ZAxisJointDirection):
+        """
+        joint between the occurrences child (one) and parent (two), origin
+        in cm. child_side is the geometry of the child occurrence, the same
+        point as seen from the parent if None.
+        """
+        self.name = name
+        self.isLightBulbOn = True
+        self.jointMotion = JointMotion(joint_type, axis, direction, limits)
+        self.occurrenceOne = child
+        self.occurrenceTwo = parent
+        self.geometryOrOriginTwo = JointGeometry(origin)
+        self.geometryOrOriginOne = child_side or JointGeometry(origin)
+        self.assemblyContext = None
+        self.entityToken = name
+
+
+class TemporaryBRepManager:
+
+    @staticmethod
+    def get():
+        return TemporaryBRepManager()
+
+    def copy(self, body):
+        return BRepBody(body.size, body.center, body.appearance, body.pocket)
+
+
+class ExportManager:
+
+    def createSTLExportOptions(self, occ, file_name):
+        return occ, file_name
+
+    def execute(self, options):
+        occ, file_name = options
+        counters['exports'] += 1
+        triangles = [t for body in occ.component.bRepBodies for t in body.triangles()]
+        with open(file_name, 'wb') as f:
+            f.write(b'stub'.ljust(80, b' ') + struct.pack('<I', len(triangles)))
+            for triangle in triangles:
+                f.write(struct.pack('<3f', 0.0, 0.0, 0.0))
+                for vertex in triangle:
+                    f.write(struct.pack('<3f', *vertex))
+                f.write(b'\0\0')
+
+
+class Design:
+
+    def __init__(self, root):
+        self.rootComponent = root
+        self.exportManager = ExportManager()
+        self.designType = None
+
+    @property
+    def allComponents(self):
+        return [self.rootComponent] + [occ.component for occ in self.rootComponent.allOccurrences]
+
+    @staticmethod
+    def cast(value):
+        return value
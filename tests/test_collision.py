@@ -0,0 +1,47 @@
+import random
+
+from URDF_Exporter.core import Collision, Kinematics
+
+from conftest import make_joints
+
+
+def shuffled_joints(seed):
+    joints = make_joints()
+    names = list(joints)
+    random.Random(seed).shuffle(names)
+    return {name: joints[name] for name in names}
+
+
+def test_samples_do_not_depend_on_the_joint_order():
+    def samples(joints):
+        names = Kinematics.movable_joints(joints)
+        return {name: values for name, values in zip(names, zip(*Collision.sample_configurations(joints, 20)))}
+
+    expected = samples(make_joints())
+    for seed in range(5):
+        assert samples(shuffled_joints(seed)) == expected
+
+
+def test_disabled_collisions_do_not_depend_on_the_joint_order():
+    joints = make_joints()
+    origins = Kinematics.link_origins(joints)
+    # boxes which touch in some configurations only
+    boxes = {link: ([p - 0.025 for p in origin], [p + 0.025 for p in origin]) for link, origin in origins.items()}
+    boxes['base_link'] = ([-0.05, -0.05, -0.01], [0.05, 0.05, 0.0])
+    expected = sorted(Collision.disable_collisions(joints, boxes, 10))
+    for seed in range(5):
+        assert sorted(Collision.disable_collisions(shuffled_joints(seed), boxes, 10)) == expected
+
+
+def test_pairs_whose_boxes_always_overlap_stay_enabled():
+    joints = make_joints()
+    origins = Kinematics.link_origins(joints)
+    boxes = {link: ([p - 0.005 for p in origin], [p + 0.005 for p in origin]) for link, origin in origins.items()}
+    # hollow links, e.g. two wheel rims around the arm: the boxes overlap in
+    # every configuration, the meshes may still never touch
+    for link in ('wheel_1', 'wheel_2'):
+        boxes[link] = ([-0.2, -0.2, -0.1], [0.2, 0.2, 0.3])
+    disabled = Collision.disable_collisions(joints, boxes, 20)
+    assert [_ for _ in disabled if _[2] not in ('Adjacent', 'Never')] == []
+    assert not [_ for _ in disabled if set(_[:2]) == {'wheel_1', 'wheel_2'}]
+    assert ('base_link', 'cam_1', 'Never') in disabled
@@ -0,0 +1,43 @@
+import os
+
+import pytest
+
+import adsk.core, adsk.fusion
+
+from URDF_Exporter.utils import utils
+
+
+@pytest.fixture
+def app():
+    adsk.fusion.reset()
+    root = adsk.fusion.Component('root')
+    for name, count in (('base_link:1', 1), ('arm:1', 3), ('wheel:1', 2)):
+        root.occurrences.append(adsk.fusion.Occurrence(
+            adsk.fusion.Component(name.split(':')[0], [adsk.fusion.BRepBody() for _ in range(count)]), name))
+    yield adsk.core.Application(adsk.fusion.Design(root))
+    utils.release_export_document()
+
+
+def test_one_document_is_reused(app, tmp_path):
+    for i in range(3):
+        utils.export_stl(app, str(tmp_path))
+    assert adsk.fusion.counters['documents'] == 1
+    assert adsk.fusion.counters['exports'] == 9
+    utils.release_export_document()
+    assert adsk.fusion.counters['open_documents'] == 0
+
+
+def test_bodies_are_released_per_link(app, tmp_path):
+    memory = utils.export_stl(app, str(tmp_path))
+    assert sorted(os.listdir(str(tmp_path / 'meshes'))) == ['arm_1.stl', 'base_link.stl', 'wheel_1.stl']
+    # only the copies of one link are alive at a time, and none afterwards
+    assert adsk.fusion.counters['peak_bodies'] == 3
+    assert adsk.fusion.counters['bodies'] == 0
+    assert sorted(memory) == ['arm_1', 'base_link', 'wheel_1']
+
+
+def test_memory_is_measured_per_link(app, tmp_path, monkeypatch):
+    # the working set grows by 1 MB per live body copy
+    monkeypatch.setattr(utils, 'process_memory', lambda: 100 * 2**20 + adsk.fusion.counters['bodies'] * 2**20)
+    memory = utils.export_stl(app, str(tmp_path))
+    assert memory == {'base_link': 2**20, 'arm_1': 3 * 2**20, 'wheel_1': 2 * 2**20}
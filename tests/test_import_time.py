@@ -0,0 +1,43 @@
+import os, re, subprocess, sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STUBS = os.path.join(ROOT, 'tests', 'stubs')
+
+# loaded by the export, never when Fusion loads the add-in
+EXPORT_ONLY = ['argparse', 'concurrent.futures', 'fileinput', 'hashlib', 'json', 'numpy', 'random', 'shutil',
+               'tkinter', 'xml.dom.minidom', 'xml.etree.ElementTree', 'URDF_Exporter.core.Pipeline',
+               'URDF_Exporter.core.Render', 'URDF_Exporter.utils.mesh']
+
+# import time in s of what the add-in adds to what Fusion has loaded anyway,
+# generous so it only fails if something heavy is imported at load time again
+BUDGET = 0.05
+
+
+def run(code, *options):
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([STUBS, ROOT]))
+    return subprocess.run([sys.executable] + list(options) + ['-c', code], cwd=ROOT, env=env,
+                          capture_output=True, text=True, check=True)
+
+
+def import_times(code):
+    # -X importtime: "import time: self [us] | cumulative | imported package"
+    times = {}
+    for line in run(code, '-X', 'importtime').stderr.splitlines():
+        match = re.match(r'import time:\s+(\d+) \|\s+\d+ \|\s*(\S+)', line)
+        if match:
+            times[match.group(2)] = int(match.group(1)) * 1e-6
+    return times
+
+
+def test_export_modules_are_not_loaded_with_the_addin():
+    modules = set(run('import sys, URDF_Exporter.URDF_Exporter; print(" ".join(sorted(sys.modules)))').stdout.split())
+    assert 'URDF_Exporter.URDF_Exporter' in modules
+    assert [_ for _ in EXPORT_ONLY if _ in modules] == []
+
+
+def test_addin_import_time():
+    fusion = import_times('import adsk, adsk.core, adsk.fusion, traceback, os, sys')
+    addin = import_times('import URDF_Exporter.URDF_Exporter')
+    total = sum(t for module, t in addin.items() if module not in fusion)
+    assert total < BUDGET, 'loading the add-in took {:.3f} s: {}'.format(
+        total, ', '.join(sorted(module for module in addin if module not in fusion)))
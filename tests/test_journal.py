@@ -0,0 +1,91 @@
+import pytest
+
+from conftest import make_design
+
+from URDF_Exporter.core import Journal, Link, Names, Pipeline, Watch
+
+
+def test_record_lookup_resume(tmp_path):
+    file_name = str(tmp_path / '.fusion2urdf.journal')
+    journal = Journal.Journal(file_name)
+    journal.record('mesh', 'arm_1', 684, ('arm', 1.5))
+    journal.record('mesh', 'arm_1', 1284, ('arm', 2.0))
+    assert journal.resume('inertial', 'arm_1', ('arm', 2.0), lambda: {'mass': 1.0}) == {'mass': 1.0}
+
+    journal = Journal.Journal(file_name)
+    # the newest entry per key, tuples and lists are the same fingerprint
+    assert journal.lookup('mesh', 'arm_1', ('arm', 1.5)) is None
+    assert journal.lookup('mesh', 'arm_1', ['arm', 2.0]) == 1284
+    assert journal.resume('inertial', 'arm_1', ('arm', 2.0), lambda: pytest.fail('extracted again')) == {'mass': 1.0}
+    assert journal.resumed == [('mesh', 'arm_1'), ('inertial', 'arm_1')]
+    journal.remove()
+    assert not (tmp_path / '.fusion2urdf.journal').exists()
+
+
+def test_line_written_when_the_export_stopped_is_dropped(tmp_path):
+    file_name = str(tmp_path / '.fusion2urdf.journal')
+    journal = Journal.Journal(file_name)
+    journal.record('stage', 'names')
+    journal.record('mesh', 'arm_1', 684, 'a')
+    with open(file_name) as f:
+        data = f.read()
+    with open(file_name, mode='w') as f:
+        f.write(data[:-10])
+    journal = Journal.Journal(file_name)
+    assert list(journal.entries) == [('stage', 'names')]
+    journal.record('mesh', 'arm_1', 684, 'a')
+    assert Journal.Journal(file_name).lookup('mesh', 'arm_1', 'a') == 684
+
+
+def test_edit_which_keeps_the_bounding_box_is_extracted_again(tmp_path):
+    app, occurrences = make_design()
+    root = app.activeProduct.rootComponent
+    names = Names.NameRegistry(root)
+    journal = Journal.Journal(str(tmp_path / '.fusion2urdf.journal'))
+
+    def extract():
+        fingerprints = Watch.fingerprint(root, names)
+        resume = lambda kind, link, func: journal.resume(kind, link, fingerprints[link], func)
+        return Link.make_inertial_dict(root, 'ok', names, resume)[0]
+
+    before = extract()
+    occurrences['wheel:1'].bRepBodies[0].pocket = 0.5
+    after = extract()
+    assert journal.resumed.count(('inertial', 'wheel_1')) == 0
+    assert len(journal.resumed) == 5
+    assert after['wheel_1']['mass'] < before['wheel_1']['mass']
+
+
+def test_progress_fraction_and_eta(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(Pipeline.time, 'perf_counter', lambda: now[0])
+    progress = Pipeline.Progress()
+    progress.total = 4
+    progress.start('names')
+    progress.finish('names')
+    progress.start('stl', 10)
+    assert progress.eta('stl') is None
+    now[0] = 2.0
+    progress.step('stl', 4)
+    # one stage done and 4 of 10 steps of the next, 2 s for 4 steps
+    assert progress.fraction() == pytest.approx((1 + 0.4) / 4)
+    assert progress.eta('stl') == pytest.approx(3.0)
+    assert progress.describe('stl') == 'stl 4/10, 3 s left'
+    assert progress.eta('names') == 0.0 and progress.eta('model') is None
+
+
+def test_cancel_stops_the_pipeline():
+    ran = []
+
+    def on_progress(progress, stage):
+        if stage == 'stl':
+            progress.cancel()
+
+    pipeline = Pipeline.Pipeline(progress=Pipeline.Progress(on_progress))
+    pipeline.add('names', lambda: ran.append('names'), main_thread=True)
+    pipeline.add('stl', lambda _: ran.append('stl'), ['names'], main_thread=True)
+    pipeline.add('model', lambda _: ran.append('model'), ['stl'])
+    with pytest.raises(Pipeline.Cancelled) as error:
+        pipeline.run()
+    assert isinstance(error.value, Pipeline.ExportError)
+    assert ran == ['names']
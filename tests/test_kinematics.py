@@ -0,0 +1,49 @@
+import math
+
+import adsk.core, adsk.fusion
+from conftest import make_design
+
+from URDF_Exporter.core import Joint, Kinematics
+
+
+def extract(app):
+    joints, msg = Joint.make_joints_dict(app.activeProduct.rootComponent, 'ok')
+    assert msg == 'ok'
+    return joints
+
+
+def test_frames_of_the_design_match():
+    app, occurrences = make_design()
+    joints = extract(app)
+    assert joints['arm_joint']['child_frame']['origin'] == [0.0, 0.0, 0.0]
+    assert joints['wheel_1_joint']['child_frame']['axis'] == [1.0, 0.0, 0.0]
+    assert Kinematics.validate_frames(joints) == []
+
+
+def test_misplaced_occurrence_is_reported():
+    app, occurrences = make_design()
+    # the joint origin of the arm component is at its origin, but the
+    # occurrence is 2 cm above the origin the parent side reports
+    arm = occurrences['arm:1']
+    arm.transform2 = adsk.core.Matrix3D.translated(0, 0, 5)
+    joint = next(_ for _ in app.activeProduct.rootComponent.joints if _.name == 'arm_joint')
+    joint.geometryOrOriginOne = adsk.fusion.JointOrigin((0, 0, 0))
+    discrepancies = Kinematics.validate_frames(extract(app))
+    assert [_[0] for _ in discrepancies] == ['arm_1']
+    link, xyz, fusion_xyz, distance, angle = discrepancies[0]
+    assert xyz == [0.0, 0.0, 0.03]
+    assert fusion_xyz == [0.0, 0.0, 0.05]
+    assert abs(distance - 0.02) < 1e-6
+    assert angle == 0.0
+
+
+def test_rotated_occurrence_is_reported():
+    app, occurrences = make_design()
+    # the wheel occurrence is turned by 90 deg about z, so the x axis of its
+    # joint origin points along y while the exported axis is x
+    occurrences['wheel:1'].transform2 = adsk.core.Matrix3D([[0, -1, 0, 3], [1, 0, 0, 0], [0, 0, 1, 8], [0, 0, 0, 1]])
+    joint = next(_ for _ in app.activeProduct.rootComponent.joints if _.name == 'wheel_1_joint')
+    joint.geometryOrOriginOne = adsk.fusion.JointOrigin((0, 0, 0))
+    discrepancies = Kinematics.validate_frames(extract(app))
+    assert [(_[0], _[3]) for _ in discrepancies] == [('wheel_1', 0.0)]
+    assert abs(discrepancies[0][4] - math.pi / 2) < 1e-6
@@ -0,0 +1,77 @@
+import adsk.core
+
+from URDF_Exporter.core import Link, Names
+
+from conftest import make_design
+
+
+class CountingAppearance(adsk.core.Appearance):
+    """
+    appearance which counts how often its properties are read
+    """
+
+    def __init__(self, name, color, id=None):
+        super().__init__(name, color, id)
+        self.reads = 0
+
+    @property
+    def appearanceProperties(self):
+        self.reads += 1
+        return self._properties
+
+    @appearanceProperties.setter
+    def appearanceProperties(self, value):
+        self._properties = value
+
+
+def test_appearances_are_resolved_once_per_id():
+    cache = {}
+    red = CountingAppearance('Farbe - Rot (glänzend)', adsk.core.Color(255, 0, 0), 'red')
+    assert Link.resolve_appearance(red, cache) == ('rot_glaenzend', '1.0 0.0 0.0 1.0')
+    assert Link.resolve_appearance(red, cache) == ('rot_glaenzend', '1.0 0.0 0.0 1.0')
+    # another object of the same appearance is a cache hit as well
+    again = CountingAppearance('Farbe - Rot (glänzend)', adsk.core.Color(255, 0, 0), 'red')
+    assert Link.resolve_appearance(again, cache) == ('rot_glaenzend', '1.0 0.0 0.0 1.0')
+    assert (red.reads, again.reads) == (1, 0)
+    assert list(cache) == ['red']
+
+
+def test_design_reads_a_shared_appearance_once():
+    app, occurrences = make_design()
+    red = CountingAppearance('Farbe - Rot (glänzend)', adsk.core.Color(255, 0, 0), 'red')
+    for name in ('arm:1', 'bracket:1'):
+        occurrences[name].appearance = red
+    root = app.activeProduct.rootComponent
+    material_dict, color_dict, _ = Link.make_material_dict(root, 'ok', names=Names.NameRegistry(root))
+    assert material_dict['arm_1'] == material_dict['bracket_1'] == {'material': 'rot_glaenzend'}
+    assert material_dict['base_link'] == {'material': 'silver_default'}
+    assert red.reads == 1
+
+
+def test_quantize_color():
+    assert Link.quantize_color('0.996 0.004 0.0 1.0', 0.05) == '1.000 0.000 0.000 1.000'
+    assert Link.quantize_color('0.52 0.3 0.18 1.0', 0.1) == '0.500 0.300 0.200 1.000'
+
+
+def test_near_identical_colors_are_merged():
+    material_dict = {'arm_1': {'material': 'rot'}, 'bracket_1': {'material': 'red'},
+                     'cam_1': {'material': 'blau'}, 'base_link': {'material': 'silver_default'}}
+    color_dict = {'silver_default': '0.700 0.700 0.700 1.000', 'rot': '0.996 0.004 0.0 1.0',
+                  'red': '1.0 0.0 0.0 1.0', 'blau': '0.0 0.0 0.9 1.0'}
+    merged = Link.merge_colors(material_dict, color_dict, 0.05)
+    # the first name in alphabetical order is kept
+    assert merged == {'blau': '0.000 0.000 0.900 1.000', 'red': '1.000 0.000 0.000 1.000',
+                      'silver_default': '0.700 0.700 0.700 1.000'}
+    assert material_dict == {'arm_1': {'material': 'red'}, 'bracket_1': {'material': 'red'},
+                             'cam_1': {'material': 'blau'}, 'base_link': {'material': 'silver_default'}}
+
+
+def test_color_step_in_a_design():
+    app, occurrences = make_design()
+    occurrences['cam:1'].appearance = adsk.core.Appearance('Farbe - Rot', adsk.core.Color(254, 1, 0), 'rot')
+    root = app.activeProduct.rootComponent
+    material_dict, color_dict, _ = Link.make_material_dict(root, 'ok', 0.05, Names.NameRegistry(root))
+    assert sorted(color_dict) == ['rot', 'silver_default']
+    assert set(material_dict[_]['material'] for _ in ('arm_1', 'bracket_1', 'cam_1')) == {'rot'}
+    exact = Link.make_material_dict(root, 'ok', 0, Names.NameRegistry(root))[1]
+    assert sorted(exact) == ['rot', 'rot_glaenzend', 'silver_default']
@@ -0,0 +1,44 @@
+from xml.etree import ElementTree
+
+from URDF_Exporter.core import Model, Render
+
+from conftest import _joint, save_model
+
+
+def render(tmp_path, joints, components):
+    model_file = save_model(str(tmp_path / 'model'), joints, components)
+    save_dir = str(tmp_path / 'out' / 'bot_description')
+    pipeline = Model.render_model(Model.load_model(model_file), {1: save_dir}, macros=True)
+    robot = ElementTree.parse(save_dir + '/urdf/bot.urdf').getroot()
+    return pipeline, robot
+
+
+def test_root_joint_is_part_of_the_macro(tmp_path):
+    joints = {}
+    for i, x in enumerate((0.1, 0.2, 0.3, 0.4)):
+        joint_type, axis = ('fixed', [0, 0, 0]) if i == 3 else ('continuous', [0, 1, 0])
+        joints['w{}_j'.format(i + 1)] = _joint(joint_type, axis, 'base_link', 'w{}'.format(i + 1), [x, 0.0, 0.0])
+    pipeline, robot = render(tmp_path, joints, {'w1': 'wheel', 'w2': 'wheel', 'w3': 'wheel', 'w4': 'wheel'})
+    assert Render.problems(pipeline) == {}
+    types = {_.get('name'): _.get('type') for _ in robot.findall('joint')}
+    assert types == {'w1_j': 'continuous', 'w2_j': 'continuous', 'w3_j': 'continuous', 'w4_j': 'fixed'}
+    w4_j = [_ for _ in robot.findall('joint') if _.get('name') == 'w4_j'][0]
+    assert w4_j.find('axis') is None
+
+
+def test_nested_repeats_are_written_once(tmp_path):
+    # two identical legs with a wheel each, and two more of these wheels on the base
+    joints = {
+        'a_leg_j': _joint('revolute', [0, 0, 1], 'base_link', 'a_leg', [0.1, 0.0, 0.0], (-1, 1)),
+        'b_leg_j': _joint('revolute', [0, 0, 1], 'base_link', 'b_leg', [0.2, 0.0, 0.0], (-1, 1)),
+        'wa_j': _joint('continuous', [0, 1, 0], 'a_leg', 'wa', [0.1, 0.0, -0.1]),
+        'wb_j': _joint('continuous', [0, 1, 0], 'b_leg', 'wb', [0.2, 0.0, -0.1]),
+        'wc_j': _joint('continuous', [0, 1, 0], 'base_link', 'wc', [0.3, 0.0, 0.0]),
+        'wd_j': _joint('continuous', [0, 1, 0], 'base_link', 'wd', [0.4, 0.0, 0.0]),
+    }
+    components = {'a_leg': 'leg', 'b_leg': 'leg', 'wa': 'wheel', 'wb': 'wheel', 'wc': 'wheel', 'wd': 'wheel'}
+    pipeline, robot = render(tmp_path, joints, components)
+    assert Render.problems(pipeline) == {}
+    links = [_.get('name') for _ in robot.findall('link')]
+    assert sorted(links) == ['a_leg', 'b_leg', 'base_link', 'wa', 'wb', 'wc', 'wd']
+    assert sorted(_.get('name') for _ in robot.findall('joint')) == sorted(joints)
@@ -0,0 +1,90 @@
+import os
+
+import pytest
+
+from URDF_Exporter.core import Merge
+from URDF_Exporter.utils import mesh
+
+from conftest import box, make_joints
+
+
+def point(mass, center_of_mass):
+    return {'mass': mass, 'center_of_mass': center_of_mass, 'inertia': [0.0] * 6}
+
+
+def make_inertials(joints):
+    origins = {'base_link': [0.0, 0.0, 0.0]}
+    origins.update({_['child']: _['xyz'] for _ in joints.values()})
+    return {link: dict(point(1.0, origin), name=link) for link, origin in origins.items()}
+
+
+def test_combine_point_masses():
+    combined = Merge.combine_inertials([point(1.0, [0.0, 0.0, 0.0]), point(3.0, [0.4, 0.2, 0.0])])
+    assert combined['mass'] == 4.0
+    assert combined['center_of_mass'] == pytest.approx([0.3, 0.15, 0.0])
+    # parallel axis theorem: sum of m d^2 about the common center of mass
+    # with d = (-0.3, -0.15, 0) and (0.1, 0.05, 0)
+    assert combined['inertia'] == pytest.approx([0.03, 0.12, 0.15, -0.06, 0.0, 0.0])
+
+
+def test_combine_keeps_the_own_inertia():
+    body = {'mass': 2.0, 'center_of_mass': [0.0, 0.0, 0.1], 'inertia': [0.01, 0.02, 0.03, 0.001, 0.0, 0.0]}
+    combined = Merge.combine_inertials([body, point(2.0, [0.0, 0.0, -0.1])])
+    assert combined['center_of_mass'] == pytest.approx([0.0, 0.0, 0.0])
+    assert combined['inertia'] == pytest.approx([0.05, 0.06, 0.03, 0.001, 0.0, 0.0])
+
+
+def test_fixed_chain_is_folded_into_the_moving_link():
+    joints = make_joints()
+    inertials = make_inertials(joints)
+    materials = {link: {'material': 'silver_default'} for link in inertials}
+    new_joints, new_inertials, new_materials, merged = Merge.merge_fixed_joints(joints, inertials, materials)
+    assert merged == {'arm_1': ['bracket_1', 'cam_1']}
+    assert sorted(new_joints) == ['arm_joint', 'wheel_1_joint', 'wheel_2_joint']
+    assert sorted(new_inertials) == sorted(new_materials) == ['arm_1', 'base_link', 'wheel_1', 'wheel_2']
+    assert new_inertials['arm_1']['mass'] == 3.0
+    assert new_inertials['arm_1']['name'] == 'arm_1'
+    # the input is not changed
+    assert 'cam_1' in inertials and inertials['arm_1']['mass'] == 1.0
+
+
+@pytest.mark.parametrize('keep, expected', [
+    (['bracket_1'], {'bracket_1': ['cam_1']}),
+    (['cam_1'], {'arm_1': ['bracket_1']}),
+])
+def test_kept_frames(keep, expected):
+    joints = make_joints()
+    inertials = make_inertials(joints)
+    materials = {link: {'material': 'silver_default'} for link in inertials}
+    new_joints, new_inertials, _, merged = Merge.merge_fixed_joints(joints, inertials, materials, keep)
+    assert merged == expected
+    for link in keep:
+        assert link in new_inertials
+    if keep == ['cam_1']:
+        # the kept link hangs from the link its parent was merged into
+        assert 'bracket_joint' not in new_joints
+        assert new_joints['cam_joint']['parent'] == 'arm_1'
+        assert joints['cam_joint']['parent'] == 'bracket_1'
+    else:
+        assert new_joints['bracket_joint']['parent'] == 'arm_1'
+        assert 'cam_joint' not in new_joints
+        assert new_inertials['bracket_1']['mass'] == 2.0
+
+
+@pytest.mark.parametrize('keep', [[], ['cam_1']])
+def test_meshes_follow_the_merge(tmp_path, keep):
+    joints = make_joints()
+    inertials = make_inertials(joints)
+    for link, inertial in inertials.items():
+        mesh.write_stl(str(tmp_path / (link + '.stl')), box(inertial['center_of_mass'], 0.01))
+    merged = Merge.merge_fixed_joints(joints, inertials, {}, keep)[3]
+    mesh.merge_meshes(str(tmp_path), merged)
+
+    files = sorted(_[:-4] for _ in os.listdir(str(tmp_path)))
+    assert files == sorted(['base_link', 'arm_1', 'wheel_1', 'wheel_2'] + keep)
+    # 12 triangles per box
+    assert len(mesh.read_stl(str(tmp_path / 'arm_1.stl'))) == 12 * (1 + len(merged['arm_1']))
+    points = [p for triangle in mesh.read_stl(str(tmp_path / 'arm_1.stl')) for p in triangle]
+    # the merged boxes keep their place in the world, the bracket ends at
+    # y = 25 mm and the camera at 35 mm
+    assert max(p[1] for p in points) == pytest.approx(25.0 if 'cam_1' in keep else 35.0)
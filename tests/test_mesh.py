@@ -0,0 +1,77 @@
+import json, os
+
+import pytest
+
+from URDF_Exporter.utils import mesh, mesh_store
+
+from conftest import box
+
+
+def test_localize_meshes_follows_the_link_origin(tmp_path):
+    file_name = str(tmp_path / 'link.stl')
+    mesh.write_stl(file_name, box([0.1, 0.2, 0.3], 0.01))
+    assert mesh.localize_meshes(str(tmp_path), {'link': [0.1, 0.2, 0.3]}) == ['link']
+    assert mesh.local_origin(file_name) == [0.1, 0.2, 0.3]
+    assert mesh.localize_meshes(str(tmp_path), {'link': [0.1, 0.2, 0.3]}) == []
+
+    # the joint moved: the mesh is moved into the new frame, not kept in the old one
+    assert mesh.localize_meshes(str(tmp_path), {'link': [0.1, 0.2, 0.25]}) == ['link']
+    assert mesh.local_origin(file_name) == [0.1, 0.2, 0.25]
+    points = [p for triangle in mesh.read_stl(file_name) for p in triangle]
+    assert abs(min(p[2] for p in points) - 0.045) < 1e-6
+    assert abs(max(p[2] for p in points) - 0.055) < 1e-6
+
+
+def test_local_meshes_in_other_frames_are_stored_apart(tmp_path):
+    for name, origin in (('a', [0.1, 0.0, 0.0]), ('b', [0.2, 0.0, 0.0])):
+        mesh.write_stl(str(tmp_path / (name + '.stl')), box(origin, 0.01))
+        mesh.localize_meshes(str(tmp_path), {name: origin})
+    assert mesh_store.geometry_hash(str(tmp_path / 'a.stl')) != mesh_store.geometry_hash(str(tmp_path / 'b.stl'))
+
+
+@pytest.mark.parametrize('accelerated', [True, False])
+def test_mass_properties_of_a_box(monkeypatch, accelerated):
+    if not accelerated:
+        monkeypatch.setattr(mesh.utils, 'optional_import', lambda name: None)
+    # a 0.2 x 0.4 x 0.6 m box of 2 kg around (0.1, 0.2, 0.3) m, large enough
+    # for the inertia rounded to 1e-6 by origin2center_of_mass
+    a, b, c = 0.2, 0.4, 0.6
+    center = [0.1, 0.2, 0.3]
+    # the unit cube in mm stretched into the box in m
+    triangles = [[[center[i] + p[i] / 1000 * (a, b, c)[i] for i in range(3)] for p in triangle]
+                 for triangle in box([0.0, 0.0, 0.0], 1.0)]
+    result = mesh.mass_properties(triangles, mass=2.0, scale=1.0)
+    m = 2.0
+    assert result['volume'] == pytest.approx(a * b * c)
+    assert result['mass'] == pytest.approx(m)
+    assert result['center_of_mass'] == pytest.approx(center)
+    expected = [m * (b*b + c*c) / 12, m * (a*a + c*c) / 12, m * (a*a + b*b) / 12, 0.0, 0.0, 0.0]
+    assert result['inertia'] == pytest.approx(expected, abs=1e-6)
+
+
+def test_compare_inertial_tolerances():
+    inertial = {'center_of_mass': [0.0, 0.0, 0.0], 'inertia': [1e-4, 1e-4, 1e-4, 0.0, 0.0, 0.0]}
+    close = {'center_of_mass': [0.0005, 0.0, 0.0], 'inertia': [1.04e-4, 1e-4, 1e-4, 0.0, 0.0, 0.0]}
+    assert mesh.compare_inertial(close, inertial) == []
+    # a centimeter is far off for a center of mass, 4 % is not for an inertia
+    far = {'center_of_mass': [0.01, 0.0, 0.0], 'inertia': [1.04e-4, 1e-4, 1e-4, 0.0, 0.0, 0.0]}
+    assert mesh.compare_inertial(far, inertial) == ['center of mass differs by 0.010000 m']
+    assert mesh.compare_inertial(far, inertial, com_tolerance=0.02, inertia_tolerance=0.01) == \
+        ['inertia differs by 4.0%']
+
+
+def test_model_inertials_match_their_meshes(model_file):
+    directory = os.path.dirname(model_file)
+    with open(model_file) as f:
+        inertials = json.load(f)['inertials']
+    assert mesh.check_inertial_dict(inertials, os.path.join(directory, 'meshes')) == {}
+
+
+def test_local_meshes_need_the_link_origins(tmp_path):
+    mesh.write_stl(str(tmp_path / 'link.stl'), box([0.1, 0.2, 0.3], 0.01))
+    mesh.localize_meshes(str(tmp_path), {'link': [0.1, 0.2, 0.3]})
+    inertials = {'link': {'mass': 1.0, 'center_of_mass': [0.1, 0.2, 0.3],
+                          'inertia': [2e-4 / 12] * 3 + [0.0] * 3}}
+    with pytest.raises(ValueError, match='origin of link'):
+        mesh.check_inertial_dict(inertials, str(tmp_path))
+    assert mesh.check_inertial_dict(inertials, str(tmp_path), origins={'link': [0.1, 0.2, 0.3]}) == {}
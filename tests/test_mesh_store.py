@@ -0,0 +1,86 @@
+import itertools, os
+
+import pytest
+
+from URDF_Exporter.utils import mesh, mesh_store
+
+from conftest import box
+
+# a binary stl of a box: header, count and 12 triangles
+SIZE = 84 + 12 * 50
+
+
+def make_package(directory, meshes, header=b'Fusion2URDF'):
+    os.makedirs(os.path.join(directory, 'meshes'))
+    for name, center in meshes.items():
+        mesh.write_stl(os.path.join(directory, 'meshes', name + '.stl'), box(center, 0.01), header)
+    return os.path.join(directory, 'meshes')
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    # every add uses a later time
+    ticks = itertools.count(1000)
+    monkeypatch.setattr(mesh_store.time, 'time', lambda: float(next(ticks)))
+
+
+def test_same_geometry_is_stored_once(tmp_path):
+    store = mesh_store.MeshStore(str(tmp_path / 'store'))
+    a = make_package(str(tmp_path / 'a'), {'wheel': [0.1, 0.0, 0.0], 'base': [0.0, 0.0, 0.0]})
+    # another robot with the same wheel, exported at another time
+    b = make_package(str(tmp_path / 'b'), {'tire': [0.1, 0.0, 0.0], 'arm': [0.0, 0.0, 0.2]}, b'exported later')
+    assert store.add_dir(a) == {'base': False, 'wheel': False}
+    assert store.add_dir(b) == {'arm': False, 'tire': True}
+
+    wheel, tire = os.path.join(a, 'wheel.stl'), os.path.join(b, 'tire.stl')
+    assert os.path.samefile(wheel, tire)
+    assert os.path.samefile(wheel, store.path(mesh_store.geometry_hash(wheel)))
+    assert os.stat(wheel).st_nlink == 3
+    assert store.stats() == {'meshes': 3, 'bytes': 3 * SIZE, 'hits': 1, 'misses': 3, 'hit_rate': 0.25,
+                             'saved': SIZE}
+
+    # the index is kept for the next export
+    assert mesh_store.MeshStore(str(tmp_path / 'store')).stats() == store.stats()
+
+
+def test_least_recently_used_meshes_are_evicted(tmp_path, clock):
+    # MESH_STORE_MAX_MB of two and a half meshes
+    max_mb = 2.5 * SIZE / 2**20
+    store = mesh_store.MeshStore(str(tmp_path / 'store'), int(max_mb * 2**20))
+    package = make_package(str(tmp_path / 'a'), {'a': [0.0, 0.0, 0.0], 'b': [0.1, 0.0, 0.0],
+                                                  'c': [0.2, 0.0, 0.0]})
+    digests = {name: mesh_store.geometry_hash(os.path.join(package, name + '.stl')) for name in 'abc'}
+    for name in ('a', 'b', 'a', 'c'):
+        store.add(os.path.join(package, name + '.stl'))
+    # b was used least recently, a was added again after it
+    assert store.evict() == 1
+    assert sorted(store.index['objects']) == sorted([digests['a'], digests['c']])
+    assert not os.path.exists(store.path(digests['b']))
+    # the package keeps its copy of the evicted mesh
+    assert mesh_store.geometry_hash(os.path.join(package, 'b.stl')) == digests['b']
+    assert os.stat(os.path.join(package, 'b.stl')).st_nlink == 1
+
+
+def test_evict_command(tmp_path, clock, capsys):
+    store = mesh_store.MeshStore(str(tmp_path / 'store'))
+    store.add_dir(make_package(str(tmp_path / 'a'), {'a': [0.0, 0.0, 0.0], 'b': [0.1, 0.0, 0.0]}))
+    mesh_store.main([str(tmp_path / 'store'), 'evict', '--max-mb', str(1.5 * SIZE / 2**20)])
+    assert capsys.readouterr().out.startswith('evicted 1 meshes\n1 meshes')
+    assert mesh_store.MeshStore(str(tmp_path / 'store')).stats()['meshes'] == 1
+
+
+def test_writing_a_mesh_never_changes_the_store(tmp_path):
+    store = mesh_store.MeshStore(str(tmp_path / 'store'))
+    a = make_package(str(tmp_path / 'a'), {'wheel': [0.1, 0.0, 0.0]})
+    b = make_package(str(tmp_path / 'b'), {'wheel': [0.1, 0.0, 0.0]})
+    store.add_dir(a)
+    store.add_dir(b)
+    digest = mesh_store.geometry_hash(os.path.join(a, 'wheel.stl'))
+
+    # the next export of a writes another wheel and moves it into its frame
+    mesh.write_stl(os.path.join(a, 'wheel.stl'), box([0.1, 0.0, 0.0], 0.02))
+    assert mesh.localize_meshes(a, {'wheel': [0.1, 0.0, 0.0]}) == ['wheel']
+    assert mesh_store.geometry_hash(store.path(digest)) == digest
+    assert mesh_store.geometry_hash(os.path.join(b, 'wheel.stl')) == digest
+    assert not os.path.samefile(os.path.join(a, 'wheel.stl'), os.path.join(b, 'wheel.stl'))
+    assert os.stat(store.path(digest)).st_nlink == 2
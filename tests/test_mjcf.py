@@ -0,0 +1,90 @@
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from URDF_Exporter.core import Model, Render
+
+from conftest import _joint, make_joints, save_model
+
+
+def vector(text):
+    return [float(_) for _ in text.split()]
+
+
+def write(tmp_path, **options):
+    joints = make_joints()
+    joints['wheel_2_joint'] = _joint('prismatic', [0, 0, 1], 'arm_1', 'wheel_2', [-0.03, 0.0, 0.08], (0.0, 0.05))
+    data = Model.load_model(save_model(str(tmp_path / 'model'), joints))
+    data['inertials']['arm_1']['inertia'] = [1.0, 2.0, 3.0, 4.0, 5.0, 6.0]
+    save_dir = str(tmp_path / 'bot_description')
+    pipeline = Model.render_model(data, {1: save_dir}, mjcf=True, **options)
+    assert Render.problems(pipeline) == {}
+    return ET.parse(save_dir + '/mjcf/bot.xml').getroot()
+
+
+def test_bodies_are_nested_like_the_tree(tmp_path):
+    mujoco = write(tmp_path, canonical=True)
+    base = mujoco.find('worldbody/body')
+    assert base.get('name') == 'base_link'
+    assert [_.get('name') for _ in base.findall('body')] == ['arm_1']
+    arm = base.find('body')
+    assert [_.get('name') for _ in arm.findall('body')] == ['bracket_1', 'wheel_1', 'wheel_2']
+    assert [_.get('name') for _ in arm.find("body[@name='bracket_1']").findall('body')] == ['cam_1']
+    # positions relative to the parent body
+    assert vector(arm.get('pos')) == pytest.approx([0.0, 0.0, 0.03])
+    assert vector(arm.find("body[@name='bracket_1']").get('pos')) == pytest.approx([0.0, 0.02, 0.05])
+    assert [_.get('joint') for _ in mujoco.findall('actuator/motor')] == ['arm_joint', 'wheel_1_joint', 'wheel_2_joint']
+
+
+def test_full_inertia_order(tmp_path):
+    arm = write(tmp_path).find(".//body[@name='arm_1']")
+    # inertial_dict has xx yy zz xy yz xz, MuJoCo wants xx yy zz xy xz yz
+    assert vector(arm.find('inertial').get('fullinertia')) == [1.0, 2.0, 3.0, 4.0, 6.0, 5.0]
+    assert float(arm.find('inertial').get('mass')) == 1.0
+    # the center of mass is in the body frame
+    assert vector(arm.find('inertial').get('pos')) == pytest.approx([0.0, 0.0, 0.0])
+
+
+def test_joint_ranges(tmp_path):
+    mujoco = write(tmp_path)
+    joints = {_.get('name'): _ for _ in mujoco.iter('joint')}
+    assert joints['arm_joint'].get('type') == 'hinge'
+    assert joints['arm_joint'].get('limited') == 'true'
+    assert vector(joints['arm_joint'].get('range')) == [-1.5, 1.5]
+    assert joints['wheel_1_joint'].get('type') == 'hinge'
+    assert joints['wheel_1_joint'].get('range') is None
+    assert vector(joints['wheel_1_joint'].get('axis')) == [1.0, 0.0, 0.0]
+    assert joints['wheel_2_joint'].get('type') == 'slide'
+    assert vector(joints['wheel_2_joint'].get('range')) == [0.0, 0.05]
+    # fixed joints weld the bodies
+    assert 'bracket_joint' not in joints and 'cam_joint' not in joints
+
+
+def test_mesh_collision(tmp_path):
+    mujoco = write(tmp_path)
+    assert sorted(_.get('name') for _ in mujoco.findall('asset/mesh')) == \
+        ['arm_1', 'base_link', 'bracket_1', 'cam_1', 'wheel_1', 'wheel_2']
+    for body in mujoco.iter('body'):
+        geoms = body.findall('geom')
+        assert [(_.get('type'), _.get('mesh')) for _ in geoms] == [('mesh', body.get('name'))]
+        assert geoms[0].get('contype') is None
+
+
+def test_box_collision(tmp_path):
+    mujoco = write(tmp_path, mjcf_collision='box')
+    for body in mujoco.iter('body'):
+        visual, collision = body.findall('geom')
+        assert visual.get('type') == 'mesh'
+        assert (visual.get('contype'), visual.get('conaffinity')) == ('0', '0')
+        assert collision.get('type') == 'box'
+        assert collision.get('name') == body.get('name') + '_collision'
+        # the 1 cm cube around the link origin
+        assert vector(collision.get('pos')) == pytest.approx([0.0, 0.0, 0.0], abs=1e-6)
+        assert vector(collision.get('size')) == pytest.approx([0.005] * 3, abs=1e-6)
+
+
+def test_freejoint(tmp_path):
+    assert write(tmp_path / 'welded').find('.//freejoint') is None
+    base = write(tmp_path / 'free', mjcf_freejoint=True).find('worldbody/body')
+    assert base[0].tag == 'freejoint'
+    assert len(list(base.iter('freejoint'))) == 1
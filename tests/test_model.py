@@ -0,0 +1,48 @@
+import json, os, types
+
+import pytest
+
+from URDF_Exporter.core import Model, Render
+
+
+def read_tree(directory):
+    files = {}
+    for path, _, names in os.walk(directory):
+        for name in names:
+            with open(os.path.join(path, name), 'rb') as f:
+                files[os.path.relpath(os.path.join(path, name), directory)] = f.read()
+    return files
+
+
+def render(data, directory, **options):
+    save_dirs = {version: os.path.join(directory, 'ros{}'.format(version), 'bot_description') for version in (1, 2)}
+    pipeline = Model.render_model(data, save_dirs, srdf=True, mjcf=True, **options)
+    assert Render.problems(pipeline) == {}
+    return save_dirs
+
+
+@pytest.mark.parametrize('canonical', [False, True])
+def test_saved_model_renders_the_same_package(model_file, tmp_path, canonical):
+    data = Model.load_model(model_file)
+    first = render(data, str(tmp_path / 'first'), canonical=canonical)
+
+    # save the model next to the rendered package like the exporter does
+    # and render it from there
+    file_name = os.path.join(first[1], 'bot.model.json')
+    model = (data['joints'], data['inertials'], (data['materials'], data['colors']), data['merged'])
+    names = types.SimpleNamespace(names=data['names'], base_link=data['base_link'])
+    meshes = {link: os.path.join(first[1], 'meshes', link + '.stl') for link in data['meshes']}
+    Model.save_model(file_name, data['robot_name'], data['package_name'], model, names, meshes)
+    loaded = Model.load_model(file_name)
+    assert loaded['meshes'] == meshes
+    for key in ('robot_name', 'package_name', 'joints', 'inertials', 'materials', 'colors', 'merged', 'names',
+                'base_link', 'local_meshes'):
+        assert loaded[key] == data[key], key
+    with open(file_name) as f:
+        assert json.load(f)['meshes'] == {link: 'meshes/' + link + '.stl' for link in data['meshes']}
+
+    second = render(loaded, str(tmp_path / 'second'), canonical=canonical)
+    for version in (1, 2):
+        expected = read_tree(first[version])
+        expected.pop('bot.model.json', None)
+        assert read_tree(second[version]) == expected
@@ -0,0 +1,46 @@
+import random
+
+import adsk.fusion
+
+from URDF_Exporter.core import Names
+
+
+def make_root(names, seed=None):
+    root = adsk.fusion.Component('bot v1')
+    for name in names:
+        component = adsk.fusion.Component(name.split(':')[0], [adsk.fusion.BRepBody()])
+        root.occurrences.append(adsk.fusion.Occurrence(component, name))
+    if seed is not None:
+        random.Random(seed).shuffle(root.occurrences)
+    return root
+
+
+def test_duplicate_names_get_a_suffix():
+    registry = Names.NameRegistry(make_root(['base_link:1', 'a_b:1', 'a b:1', 'a(b):1', 'wheel:1']))
+    # 'a b:1' sorts first and keeps the name
+    assert registry.names == {'base_link:1': 'base_link', 'a b:1': 'a_b_1', 'a(b):1': 'a_b__1',
+                              'a_b:1': 'a_b_1_2', 'wheel:1': 'wheel_1'}
+    assert registry.collisions == [('a_b:1', 'a_b_1_2')]
+    assert len(set(registry.names.values())) == len(registry.names)
+
+
+def test_one_base_link():
+    names = ['base_link:2', 'base_link:1', 'base link:1', 'arm:1']
+    expected = Names.NameRegistry(make_root(names)).names
+    # the first base_link occurrence in name order is the root link, the
+    # others and an occurrence which sanitizes to the same name are links
+    assert expected == {'base_link:1': 'base_link', 'base link:1': 'base_link_1',
+                        'base_link:2': 'base_link_2', 'arm:1': 'arm_1'}
+    for seed in range(5):
+        registry = Names.NameRegistry(make_root(names, seed))
+        assert registry.names == expected
+        assert registry.base_link == 'base_link:1'
+        assert list(registry.names.values()).count('base_link') == 1
+
+
+def test_renamed_base_link_collision():
+    registry = Names.NameRegistry(make_root(['frame:1', 'base_link:1']))
+    occurrence = adsk.fusion.Occurrence(adsk.fusion.Component('frame'), 'base_link')
+    assert registry.name(occurrence) == 'base_link_2'
+    assert not registry.is_base_link(occurrence)
+    assert registry.collisions == [('base_link', 'base_link_2')]
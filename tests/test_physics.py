@@ -0,0 +1,77 @@
+import os
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from URDF_Exporter.core import Collision, Kinematics, Model, Physics, Render
+
+from conftest import make_joints
+
+
+def link_boxes(half):
+    origins = Kinematics.link_origins(make_joints())
+    return {link: ([p - half for p in origin], [p + half for p in origin]) for link, origin in origins.items()}
+
+
+def test_self_collide_covers_every_pair_which_can_touch():
+    joints = make_joints()
+    boxes = link_boxes(0.025)
+    links = Physics.self_collide_links(joints, boxes, 50)
+    disabled = set(frozenset(_[:2]) for _ in Collision.disable_collisions(joints, boxes, 50))
+    names = sorted(boxes)
+    enabled = [(a, b) for i, a in enumerate(names) for b in names[i + 1:] if frozenset((a, b)) not in disabled]
+    assert enabled
+    assert all(a in links or b in links for a, b in enabled)
+    # one link of every pair is enough
+    assert len(links) < len(set(_ for pair in enabled for _ in pair))
+
+
+def test_no_self_collide_for_links_which_never_touch():
+    assert Physics.self_collide_links(make_joints(), link_boxes(0.001), 50) == set()
+
+
+@pytest.mark.parametrize('profile', sorted(Physics.PROFILES))
+def test_world_has_the_physics_of_the_profile(tmp_path, profile):
+    Physics.write_world('bot', str(tmp_path), profile)
+    settings = Physics.PROFILES[profile]
+    physics = ET.parse(str(tmp_path / 'worlds' / 'bot.world')).find('world/physics')
+    assert physics.get('name') == profile
+    assert float(physics.find('max_step_size').text) == settings['max_step_size']
+    assert int(physics.find('real_time_update_rate').text) == round(1 / settings['max_step_size'])
+    assert int(physics.find('max_contacts').text) == settings['max_contacts']
+    assert int(physics.find('ode/solver/iters').text) == settings['iters']
+
+
+@pytest.mark.parametrize('profile', sorted(Physics.PROFILES))
+def test_package_follows_the_profile(model_file, tmp_path, profile):
+    settings = Physics.PROFILES[profile]
+    save_dirs = {version: str(tmp_path / 'ros{}'.format(version) / 'bot_description') for version in (1, 2)}
+    pipeline = Model.render_model(Model.load_model(model_file), save_dirs, gazebo_profile=profile)
+    assert Render.problems(pipeline) == {}
+
+    with open(save_dirs[1] + '/urdf/bot.gazebo') as f:
+        gazebo = ET.fromstring(f.read())
+    assert float(gazebo.find('gazebo/plugin/controlPeriod').text) == settings['max_step_size']
+    references = gazebo.findall('gazebo[@reference]')
+    assert references
+    assert all(int(_.find('maxContacts').text) == settings['max_contacts'] for _ in references)
+    self_collide = set(_.get('reference') for _ in references if _.find('selfCollide').text == 'true')
+    assert self_collide == pipeline.results['self_collide']
+    if settings['self_collide'] == 'none':
+        assert self_collide == set()
+    assert os.path.exists(save_dirs[1] + '/worlds/bot.world')
+
+    with open(save_dirs[2] + '/config/controllers.yaml') as f:
+        assert '    update_rate: {}  # Hz\n'.format(int(round(1 / settings['max_step_size']))) in f.read()
+
+
+def test_profile_costs():
+    costs = Physics.profile_costs(make_joints(), link_boxes(0.025), 50)
+    assert list(costs) == ['default'] + list(Physics.PROFILES)
+    for name, settings in Physics.PROFILES.items():
+        steps = int(round(1 / settings['max_step_size']))
+        assert costs[name]['steps'] == steps
+        assert costs[name]['iterations'] == steps * settings['iters']
+        assert costs[name]['pair_checks'] == steps * costs[name]['pairs']
+    assert costs['fast']['pairs'] == 0
+    assert costs['default']['pairs'] >= costs['accurate']['pairs'] == costs['balanced']['pairs']
@@ -0,0 +1,118 @@
+import os, threading, time
+
+import pytest
+
+from URDF_Exporter.core import Pipeline
+from URDF_Exporter.utils import utils
+
+import benchmark_render
+
+PACKAGES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'URDF_Exporter')
+
+
+def test_stages_run_after_their_dependencies():
+    pipeline = Pipeline.Pipeline()
+    ran = []
+    pipeline.add('save', lambda a, b: ran.append('save') or a + b, ['render', 'stl'])
+    pipeline.add('render', lambda model: ran.append('render') or model * 2, ['model'])
+    pipeline.add('stl', lambda: ran.append('stl') or 1, main_thread=True)
+    pipeline.add('model', lambda: ran.append('model') or 20, main_thread=True)
+    order = pipeline.order()
+    assert order.index('model') < order.index('render') < order.index('save')
+    assert pipeline.run()['save'] == 41
+    assert ran.index('render') > ran.index('model') and ran[-1] == 'save'
+
+
+def test_invalid_dependencies():
+    pipeline = Pipeline.Pipeline()
+    pipeline.add('a', lambda _: None, ['b'])
+    pipeline.add('b', lambda _: None, ['a'])
+    with pytest.raises(ValueError):
+        pipeline.order()
+    pipeline = Pipeline.Pipeline()
+    pipeline.add('a', lambda _: None, ['missing'])
+    with pytest.raises(ValueError):
+        pipeline.run()
+
+
+def test_main_thread_stages_overlap_with_the_pool():
+    pipeline = Pipeline.Pipeline()
+    threads = {}
+    started = threading.Event()
+
+    def render():
+        threads['render'] = threading.current_thread()
+        started.set()
+        time.sleep(0.1)
+
+    def stl():
+        threads['stl'] = threading.current_thread()
+        # the background stage runs meanwhile
+        assert started.wait(1.0)
+
+    pipeline.add('render', render)
+    pipeline.add('stl', stl, main_thread=True)
+    pipeline.run()
+    assert threads['stl'] is threading.main_thread()
+    assert threads['render'] is not threading.main_thread()
+
+
+def test_export_error_of_a_stage_stops_the_pipeline():
+    pipeline = Pipeline.Pipeline()
+    ran = []
+
+    def joints():
+        raise Pipeline.ExportError('There is no base_link.')
+
+    pipeline.add('joints', joints)
+    pipeline.add('model', lambda _: ran.append('model'), ['joints'])
+    pipeline.add('stl', lambda _: ran.append('stl'), ['model'], main_thread=True)
+    with pytest.raises(Pipeline.ExportError, match='no base_link'):
+        pipeline.run()
+    assert ran == []
+    assert 'model' not in pipeline.results
+
+
+def test_timings():
+    pipeline = Pipeline.Pipeline()
+    pipeline.add('a', lambda: time.sleep(0.05))
+    pipeline.add('b', lambda _: time.sleep(0.05), ['a'], main_thread=True)
+    pipeline.run()
+    assert pipeline.timings['a'] >= 0.05 and pipeline.timings['b'] >= 0.05
+    assert pipeline.timings['total'] >= pipeline.timings['a'] + pipeline.timings['b']
+    assert [line.split()[0] for line in pipeline.report().splitlines()] == ['a', 'b', 'total']
+
+
+def test_package_templates_are_edited_from_parallel_stages(tmp_path):
+    # fileinput redirected sys.stdout, so two stages editing templates (or
+    # printing) at the same time wrote into each other's files
+    for i in range(20):
+        dirs = [str(tmp_path / '{}_{}'.format(i, version)) for version in (1, 2)]
+        for version, save_dir in zip((1, 2), dirs):
+            utils.copy_package(save_dir, os.path.join(PACKAGES, 'package_ros{}'.format(version)))
+        pipeline = Pipeline.Pipeline(max_workers=6)
+        barrier = threading.Barrier(6, timeout=5)
+
+        def stage(func, *args):
+            def run():
+                barrier.wait()
+                func(*args)
+            return run
+
+        for n, save_dir in enumerate(dirs):
+            pipeline.add('xml{}'.format(n), stage(utils.update_package_xml, save_dir, 'bot_description'))
+            pipeline.add('cmake{}'.format(n), stage(utils.update_cmakelists, save_dir, 'bot_description'))
+            pipeline.add('print{}'.format(n), stage(lambda: [print('rendering') for _ in range(100)]))
+        pipeline.run()
+        for save_dir in dirs:
+            with open(save_dir + '/package.xml') as f:
+                text = f.read()
+            assert '<name>bot_description</name>' in text and 'rendering' not in text
+            with open(save_dir + '/CMakeLists.txt') as f:
+                text = f.read()
+            assert 'project(bot_description)' in text and 'rendering' not in text
+
+
+def test_benchmark(tmp_path):
+    times = benchmark_render.benchmark(8, 1, str(tmp_path))
+    assert sorted(times) == [1, 4]
@@ -0,0 +1,23 @@
+import os
+
+from URDF_Exporter.core import Model, Render
+
+
+def test_render_both_versions_repeatedly(model_file, tmp_path):
+    # the package stages of both versions run at the same time
+    for i in range(20):
+        out = tmp_path / 'out{}'.format(i)
+        save_dirs = {version: str(out / 'ros{}'.format(version) / 'bot_description') for version in (1, 2)}
+        pipeline = Model.render_model(Model.load_model(model_file), save_dirs)
+        assert Render.problems(pipeline) == {}
+        for version, save_dir in save_dirs.items():
+            with open(save_dir + '/package.xml') as f:
+                package_xml = f.read()
+            assert '<name>bot_description</name>' in package_xml
+            assert 'fusion2urdf' not in package_xml.split('<maintainer')[0]
+            with open(save_dir + '/CMakeLists.txt') as f:
+                assert 'project(bot_description)' in f.read()
+        launch = save_dirs[2] + '/launch/robot_description.launch.py'
+        with open(launch) as f:
+            assert 'fusion2urdf' not in f.read()
+        assert os.path.exists(save_dirs[1] + '/urdf/bot.urdf')
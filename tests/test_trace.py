@@ -0,0 +1,42 @@
+import json, os, re
+
+import adsk.fusion
+from conftest import make_design
+
+from URDF_Exporter.utils import trace, utils
+
+
+def test_export_through_proxies_writes_a_chrome_trace(tmp_path):
+    app, occurrences = make_design()
+    tracer = trace.Tracer()
+    try:
+        utils.export_stl(tracer.wrap(app), str(tmp_path))
+        tracer.stop()
+        assert sorted(os.listdir(str(tmp_path / 'meshes'))) == [
+            'arm_1.stl', 'base_link.stl', 'bracket_1.stl', 'cam_1.stl', 'wheel_1.stl', 'wheel_2.stl']
+
+        file_name = str(tmp_path / 'fusion_api.trace.json')
+        tracer.write_chrome_trace(file_name)
+        with open(file_name) as f:
+            events = json.load(f)['traceEvents']
+        names = set(_['name'] for _ in events)
+        for name in ('Application.activeProduct', 'Design.rootComponent', 'Component.allOccurrences',
+                     'Occurrences.addNewComponent()', 'ExportManager.createSTLExportOptions()',
+                     'ExportManager.execute()', 'Occurrence.deleteMe()'):
+            assert name in names
+        assert sum(1 for _ in events if _['name'] == 'ExportManager.execute()') == 6
+        for event in events:
+            assert event['ph'] == 'X' and event['cat'] == 'adsk'
+            assert event['ts'] >= 0 and event['dur'] >= 0
+            assert re.match(r'\w+\.py:\d+ \S+$', event['args']['site'])
+        assert any(_['args']['site'].startswith('utils.py:') for _ in events)
+        assert tracer.summary()['ExportManager.execute()']['count'] == 6
+
+        # the export document is kept for the next export, but not the proxy
+        count = len(tracer.events)
+        assert type(utils._export_doc) is not trace.Proxy
+        utils.export_stl(app, str(tmp_path))
+        assert len(tracer.events) == count
+        assert adsk.fusion.counters['open_documents'] == 1
+    finally:
+        utils.release_export_document()
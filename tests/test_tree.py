@@ -0,0 +1,53 @@
+import random
+
+from URDF_Exporter.core import Tree
+
+
+def make_joints(extra=True):
+    """
+    base_link with the branches b -> b1 and a -> a2, a1. With extra, a1 has
+    a second parent and the joint x -> y is not connected to base_link.
+    """
+    joints = {name: {'parent': parent, 'child': child} for name, parent, child in (
+        ('j_b', 'base_link', 'b'), ('j_a', 'base_link', 'a'), ('j_a2', 'a', 'a2'), ('j_a1', 'a', 'a1'),
+        ('j_b1', 'b', 'b1'))}
+    if extra:
+        joints['j_dup'] = {'parent': 'b', 'child': 'a1'}
+        joints['j_y'] = {'parent': 'x', 'child': 'y'}
+    return joints
+
+
+def test_link_order():
+    tree = Tree.KinematicTree(make_joints())
+    assert tree.links() == ['base_link', 'b', 'a', 'b1', 'a2', 'a1']
+    assert tree.links(sort=True) == ['base_link', 'a', 'b', 'a1', 'a2', 'b1']
+    assert tree.links(depth_first=True) == ['base_link', 'b', 'b1', 'a', 'a2', 'a1']
+    assert tree.links(sort=True, depth_first=True) == ['base_link', 'a', 'a1', 'a2', 'b', 'b1']
+
+
+def test_depth_and_subtree_size():
+    tree = Tree.KinematicTree(make_joints())
+    assert tree.depth == {'base_link': 0, 'a': 1, 'b': 1, 'a1': 2, 'a2': 2, 'b1': 2}
+    assert tree.subtree_size == {'base_link': 6, 'a': 3, 'b': 2, 'a1': 1, 'a2': 1, 'b1': 1}
+
+
+def test_broken_joints():
+    tree = Tree.KinematicTree(make_joints())
+    # the first joint to a link wins
+    assert tree.multiple_parents == ['a1']
+    assert tree.parent('a1') == 'a' and tree.joint('a1') == 'j_a1'
+    assert tree.unreachable == ['j_dup', 'j_y']
+    assert 'y' not in tree.links()
+    assert tree.joints(sort=True) == ['j_a', 'j_b', 'j_a1', 'j_a2', 'j_b1', 'j_dup', 'j_y']
+
+
+def test_sorted_order_does_not_depend_on_the_joint_order():
+    joints = make_joints(extra=False)
+    expected = Tree.KinematicTree(joints).links(sort=True)
+    for seed in range(5):
+        names = list(joints)
+        random.Random(seed).shuffle(names)
+        tree = Tree.KinematicTree({name: joints[name] for name in names})
+        assert tree.links(sort=True) == expected
+        assert tree.joints(sort=True) == ['j_a', 'j_b', 'j_a1', 'j_a2', 'j_b1']
+        assert tree.multiple_parents == [] and tree.unreachable == []
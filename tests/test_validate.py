@@ -0,0 +1,64 @@
+import os
+
+import pytest
+
+from URDF_Exporter.core import Model, Validate
+
+from conftest import make_joints, save_model
+
+
+@pytest.fixture
+def package(tmp_path):
+    # the wheels are the same part, so they are written by a macro
+    model_file = save_model(str(tmp_path / 'model'), make_joints(), {'wheel_1': 'wheel', 'wheel_2': 'wheel'})
+    save_dir = str(tmp_path / 'bot_description')
+    Model.render_model(Model.load_model(model_file), {1: save_dir}, macros=True, validate=False)
+    with open(save_dir + '/urdf/bot.xacro') as f:
+        assert '<xacro:macro' in f.read()
+    assert Validate.validate_package('bot_description', 'bot', save_dir) == []
+    return save_dir
+
+
+def edit(file_name, old, new):
+    with open(file_name) as f:
+        text = f.read()
+    assert old in text
+    with open(file_name, mode='w') as f:
+        f.write(text.replace(old, new, 1))
+
+
+def test_dangling_joint_parent(package):
+    edit(package + '/urdf/bot.xacro', '<parent link="bracket_1"/>', '<parent link="bracket"/>')
+    # and one written by the macro
+    edit(package + '/urdf/bot.xacro', '<xacro:wheel parent="arm_1"', '<xacro:wheel parent="arm"')
+    problems = Validate.validate_package('bot_description', 'bot', package)
+    assert sorted(problems) == ['bot.xacro: parent link arm of joint wheel_1_joint is not defined',
+                                'bot.xacro: parent link bracket of joint cam_joint is not defined']
+
+
+def test_unknown_material(package):
+    # the material of the macro, so of both wheels
+    edit(package + '/urdf/bot.xacro', '<material name="silver_default"/>', '<material name="gold"/>')
+    problems = Validate.validate_package('bot_description', 'bot', package)
+    assert problems == ['bot.xacro: material gold of link wheel_1 is not defined',
+                        'bot.xacro: material gold of link wheel_2 is not defined']
+
+
+def test_missing_mesh(package):
+    os.remove(package + '/meshes/wheel_1.stl')
+    problems = Validate.validate_package('bot_description', 'bot', package)
+    assert problems == ['bot.xacro: mesh package://bot_description/meshes/wheel_1.stl of link wheel_1 does not exist']
+
+
+def test_broken_mesh(package):
+    with open(package + '/meshes/cam_1.stl', mode='ab') as f:
+        f.write(b'\0')
+    problems = Validate.validate_package('bot_description', 'bot', package)
+    assert problems == ['bot.xacro: mesh package://bot_description/meshes/cam_1.stl of link cam_1 is not a valid stl file']
+
+
+def test_undefined_macro(package):
+    edit(package + '/urdf/bot.xacro', '</robot>', '<xacro:caster parent="base_link"/>\n</robot>')
+    edit(package + '/urdf/bot.xacro', '<xacro:include', '<xacro:property name="scale" value="1"/>\n<xacro:include')
+    problems = Validate.validate_package('bot_description', 'bot', package)
+    assert problems == ['bot.xacro: macro caster is not defined']
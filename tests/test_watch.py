@@ -0,0 +1,59 @@
+import os
+
+import adsk.core
+from conftest import make_design
+
+from URDF_Exporter.core import Joint, Link, Names, Watch
+from URDF_Exporter.utils import mesh, utils
+
+
+def make_watcher(app, save_dir):
+    root = app.activeProduct.rootComponent
+    names = Names.NameRegistry(root)
+    joints_dict, _ = Joint.make_joints_dict(root, 'ok', names)
+    inertial_dict, _ = Link.make_inertial_dict(root, 'ok', names)
+    material_dict, color_dict, _ = Link.make_material_dict(root, 'ok', 0, names)
+    os.makedirs(save_dir)
+    utils.export_stl(app, save_dir, names)
+    return Watch.Watcher(app, names, joints_dict, inertial_dict, (material_dict, color_dict), 'bot_description', 'bot',
+                         {1: save_dir}, lambda j, i, m: (j, i, m, {}), delay=1.0)
+
+
+def test_replayed_edits_update_the_changed_links(tmp_path):
+    app, occurrences = make_design()
+    save_dir = str(tmp_path / 'bot_description')
+    watcher = make_watcher(app, save_dir)
+    meshes = save_dir + '/meshes/'
+    for name in os.listdir(meshes):
+        os.utime(meshes + name, ns=(0, 0))
+
+    def apply(event):
+        if event == 'paint bracket':
+            occurrences['bracket:1'].appearance = adsk.core.Appearance('Color - Blue', adsk.core.Color(0, 0, 255), 'blue')
+        elif event == 'move cam':
+            occurrences['cam:1'].bRepBodies[0].center = (0, 4, 9)
+        elif event == 'pocket wheel':
+            # keeps the bounding box of the wheel
+            occurrences['wheel:1'].bRepBodies[0].pocket = 0.5
+
+    # the first two edits come within the delay and are updated together
+    stream = [(0.0, 'paint bracket'), (0.5, 'move cam'), (3.0, 'pocket wheel')]
+    changes = Watch.ReplayEventSource(watcher, stream, apply).run()
+    utils.release_export_document()
+
+    assert [_['events'] for _ in changes] == [['paint bracket', 'move cam'], ['pocket wheel']]
+    assert [_['links'] for _ in changes] == [['bracket_1', 'cam_1'], ['wheel_1']]
+    assert [_['exported'] for _ in changes] == [['bracket_1', 'cam_1'], ['wheel_1']]
+    assert [_['joints'] for _ in changes] == [[], []]
+    # latency and duration come from the virtual clock of the replay
+    assert abs(changes[0]['latency'] - 1.5) < 0.06 and changes[0]['duration'] == 0.0
+    assert abs(changes[1]['latency'] - 1.0) < 0.06
+
+    rewritten = sorted(name for name in os.listdir(meshes) if os.stat(meshes + name).st_mtime_ns)
+    assert rewritten == ['bracket_1.stl', 'cam_1.stl', 'wheel_1.stl']
+    assert len(mesh.read_stl(meshes + 'wheel_1.stl')) == 24
+    assert watcher.material_dict['bracket_1'] == {'material': 'blue'}
+    assert abs(watcher.inertial_dict['wheel_1']['mass'] - 0.000875) < 1e-9
+    for name in ('bot.xacro', 'materials.xacro'):
+        with open(save_dir + '/urdf/' + name) as f:
+            assert 'name="blue"' in f.read()